@@ -16,7 +16,13 @@ from typing import List, Dict, Optional
 import logging
 from datetime import datetime
 import os
+from .cost_accounting import cost_scope
 from .glm_model import create_vietnamese_glm
+from .hashtag_index import get_hashtag_index
+from .lazy import LazyResource
+from .schemas import Brief, ScriptOutline, SuccessMetrics, Trend
+from .tracing import span
+from .vietnamese_text import match_key, nfc
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,9 @@ class ContentStrategist(Agent):
     Agent that creates strategic content briefs by matching trends to products
     """
 
+    # Prompt token cap for brief generation (keeps latency and spend bounded)
+    MAX_BRIEF_PROMPT_TOKENS = 6000
+
     def __init__(
         self,
         db_url: str,
@@ -44,11 +53,15 @@ class ContentStrategist(Agent):
             embedder="openai"
         )
 
-        # Trend knowledge base (shared with TrendMonitor)
-        trend_kb = PgVector(
-            table_name="tiktok_trends",
-            db_url=db_url,
-            embedder="openai"
+        # Trend knowledge base (shared with TrendMonitor), only opened when
+        # trend details are first looked up
+        trend_kb = LazyResource(
+            "ContentStrategist.trend_kb",
+            lambda: PgVector(
+                table_name="tiktok_trends",
+                db_url=db_url,
+                embedder="openai"
+            )
         )
 
         # Initialize GLM model optimized for Vietnamese
@@ -82,7 +95,12 @@ class ContentStrategist(Agent):
         )
 
         self.product_kb = product_kb
-        self.trend_kb = trend_kb
+        self._trend_kb = trend_kb
+        self.glm = glm_model
+
+    @property
+    def trend_kb(self) -> PgVector:
+        return self._trend_kb.get()
 
     def search_products(
         self,
@@ -170,7 +188,8 @@ class ContentStrategist(Agent):
 
         # Filter by category if provided
         if category:
-            mock_products = [p for p in mock_products if p["category"] == category]
+            category_key = match_key(category)
+            mock_products = [p for p in mock_products if match_key(p["category"]) == category_key]
 
         # In production: semantic search using embeddings
         # results = self.product_kb.search(query, limit=limit)
@@ -206,7 +225,9 @@ class ContentStrategist(Agent):
         self,
         trend_hashtag: str,
         product_name: str,
-        category: str
+        category: str,
+        product_tags: Optional[List[str]] = None,
+        limit: int = 10
     ) -> List[str]:
         """
         Generate Vietnamese hashtags for content
@@ -215,39 +236,27 @@ class ContentStrategist(Agent):
             trend_hashtag: Original trending hashtag
             product_name: Product name
             category: Product category
+            product_tags: Product tags / trend keywords to match hashtags on
+            limit: Maximum number of hashtags
 
         Returns:
-            List of Vietnamese hashtags
+            Trending hashtag first, then the most popular distinct hashtags
+            for the category and tags (see HashtagIndex)
         """
-        # Base hashtags
-        hashtags = [trend_hashtag]
-
-        # Category-specific hashtags
-        category_hashtags = {
-            "beauty": ["#LàmĐẹp", "#BeautyVietNam", "#MakeupTips", "#Skincare"],
-            "fashion": ["#ThờiTrang", "#FashionVN", "#OOTD", "#StyleViệtNam"],
-            "food": ["#ĂnVặt", "#FoodVietNam", "#SnackTime", "#ĂnNgon"],
-            "electronics": ["#CôngNghệ", "#TechVN", "#Gadget", "#ĐiệnTử"]
-        }
-
-        hashtags.extend(category_hashtags.get(category, []))
-
-        # E-commerce hashtags
-        hashtags.extend([
-            "#TikTokShop",
-            "#MuaSắm",
-            "#GiảmGiá",
-            "#Review"
-        ])
-
-        return hashtags[:10]  # Max 10 hashtags
+        ranked = get_hashtag_index().top_k(
+            categories=[category],
+            tags=product_tags or [],
+            k=limit - 1,
+            exclude=[trend_hashtag]
+        )
+        return [nfc(trend_hashtag)] + ranked
 
     def create_content_brief(
         self,
-        trend: Dict,
+        trend: Trend,
         products: List[Dict],
         content_format: str = "tiktok_video"
-    ) -> Dict:
+    ) -> Brief:
         """
         Create a detailed content brief using Claude AI
 
@@ -262,7 +271,7 @@ class ContentStrategist(Agent):
         logger.info(f"Creating content brief: trend={trend['hashtag']}, products={len(products)}")
 
         # Prepare context for Claude
-        context = f"""
+        trend_context = f"""
 Trending Topic: {trend['hashtag']}
 - Views: {trend.get('views', 0):,}
 - Engagement Rate: {trend.get('engagement_rate', 0)}%
@@ -272,16 +281,10 @@ Trending Topic: {trend['hashtag']}
 
 Matched Products:
 """
-        for i, product in enumerate(products, 1):
-            context += f"\n{i}. {product['name']} ({product['name_en']})"
-            context += f"\n   - Price: {product['price_vnd']:,} VNĐ"
-            context += f"\n   - Description: {product['description']}"
-            context += f"\n   - Rating: {product['rating']}/5.0"
-
-        context += f"\n\nContent Format: {content_format}"
+        format_context = f"\n\nContent Format: {content_format}"
 
         # Prompt for Claude
-        prompt = f"""
+        instructions = f"""
 Based on the trending topic and products above, create a Vietnamese content brief for {content_format}.
 
 Your brief should include:
@@ -310,30 +313,46 @@ Your brief should include:
 
 Write in a natural, conversational Vietnamese style that resonates with Gen Z and Millennial Vietnamese audiences on TikTok.
 
-{context}
 """
 
-        # Call Claude (in production)
-        # response = self.model.generate(prompt)
+        # Fit the product section into what's left of the prompt budget,
+        # summarizing or dropping lower-ranked products if needed
+        budget = self.glm.token_budget(max_prompt_tokens=self.MAX_BRIEF_PROMPT_TOKENS)
+        fixed_tokens = budget.count(instructions + trend_context + format_context + "\n")
+        product_context = budget.fit(
+            self._product_context_candidates(products),
+            limit=budget.prompt_limit - fixed_tokens
+        )
+
+        context = trend_context + product_context + format_context
+        prompt = instructions + context + "\n"
+
+        # Call GLM in live mode (retries, circuit breaking, fallback model and
+        # hedging are handled by GLMModel.complete)
+        with span("content_strategist.brief_llm_call", trend=trend["hashtag"], live=self.glm.live) as llm_span, \
+                cost_scope(agent="ContentStrategist", brief_id=trend["hashtag"]):
+            llm_response = self.glm.complete(prompt) if self.glm.live else None
+            if llm_response:
+                llm_span.set_attribute("llm.model", llm_response["model"])
 
         # Mock response for demonstration
-        mock_brief = {
-            "trend_id": trend["hashtag"],
-            "products": [p["id"] for p in products],
-            "content_format": content_format,
-            "created_at": datetime.now().isoformat(),
+        brief = Brief(
+            trend_id=trend["hashtag"],
+            products=[p["id"] for p in products],
+            content_format=content_format,
+            created_at=datetime.now().isoformat(),
 
-            "vietnamese_hook": "Chị em ơi! Trend làm đẹp này đang gây bão TikTok, mình phải thử ngay! 💄✨",
+            vietnamese_hook="Chị em ơi! Trend làm đẹp này đang gây bão TikTok, mình phải thử ngay! 💄✨",
 
-            "content_angle": "Product Review + Tutorial - Show before/after transformation using the product while riding the trending beauty hack wave",
+            content_angle="Product Review + Tutorial - Show before/after transformation using the product while riding the trending beauty hack wave",
 
-            "script_outline": {
-                "opening": "Hook with trending sound + text overlay: 'Thử ngay beauty hack đang viral!' (3s)",
-                "main_content": "Show product unboxing → Quick application tutorial → Before/After comparison → Share honest review in Vietnamese (20s)",
-                "cta": "Text overlay with shop link + voiceover: 'Link mua ở Shop ngay nào!' (3s)"
-            },
+            script_outline=ScriptOutline(
+                opening="Hook with trending sound + text overlay: 'Thử ngay beauty hack đang viral!' (3s)",
+                main_content="Show product unboxing → Quick application tutorial → Before/After comparison → Share honest review in Vietnamese (20s)",
+                cta="Text overlay with shop link + voiceover: 'Link mua ở Shop ngay nào!' (3s)"
+            ),
 
-            "visual_suggestions": [
+            visual_suggestions=[
                 "Open with trending TikTok transition effect",
                 "Close-up shots of product texture and application",
                 "Split-screen before/after comparison",
@@ -341,7 +360,7 @@ Write in a natural, conversational Vietnamese style that resonates with Gen Z an
                 "Show product packaging with price clearly visible"
             ],
 
-            "vietnamese_voiceover": """
+            vietnamese_voiceover="""
 Chào các bạn! Hôm nay mình sẽ review cho các bạn cây son lì này đang được nhiều bạn hỏi.
 
 [Unboxing]
@@ -356,43 +375,71 @@ Sau 4 tiếng đi làm, ăn uống bình thường, màu vẫn giữ được 80
 Các bạn thích thì vào shop của mình mua nhé! Link ở dưới nha! ❤️
 """,
 
-            "hashtags": [
-                trend["hashtag"],  # Trending hashtag
-                "#ReviewSảnPhẩm",
-                "#LàmĐẹp",
-                "#BeautyVietNam",
-                "#TikTokShop",
-                "#SonLì",
-                "#MakeupTutorial",
-                "#GiảmGiá",
-                "#MuaSắm"
-            ],
+            hashtags=self.generate_vietnamese_hashtags(
+                trend_hashtag=trend["hashtag"],
+                product_name=products[0]["name"],
+                category=products[0]["category"],
+                product_tags=[tag for p in products for tag in p.get("tags", [])] + list(trend.get("keywords", [])),
+                limit=9
+            ),
 
-            "optimal_posting_time": "19:00-21:00 GMT+7 (Vietnamese evening prime time)",
+            optimal_posting_time="19:00-21:00 GMT+7 (Vietnamese evening prime time)",
 
-            "success_metrics": {
-                "target_views": 50000,
-                "target_engagement_rate": 8.0,
-                "target_conversions": 100,
-                "expected_revenue_vnd": 25900000  # 100 units * 259k
-            },
+            success_metrics=SuccessMetrics(
+                target_views=50000,
+                target_engagement_rate=8.0,
+                target_conversions=100,
+                expected_revenue_vnd=25900000  # 100 units * 259k
+            ),
 
-            "cultural_notes": [
+            cultural_notes=[
                 "Use friendly 'chị em' address for female audience",
                 "Include price transparency (Vietnamese consumers value clear pricing)",
                 "Show honest review (build trust over hard selling)",
                 "Use trending sounds but keep Vietnamese voiceover"
             ]
-        }
+        )
+
+        if llm_response:
+            brief.llm_output = llm_response["content"]
+            brief.model_id = llm_response["model"]
+
+        return brief
 
-        return mock_brief
+    def _format_product_context(self, products: List[Dict], detail: str = "full") -> str:
+        """
+        Render matched products for the brief prompt
+
+        Args:
+            products: Products in ranking order
+            detail: "full" for complete descriptions, "short" for a one-line summary
+
+        Returns:
+            Product section of the prompt
+        """
+        context = ""
+        for i, product in enumerate(products, 1):
+            context += f"\n{i}. {product['name']} ({product['name_en']})"
+            context += f"\n   - Price: {product['price_vnd']:,} VNĐ"
+            if detail == "full":
+                context += f"\n   - Description: {product['description']}"
+            else:
+                context += f"\n   - Summary: {product['description'].split(',')[0]}"
+            context += f"\n   - Rating: {product['rating']}/5.0"
+        return context
+
+    def _product_context_candidates(self, products: List[Dict]):
+        """Yield product renderings from most to least detailed"""
+        yield self._format_product_context(products, detail="full")
+        for keep in range(len(products), 0, -1):
+            yield self._format_product_context(products[:keep], detail="short")
 
     def run_strategy_session(
         self,
-        trend: Dict,
+        trend: Trend,
         max_products: int = 3,
         content_formats: List[str] = ["tiktok_video"]
-    ) -> List[Dict]:
+    ) -> List[Brief]:
         """
         Main workflow: Create content briefs for a trending topic
 
@@ -408,11 +455,13 @@ Các bạn thích thì vào shop của mình mua nhé! Link ở dưới nha! ❤
 
         # Step 1: Search for relevant products
         query = f"{trend['hashtag']} {' '.join(trend.get('keywords', []))}"
-        products = self.search_products(
-            query=query,
-            category=trend.get('category'),
-            limit=max_products
-        )
+        with span("content_strategist.product_search", trend=trend["hashtag"]) as search_span:
+            products = self.search_products(
+                query=query,
+                category=trend.get('category'),
+                limit=max_products
+            )
+            search_span.set_attribute("product.count", len(products))
 
         if not products:
             logger.warning(f"No products found for trend: {trend['hashtag']}")
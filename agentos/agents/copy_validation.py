@@ -0,0 +1,324 @@
+"""
+Copy validation engine for TextCreator
+
+Checks a generated copy (body, call-to-action, hashtags) against the
+platform's limits in one go:
+
+- Length in grapheme clusters, as the platforms count it: an emoji with a
+  skin tone or ZWJ sequence (👨‍👩‍👧), a flag, or a decomposed Vietnamese
+  letter (e + U+0302 + U+0301 = ế) is one character, not several code points.
+- Emoji count over all emoji, not a fixed list; text-default symbols
+  (arrows, (c), (R), TM, ...) count only with U+FE0F after them.
+- Hashtag format, duplicates (in any case/accent spelling) and count.
+
+Segmentation is a single precompiled regex pass: every match is one
+grapheme cluster and emoji clusters are captured by their own group, so
+both counts come out of one findall() without a Python-level loop over the
+text. Built once per agent and reused for every variant of every brief.
+
+Copies that fail the checks are repaired locally where possible (hashtag
+clean-up, trimming to whole sentences); only a body that cannot be trimmed
+sensibly is handed to a caller-supplied shortener (a short LLM prompt), and
+hard truncation at a grapheme boundary is the last resort.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+import re
+
+from .vietnamese_text import hashtag_key, nfc
+
+# Marks that attach to the preceding character: combining diacritics
+# (decomposed Vietnamese tones), variation selectors, ZWJ
+_MARK = "[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f\ufe00-\ufe0f\u200d]"
+
+# Emoji that render as emoji on their own: the pictograph planes plus the
+# Emoji_Presentation code points among the BMP symbols
+_EMOJI_PRESENTATION = (
+    "[\U0001F000-\U0001FAFF\u231a\u231b\u23e9-\u23ec\u23f0\u23f3\u25fd\u25fe"
+    "\u2614\u2615\u2648-\u2653\u267f\u2693\u26a1\u26aa\u26ab\u26bd\u26be"
+    "\u26c4\u26c5\u26ce\u26d4\u26ea\u26f2\u26f3\u26f5\u26fa\u26fd\u2705"
+    "\u270a\u270b\u2728\u274c\u274e\u2753-\u2755\u2757\u2795-\u2797\u27b0"
+    "\u27bf\u2b1b\u2b1c\u2b50\u2b55]"
+)
+# Symbols that render as text unless U+FE0F (or a skin tone) follows:
+# arrows, (c) (R) TM, dingbats, technical and geometric symbols, ...
+_EMOJI_TEXT_DEFAULT = (
+    "[\u2190-\u21ff\u2300-\u23ff\u25aa-\u25fe\u2600-\u27bf\u2b00-\u2bff"
+    "\u2934\u2935\u3030\u303d\u3297\u3299\u00a9\u00ae\u203c\u2049\u2122\u2139]"
+)
+_SKIN_TONE = "[\U0001F3FB-\U0001F3FF]"
+# Start of an emoji cluster; U+FE0E asks for text presentation
+_EMOJI_HEAD = (
+    f"(?:{_EMOJI_PRESENTATION}(?!\ufe0e)"
+    f"|{_EMOJI_TEXT_DEFAULT}(?:\ufe0f|(?={_SKIN_TONE})))"
+)
+# Modifiers that stay inside an emoji cluster: presentation selectors, skin
+# tones, tag characters (subdivision flags), combining keycap
+_EMOJI_EXT = "[\ufe0e\ufe0f\U0001F3FB-\U0001F3FF\U000E0020-\U000E007F\u20e3]"
+
+_EMOJI = (
+    "[\U0001F1E6-\U0001F1FF]{2}"                # flag: regional indicator pair
+    "|[0-9#*]\ufe0f?\u20e3"                     # keycap
+    # ZWJ sequence; components after a ZWJ are emoji whatever their default
+    f"|{_EMOJI_HEAD}{_EMOJI_EXT}*(?:\u200d(?:{_EMOJI_PRESENTATION}|{_EMOJI_TEXT_DEFAULT}){_EMOJI_EXT}*)*"
+)
+
+# One match per grapheme cluster; group 1 is set only for emoji clusters
+_GRAPHEME = re.compile(f"({_EMOJI})|\r\n|.{_MARK}*", re.DOTALL)
+
+_HASHTAG = re.compile(r"#\w+")
+_NON_WORD = re.compile(r"\W+")
+
+# Sentence/paragraph boundaries: line breaks, or spaces after closing
+# punctuation unless an emoji follows (it belongs to the sentence before)
+_SENTENCE_BREAK = re.compile(f"(\n+|(?<=[.!?\u2026])[ \t]+(?!{_EMOJI_HEAD}))")
+
+# Local trims keeping less than this share of the limit are handed to the
+# shortener instead
+MIN_TRIM_FILL = 0.5
+ELLIPSIS = "\u2026"
+
+# Platform hashtag caps (others: DEFAULT_MAX_HASHTAGS)
+PLATFORM_MAX_HASHTAGS = {
+    "shopee": 18,
+    "youtube": 15
+}
+DEFAULT_MAX_HASHTAGS = 30
+MIN_HASHTAGS = 3
+
+# Platform caption hard limit key in TextCreator.PLATFORM_LIMITS
+_MAX_LENGTH_KEYS = {
+    "facebook": "facebook_post",
+    "tiktok": "tiktok_caption",
+    "shopee": "shopee_description",
+    "instagram": "instagram_caption",
+    "youtube": "youtube_description"
+}
+
+# Separators build_caption() puts between body, call-to-action and hashtags
+_CAPTION_SEPARATOR_LENGTH = 2
+
+
+def segment(text: str) -> Dict[str, int]:
+    """Grapheme and emoji counts of text in one regex pass"""
+    clusters = _GRAPHEME.findall(text)
+    return {
+        "graphemes": len(clusters),
+        "emojis": len(clusters) - clusters.count("")
+    }
+
+
+def grapheme_length(text: str) -> int:
+    """Length in user-perceived characters"""
+    return len(_GRAPHEME.findall(text))
+
+
+def truncate_graphemes(text: str, limit: int, ellipsis: str = ELLIPSIS) -> str:
+    """Cut text to at most limit graphemes (ellipsis included), preferring a word boundary"""
+    ends = [match.end() for match in _GRAPHEME.finditer(text)]
+    if len(ends) <= limit:
+        return text
+
+    keep = max(limit - grapheme_length(ellipsis), 0)
+    cut = ends[keep - 1] if keep else 0
+    space = text.rfind(" ", 0, cut)
+    if space > cut * 0.6:
+        cut = space
+    return text[:cut].rstrip() + ellipsis
+
+
+def fit_sentences(text: str, limit: int) -> str:
+    """Longest run of whole leading sentences/paragraphs within limit graphemes ('' if none)"""
+    parts = _SENTENCE_BREAK.split(text)
+    fitted = ""
+    # parts alternates sentence, separator, sentence, ...
+    for i in range(0, len(parts), 2):
+        candidate = (fitted + (parts[i - 1] if i else "") + parts[i]).rstrip()
+        if grapheme_length(candidate) > limit:
+            break
+        fitted = candidate
+    return fitted
+
+
+def fix_hashtags(hashtags: Iterable[str], max_hashtags: int, fallback: Iterable[str] = ()) -> List[str]:
+    """
+    Local hashtag repair: add missing #, drop spaces/punctuation, NFC,
+    drop duplicates (in any case/accent spelling), cap at max_hashtags and top up from fallback (e.g. the
+    brief's hashtags) when there are too few
+    """
+    fixed = []
+    seen = set()
+
+    def add(tags: Iterable[str], cap: int) -> None:
+        for tag in tags:
+            if len(fixed) >= cap:
+                return
+            word = _NON_WORD.sub("", nfc(tag))
+            key = hashtag_key(word)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            fixed.append(f"#{word}")
+
+    add(hashtags, max_hashtags)
+    if len(fixed) < MIN_HASHTAGS:
+        add(fallback, min(MIN_HASHTAGS, max_hashtags))
+    return fixed
+
+
+class CopyValidator:
+    """
+    Per-platform copy checks
+
+    Args:
+        platform_limits: TextCreator.PLATFORM_LIMITS-style mapping
+            ("<platform>_optimal" and the caption limit keys)
+        default_optimal: Optimal length for platforms without one
+        max_emojis: Emoji count above which usage is flagged
+    """
+
+    def __init__(self, platform_limits: Dict[str, int], default_optimal: int = 500, max_emojis: int = 5):
+        self.platform_limits = platform_limits
+        self.default_optimal = default_optimal
+        self.max_emojis = max_emojis
+
+    def optimal_length(self, platform: str) -> int:
+        return self.platform_limits.get(f"{platform}_optimal", self.default_optimal)
+
+    def max_length(self, platform: str) -> Optional[int]:
+        key = _MAX_LENGTH_KEYS.get(platform)
+        return self.platform_limits.get(key) if key else None
+
+    def check_emojis(self, emoji_count: int, max_emojis: Optional[int] = None) -> Dict:
+        max_emojis = self.max_emojis if max_emojis is None else max_emojis
+        if emoji_count < 2:
+            recommendation = "Add more emojis"
+        elif emoji_count <= max_emojis:
+            recommendation = "Good emoji usage"
+        else:
+            recommendation = "Too many emojis"
+        return {
+            "emoji_count": emoji_count,
+            "optimal": 2 <= emoji_count <= max_emojis,
+            "recommendation": recommendation
+        }
+
+    def max_hashtags(self, platform: Optional[str]) -> int:
+        return PLATFORM_MAX_HASHTAGS.get(platform, DEFAULT_MAX_HASHTAGS)
+
+    def check_hashtags(self, hashtags: List[str], platform: Optional[str] = None) -> Dict:
+        max_hashtags = self.max_hashtags(platform)
+        issues = []
+
+        if len(hashtags) > max_hashtags:
+            issues.append(f"Too many hashtags (max {max_hashtags} recommended)")
+        if len(hashtags) < MIN_HASHTAGS:
+            issues.append(f"Too few hashtags (min {MIN_HASHTAGS} recommended)")
+
+        seen = set()
+        for tag in hashtags:
+            if not _HASHTAG.fullmatch(nfc(tag)):
+                # Only malformed tags pay for the detailed diagnosis
+                if not tag.startswith("#"):
+                    issues.append(f"Hashtag missing #: {tag}")
+                if any(ch.isspace() for ch in tag):
+                    issues.append(f"Hashtag contains space: {tag}")
+                elif tag.startswith("#") and len(tag) > 1:
+                    issues.append(f"Hashtag contains invalid characters: {tag}")
+                elif tag == "#":
+                    issues.append("Empty hashtag")
+            # Same tag in another case/accent spelling (#FreeshíP, #Freeship)
+            key = hashtag_key(tag)
+            if key in seen:
+                issues.append(f"Duplicate hashtag: {tag}")
+            seen.add(key)
+
+        return {
+            "valid": len(issues) == 0,
+            "count": len(hashtags),
+            "issues": issues
+        }
+
+    def validate(self, platform: str, body: str, hashtags: List[str], call_to_action: str = "") -> Dict:
+        """
+        Validate one copy
+
+        Returns:
+            Metadata: grapheme counts against the optimal length (body) and
+            the platform's hard limit (whole caption), emoji analysis and
+            hashtag validation, plus an overall "valid" flag
+        """
+        body_counts = segment(body)
+        body_length = body_counts["graphemes"]
+        optimal = self.optimal_length(platform)
+        max_length = self.max_length(platform)
+
+        caption_length = body_length
+        for part in (call_to_action, " ".join(hashtags)):
+            if part:
+                caption_length += _CAPTION_SEPARATOR_LENGTH + grapheme_length(part)
+
+        hashtag_validation = self.check_hashtags(hashtags, platform)
+        within_max_length = max_length is None or caption_length <= max_length
+
+        return {
+            "character_count": body_length,
+            "character_limit": optimal,
+            "within_limit": body_length <= optimal,
+            "caption_length": caption_length,
+            "max_length": max_length,
+            "within_max_length": within_max_length,
+            "hashtag_validation": hashtag_validation,
+            "emoji_analysis": self.check_emojis(body_counts["emojis"]),
+            "valid": within_max_length and hashtag_validation["valid"]
+        }
+
+    def repair(
+        self,
+        platform: str,
+        copy,
+        metadata: Dict,
+        fallback_hashtags: Iterable[str] = (),
+        shorten: Optional[Callable[[str, int], Optional[str]]] = None
+    ) -> List[str]:
+        """
+        Fix a copy that failed validate(), in place
+
+        Hashtags are cleaned up locally. An over-length body is trimmed to
+        whole sentences; if that keeps too little (one long sentence),
+        shorten(body, limit) is asked for a rewrite, and whatever is still
+        too long is truncated.
+
+        Args:
+            platform: Target platform
+            copy: CopyText (or dict) with body and hashtags
+            metadata: validate() result for the copy
+            fallback_hashtags: Tags to top up with when there are too few
+            shorten: Optional rewriter returning a shorter body (or None)
+
+        Returns:
+            Repairs applied, in order (empty if the copy was valid)
+        """
+        repairs = []
+
+        if not metadata["hashtag_validation"]["valid"]:
+            hashtags = fix_hashtags(copy["hashtags"], self.max_hashtags(platform), fallback_hashtags)
+            if hashtags != copy["hashtags"]:
+                copy["hashtags"] = hashtags
+                repairs.append("hashtags_fixed")
+
+        limit = metadata["character_limit"]
+        if not metadata["within_limit"]:
+            body = fit_sentences(copy["body"], limit)
+            if grapheme_length(body) >= limit * MIN_TRIM_FILL:
+                repairs.append("trimmed_to_sentences")
+            else:
+                body = shorten(copy["body"], limit) if shorten else None
+                if body:
+                    repairs.append("shortened")
+                if not body or grapheme_length(body) > limit:
+                    body = truncate_graphemes(body or copy["body"], limit)
+                    repairs.append("truncated")
+            copy["body"] = body
+
+        return repairs
@@ -0,0 +1,181 @@
+"""
+Cost Accounting - Token and USD cost per agent, brief and workflow run
+
+Every GLMModel.complete() call emits a usage event. The event is tagged
+with the cost labels active in the calling context (agent, brief_id,
+workflow_id) and priced from the model's cost_tier. CostLedger aggregates
+the events so the workflow can report its own cost and main.py can expose
+per-agent totals as Prometheus metrics.
+
+Labels are set with cost_scope() and flow through contextvars, so they
+follow the work into asyncio.to_thread workers and hedged requests:
+
+    with cost_scope(workflow_id=results["workflow_id"]):
+        with cost_scope(agent="ContentStrategist", brief_id=trend["hashtag"]):
+            glm.complete(prompt)
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+import threading
+
+try:
+    from ..config.models import COST_TIER_PRICING, MODEL_CAPABILITIES
+except ImportError:
+    try:
+        from config.models import COST_TIER_PRICING, MODEL_CAPABILITIES
+    except ImportError:
+        COST_TIER_PRICING = {}
+        MODEL_CAPABILITIES = {}
+
+COST_LABELS = ("agent", "brief_id", "workflow_id")
+
+_cost_labels: ContextVar[Dict[str, str]] = ContextVar("agentos_cost_labels", default={})
+
+
+@contextmanager
+def cost_scope(**labels: Optional[str]):
+    """Attribute GLM usage inside the block to the given labels (nests)"""
+    unknown = set(labels) - set(COST_LABELS)
+    if unknown:
+        raise ValueError(f"Unknown cost labels: {sorted(unknown)}")
+    merged = {**_cost_labels.get(), **{k: v for k, v in labels.items() if v is not None}}
+    token = _cost_labels.set(merged)
+    try:
+        yield merged
+    finally:
+        _cost_labels.reset(token)
+
+
+def current_cost_labels() -> Dict[str, str]:
+    """Cost labels active in the current context"""
+    return dict(_cost_labels.get())
+
+
+def usage_cost(model_id: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost of one call, from the model's cost_tier (0.0 if unpriced)"""
+    tier = MODEL_CAPABILITIES.get(model_id, {}).get("cost_tier")
+    pricing = COST_TIER_PRICING.get(tier)
+    if not pricing:
+        return 0.0
+    return (prompt_tokens * pricing["prompt"] + completion_tokens * pricing["completion"]) / 1_000_000
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "cost_usd": 0.0,
+        "latency_seconds": 0.0
+    }
+
+
+def _add(totals: Dict[str, Any], event: Dict[str, Any]):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += event["prompt_tokens"]
+    totals["completion_tokens"] += event["completion_tokens"]
+    totals["total_tokens"] += event["prompt_tokens"] + event["completion_tokens"]
+    totals["cost_usd"] += event["cost_usd"]
+    totals["latency_seconds"] += event.get("latency_seconds", 0.0)
+
+
+def _rounded(totals: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **totals,
+        "cost_usd": round(totals["cost_usd"], 6),
+        "latency_seconds": round(totals["latency_seconds"], 3)
+    }
+
+
+class CostLedger:
+    """
+    In-process aggregation of usage events
+
+    Keeps running totals per agent and per model, and per brief and per
+    workflow run (the latter two bounded to the most recent max_entries).
+
+    Args:
+        max_entries: Briefs and workflow runs to keep before evicting the oldest
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._total = _empty_totals()
+        self._by_agent: Dict[str, Dict[str, Any]] = {}
+        self._by_model: Dict[str, Dict[str, Any]] = {}
+        self._by_brief: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_workflow: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _bounded(self, store: OrderedDict, key: str, factory):
+        if key not in store:
+            store[key] = factory()
+            if len(store) > self.max_entries:
+                store.popitem(last=False)
+        return store[key]
+
+    def record(self, event: Dict[str, Any]):
+        """Usage listener: add one priced, labeled usage event"""
+        agent = event.get("agent") or "unattributed"
+        with self._lock:
+            _add(self._total, event)
+            _add(self._by_agent.setdefault(agent, _empty_totals()), event)
+            _add(self._by_model.setdefault(event["model"], _empty_totals()), event)
+
+            if event.get("brief_id"):
+                _add(self._bounded(self._by_brief, event["brief_id"], _empty_totals), event)
+
+            if event.get("workflow_id"):
+                run = self._bounded(self._by_workflow, event["workflow_id"], lambda: {
+                    "total": _empty_totals(),
+                    "by_agent": {},
+                    "by_brief": {},
+                    "by_model": {}
+                })
+                _add(run["total"], event)
+                _add(run["by_agent"].setdefault(agent, _empty_totals()), event)
+                _add(run["by_model"].setdefault(event["model"], _empty_totals()), event)
+                if event.get("brief_id"):
+                    _add(run["by_brief"].setdefault(event["brief_id"], _empty_totals()), event)
+
+    def workflow_summary(self, workflow_id: str) -> Dict[str, Any]:
+        """Totals for one workflow run, broken down by agent, brief and model"""
+        with self._lock:
+            run = self._by_workflow.get(workflow_id)
+            if run is None:
+                return {**_empty_totals(), "by_agent": {}, "by_brief": {}, "by_model": {}}
+            return {
+                **_rounded(run["total"]),
+                **{
+                    breakdown: {key: _rounded(t) for key, t in run[breakdown].items()}
+                    for breakdown in ("by_agent", "by_brief", "by_model")
+                }
+            }
+
+    def brief_totals(self, brief_id: str) -> Dict[str, Any]:
+        """Totals for one brief across all runs (strategy + copy generation)"""
+        with self._lock:
+            return _rounded(self._by_brief.get(brief_id, _empty_totals()))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Process-wide totals by agent and model"""
+        with self._lock:
+            return {
+                "total": _rounded(self._total),
+                "by_agent": {key: _rounded(t) for key, t in self._by_agent.items()},
+                "by_model": {key: _rounded(t) for key, t in self._by_model.items()},
+                "briefs_tracked": len(self._by_brief),
+                "workflows_tracked": len(self._by_workflow)
+            }
+
+
+_cost_ledger = CostLedger()
+
+
+def get_cost_ledger() -> CostLedger:
+    """The process-wide ledger fed by every GLM call"""
+    return _cost_ledger
@@ -0,0 +1,196 @@
+"""
+Offline stand-ins for the GLM API and PgVector
+
+Used by the benchmark suite and the load-test harness to exercise the real
+agent code paths without Postgres, network access or an API key:
+
+- FakeGLMModel: a GLMModel whose raw API returns canned completions after a
+  configurable (seeded, deterministic) latency. Everything above the raw
+  request - token budget, rate governor, circuit breaker, hedging, usage
+  events - is the production code.
+- InMemoryVectorDB: a dict-backed replacement for PgVector.
+- InMemoryStorage: a no-op replacement for PostgresStorage.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+import json
+import random
+import threading
+import time
+
+import httpx
+from openai import APIConnectionError
+
+from .glm_model import GLMModel, DEFAULT_MODEL, FALLBACK_MODEL
+from .token_budget import count_message_tokens
+from .vietnamese_text import match_key, tokenize
+
+# Never contacted; only named in the request attached to injected errors
+FAKE_BASE_URL = "http://fake-glm.invalid/api/paas/v4"
+
+
+def _match_terms(text: str) -> set:
+    """Accent-insensitive word set, as a lexical stand-in for embeddings"""
+    return {match_key(token) for token in tokenize(text)}
+
+
+def default_fake_response(messages: List[Dict[str, str]]) -> str:
+    """Canned Vietnamese copy in the JSON shape TextCreator expects"""
+    return json.dumps({
+        "body": "Chị em ơi! Son lì bền màu 24h đang hot lắm nè 💄✨\n\nGiá chỉ 259K thôi, mua ngay nha 😍",
+        "hashtags": ["#LàmĐẹp", "#SonLì", "#TikTokShop", "#ReviewSảnPhẩm"],
+        "call_to_action": "Link shop ở dưới nha! 👇"
+    }, ensure_ascii=False)
+
+
+class _FakeCompletions:
+    def __init__(self, fake: "FakeGLMModel"):
+        self._fake = fake
+
+    def create(self, model: str, messages: List[Dict[str, str]], **params):
+        fake = self._fake
+        with fake._lock:
+            fake.calls += 1
+            delay = fake.latency + (fake._random.uniform(0, fake.jitter) if fake.jitter else 0.0)
+            fail = fake.failure_rate and fake._random.random() < fake.failure_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            # What the OpenAI client raises on a dropped connection, so the
+            # failure is retried and counted by the circuit breaker
+            raise APIConnectionError(
+                message="Injected fake GLM failure",
+                request=httpx.Request("POST", f"{FAKE_BASE_URL}/chat/completions")
+            )
+
+        completion_tokens = min(fake.completion_tokens, params.get("max_tokens", fake.completion_tokens))
+        prompt_tokens = count_message_tokens(messages)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=fake.responder(messages)))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        )
+
+
+class FakeGLMModel(GLMModel):
+    """
+    Deterministic GLMModel for offline runs
+
+    Args:
+        model_id: Model id reported in responses and usage
+        latency: Seconds each raw request takes
+        jitter: Extra uniform random latency in [0, jitter] (seeded)
+        completion_tokens: Completion tokens reported per call
+        failure_rate: Fraction of raw requests that raise APIConnectionError (seeded)
+        responder: Builds response content from the chat messages
+        seed: Random seed for jitter and failures
+    """
+
+    def __init__(
+        self,
+        model_id: str = DEFAULT_MODEL,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        completion_tokens: int = 400,
+        failure_rate: float = 0.0,
+        responder: Optional[Callable[[List[Dict[str, str]]], str]] = None,
+        seed: int = 42,
+        **kwargs
+    ):
+        # No OpenAIChat/OpenAI clients and no API key needed
+        self.model_id = model_id
+        self.api_key = "fake"
+        self.client = None
+        self.fallback_model_id = FALLBACK_MODEL if FALLBACK_MODEL != model_id else None
+        self.live = True
+        self.default_params = {
+            key: kwargs[key] for key in ("temperature", "max_tokens", "top_p") if key in kwargs
+        }
+
+        self.latency = latency
+        self.jitter = jitter
+        self.completion_tokens = completion_tokens
+        self.failure_rate = failure_rate
+        self.responder = responder or default_fake_response
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._api = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(self)))
+
+
+class InMemoryVectorDB:
+    """Dict-backed PgVector replacement (keyword-overlap search)"""
+
+    def __init__(self, table_name: str = "", db_url: str = "", embedder: Any = None, **kwargs):
+        self.table_name = table_name
+        self.documents: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def upsert(self, document: Dict):
+        with self._lock:
+            self.documents[document["id"]] = document
+
+    def search(self, query: str, limit: int = 5) -> List[Dict]:
+        terms = _match_terms(query)
+        with self._lock:
+            scored = [
+                (len(terms & _match_terms(doc.get("content", ""))), doc)
+                for doc in self.documents.values()
+            ]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [doc for score, doc in scored[:limit] if score > 0]
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+
+class InMemoryStorage:
+    """No-op PostgresStorage replacement"""
+
+    def __init__(self, table_name: str = "", db_url: str = "", **kwargs):
+        self.table_name = table_name
+
+
+def install_fake_backends(latency: float = 0.0, completion_tokens: int = 400) -> FakeGLMModel:
+    """
+    Point every agent at the offline fakes for the rest of the process
+
+    Used by main.py when AGENTOS_FAKE_BACKENDS is set (load testing); the
+    benchmark suite patches the same names per test with monkeypatch.
+
+    Returns:
+        The shared FakeGLMModel
+    """
+    from . import content_strategist, text_creator, trend_monitor
+    from .rate_limiter import RateGovernor, set_rate_governor
+    from .region_scan import TREND_SCAN_CONFIG, RegionLimits, set_region_limits
+    from .scan_checkpoint import ScanCheckpoint, set_scan_checkpoint
+    from .trend_detector import EmergingTrendDetector, set_emerging_detector
+    from .trend_history import TrendHistory, set_trend_history
+
+    fake = FakeGLMModel(latency=latency, completion_tokens=completion_tokens, max_tokens=4096)
+
+    for module in (trend_monitor, content_strategist, text_creator):
+        module.PostgresStorage = InMemoryStorage
+        module.create_vietnamese_glm = lambda *args, **kwargs: fake
+    for module in (trend_monitor, content_strategist):
+        module.PgVector = InMemoryVectorDB
+
+    # The fake has no provider quota to protect
+    set_rate_governor(RateGovernor(
+        requests_per_minute=10**9,
+        tokens_per_minute=10**12,
+        initial_concurrency=256,
+        max_concurrency=256
+    ))
+    # Offline: trend history, detector state and checkpoints stay in memory
+    set_trend_history(TrendHistory())
+    set_emerging_detector(EmergingTrendDetector())
+    set_scan_checkpoint(ScanCheckpoint())
+    for region in TREND_SCAN_CONFIG.get("regions", ["VN"]):
+        set_region_limits(RegionLimits(region, requests_per_minute=10**9, max_concurrency=256), region)
+    return fake
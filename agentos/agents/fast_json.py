@@ -0,0 +1,48 @@
+"""
+Fast JSON encoding for API responses (orjson)
+
+orjson writes UTF-8 directly, so Vietnamese text and emoji are emitted as
+the same bytes FastAPI's default JSONResponse produces
+(json.dumps(..., ensure_ascii=False, separators=(",", ":")).encode("utf-8")),
+never as \\u escapes. Only floats below 1e-4 or from 1e16 up may differ
+in notation for the same value (0.00001 vs 1e-05).
+
+Records from agents.schemas (dataclasses) are serialized natively from
+their instance __dict__, without going through to_dict() or
+jsonable_encoder; unset optional fields are left out.
+
+Use FastJSONResponse as the app's default_response_class, and return it
+directly from hot endpoints: FastAPI only skips its jsonable_encoder pass
+for responses the endpoint builds itself.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Non-str keys are stringified as json.dumps does
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not know (pydantic models, sets, Decimal...) as FastAPI would encode them"""
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def dumps_line(content: Any) -> bytes:
+    """One NDJSON line (JSON plus trailing newline)"""
+    return orjson.dumps(content, default=_default, option=_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -5,22 +5,213 @@ This module provides a clean interface for using Z.AI GLM models
 with the Agno framework through OpenAI compatibility.
 """
 
+import contextvars
 import os
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, List, Union, Callable
 from agno.models.openai import OpenAIChat
+from openai import OpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
 import logging
+from .cost_accounting import current_cost_labels, get_cost_ledger, usage_cost
+from .token_budget import TokenBudget, TokenBudgetExceeded, count_message_tokens
+from .rate_limiter import get_rate_governor
+from .tracing import span
 
 # Import centralized configuration
 try:
-    from ..config.models import DEFAULT_MODEL, MODEL_CAPABILITIES
+    from ..config.models import (
+        DEFAULT_MODEL, FALLBACK_MODEL, LIVE_LLM_CALLS, MODEL_CAPABILITIES, RESILIENCE_CONFIG
+    )
 except ImportError:
-    # Fallback if config not available
-    DEFAULT_MODEL = "glm-4.6"
-    MODEL_CAPABILITIES = {}
+    try:
+        from config.models import (
+            DEFAULT_MODEL, FALLBACK_MODEL, LIVE_LLM_CALLS, MODEL_CAPABILITIES, RESILIENCE_CONFIG
+        )
+    except ImportError:
+        # Fallback if config not available
+        DEFAULT_MODEL = "glm-4.6"
+        FALLBACK_MODEL = "glm-4-plus"
+        LIVE_LLM_CALLS = False
+        MODEL_CAPABILITIES = {}
+        RESILIENCE_CONFIG = {}
 
 logger = logging.getLogger(__name__)
 
 
+class CircuitOpenError(RuntimeError):
+    """Raised when every candidate model has an open circuit"""
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding window of recent calls
+
+    closed → open when the failure rate in the window reaches the threshold,
+    open → half_open after reset_timeout, half_open → closed on a successful
+    probe (or straight back to open on a failed one).
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._outcomes = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a call may be attempted right now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._outcomes.append(True)
+            if self.state == "half_open":
+                self.state = "closed"
+                self._outcomes.clear()
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            if self.state == "half_open":
+                self._trip()
+                return
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate_threshold
+            ):
+                self._trip()
+
+    def record_ignored(self):
+        """Outcome that says nothing about the provider's health; frees a half-open probe"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _trip(self):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        logger.warning("GLM circuit opened")
+
+    @property
+    def failure_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for percentile estimates"""
+
+    def __init__(self, window_size: int = 200):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float, min_samples: int = 1) -> Optional[float]:
+        """Return the pct-th percentile latency, or None with too few samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+# Breakers and latency windows are per model and shared by every GLMModel
+# in the process, so all agents see the same health of the upstream model.
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_latency_trackers: Dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+# Threads for primary + hedged requests
+_hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="glm-call")
+
+
+def get_circuit_breaker(model_id: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a model"""
+    with _registry_lock:
+        if model_id not in _circuit_breakers:
+            _circuit_breakers[model_id] = CircuitBreaker(
+                failure_rate_threshold=RESILIENCE_CONFIG.get("breaker_failure_rate", 0.5),
+                window_size=RESILIENCE_CONFIG.get("breaker_window_size", 20),
+                min_calls=RESILIENCE_CONFIG.get("breaker_min_calls", 5),
+                reset_timeout=RESILIENCE_CONFIG.get("breaker_reset_timeout", 30.0)
+            )
+        return _circuit_breakers[model_id]
+
+
+def get_latency_tracker(model_id: str) -> LatencyTracker:
+    """Get the process-wide latency window for a model"""
+    with _registry_lock:
+        if model_id not in _latency_trackers:
+            _latency_trackers[model_id] = LatencyTracker()
+        return _latency_trackers[model_id]
+
+
+# Callbacks receiving token usage after every successful completion
+_usage_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def register_usage_listener(listener: Callable[[Dict[str, Any]], None]):
+    """
+    Register a callback for token usage events
+
+    Each event has provider, model, prompt_tokens, completion_tokens,
+    estimated (True when the API returned no usage block), latency_seconds,
+    cost_usd and the cost labels (agent, brief_id, workflow_id) active
+    in the calling context.
+    """
+    _usage_listeners.append(listener)
+
+
+def _emit_usage(event: Dict[str, Any]):
+    for listener in _usage_listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            logger.error(f"Usage listener failed: {e}")
+
+
+register_usage_listener(get_cost_ledger().record)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection errors, 429 and 5xx are worth retrying"""
+    if isinstance(error, (APITimeoutError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
 class GLMModel:
     """
     Z.AI GLM Model wrapper for Agno framework
@@ -67,6 +258,8 @@ class GLMModel:
         model_id: str = DEFAULT_MODEL,
         api_key: Optional[str] = None,
         base_url: str = "https://open.bigmodel.cn/api/paas/v4/",
+        fallback_model_id: Optional[str] = FALLBACK_MODEL,
+        live: Optional[bool] = None,
         **kwargs
     ):
         """
@@ -76,6 +269,8 @@ class GLMModel:
             model_id: GLM model identifier
             api_key: Zhipu API key (defaults to ZHIPU_API_KEY env var)
             base_url: API base URL
+            fallback_model_id: Model to fail over to when model_id is unhealthy
+            live: Send real requests from agents (defaults to GLM_LIVE_CALLS)
             **kwargs: Additional arguments for OpenAIChat
         """
         if model_id not in self.AVAILABLE_MODELS:
@@ -97,13 +292,257 @@ class GLMModel:
             base_url=base_url,
             **kwargs
         )
+
+        # Raw client for direct completions; retries are handled by complete()
+        self.fallback_model_id = fallback_model_id if fallback_model_id != model_id else None
+        self.live = LIVE_LLM_CALLS if live is None else live
+        self.default_params = {
+            key: kwargs[key] for key in ("temperature", "max_tokens", "top_p") if key in kwargs
+        }
+        self._api = OpenAI(
+            api_key=self.api_key,
+            base_url=base_url,
+            timeout=RESILIENCE_CONFIG.get("request_timeout", 60.0),
+            max_retries=0
+        )
         
-        logger.info(f"Initialized GLM model: {model_id}")
+        logger.info(f"Initialized GLM model: {model_id} (fallback: {self.fallback_model_id})")
     
+    def complete(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        system: Optional[str] = None,
+        **params
+    ) -> Dict[str, Any]:
+        """
+        Run a chat completion with retry, circuit breaking, hedging and fallback
+
+        The primary model is tried first; if its circuit is open or all retries
+        fail, the request fails over to the fallback model.
+
+        Args:
+            prompt: User prompt, or a full list of chat messages
+            system: Optional system prompt (ignored when messages are passed)
+            **params: Extra completion parameters (temperature, max_tokens, ...)
+
+        Returns:
+            Completion with content, model, usage and latency
+        """
+        if isinstance(prompt, str):
+            messages = [{"role": "user", "content": prompt}]
+            if system:
+                messages.insert(0, {"role": "system", "content": system})
+        else:
+            messages = prompt
+
+        request_params = {**self.default_params, **params}
+
+        # Pre-flight: refuse prompts that cannot fit and clamp the completion
+        # so prompt + completion stays inside the context window
+        budget = self.token_budget()
+        prompt_tokens = count_message_tokens(messages)
+        if prompt_tokens > budget.prompt_limit:
+            raise TokenBudgetExceeded(
+                f"Prompt is ~{prompt_tokens} tokens, {self.model_id} allows {budget.prompt_limit}"
+            )
+        request_params["max_tokens"] = min(
+            request_params.get("max_tokens", budget.max_completion_tokens),
+            budget.completion_allowance(prompt_tokens)
+        )
+
+        last_error: Optional[BaseException] = None
+
+        for model_id in filter(None, [self.model_id, self.fallback_model_id]):
+            breaker = get_circuit_breaker(model_id)
+            if not breaker.allow_request():
+                logger.warning(f"Circuit open for {model_id}, skipping")
+                continue
+
+            try:
+                result = self._complete_with_retry(model_id, messages, request_params, prompt_tokens)
+            except Exception as e:
+                last_error = e
+                logger.error(f"GLM call failed on {model_id}: {e}")
+                continue
+
+            result["fallback_used"] = model_id != self.model_id
+            if result["fallback_used"]:
+                logger.warning(f"Served by fallback model {model_id}")
+
+            # Prefer exact counts from the API, fall back to the estimate
+            usage = result["usage"]
+            estimated = not usage["prompt_tokens"]
+            if estimated:
+                usage["prompt_tokens"] = prompt_tokens
+            _emit_usage({
+                "provider": "zai",
+                "model": model_id,
+                "prompt_tokens": usage["prompt_tokens"],
+                "completion_tokens": usage["completion_tokens"],
+                "estimated": estimated,
+                "latency_seconds": result["latency_seconds"],
+                "cost_usd": usage_cost(model_id, usage["prompt_tokens"], usage["completion_tokens"]),
+                **current_cost_labels()
+            })
+            return result
+
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpenError(f"No healthy GLM model available ({self.model_id}, {self.fallback_model_id})")
+
+    def _complete_with_retry(
+        self,
+        model_id: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        prompt_tokens: int = 0
+    ) -> Dict[str, Any]:
+        """Retry one model with jittered exponential backoff"""
+        breaker = get_circuit_breaker(model_id)
+        retrying = Retrying(
+            stop=stop_after_attempt(RESILIENCE_CONFIG.get("max_attempts", 3)),
+            wait=wait_random_exponential(
+                multiplier=RESILIENCE_CONFIG.get("backoff_multiplier", 0.5),
+                max=RESILIENCE_CONFIG.get("backoff_max", 8.0)
+            ),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
+
+        for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1 and not breaker.allow_request():
+                    raise CircuitOpenError(f"Circuit open for {model_id}")
+                try:
+                    result = self._hedged_call(model_id, messages, params, prompt_tokens)
+                except Exception as e:
+                    # Only outages count against the circuit: a 400, a local
+                    # rate-limit timeout or a parse error isn't the provider failing
+                    if _is_retryable(e):
+                        breaker.record_failure()
+                    else:
+                        breaker.record_ignored()
+                    raise
+                breaker.record_success()
+                return result
+
+    def _hedged_call(
+        self,
+        model_id: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        prompt_tokens: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Send the request, and a second copy if it is slower than recent p95
+
+        The first successful response wins. Without enough latency samples
+        (or with hedging disabled) this is a plain single call.
+        """
+        hedge_delay = None
+        if RESILIENCE_CONFIG.get("hedge_enabled", True):
+            p95 = get_latency_tracker(model_id).percentile(
+                RESILIENCE_CONFIG.get("hedge_percentile", 95),
+                min_samples=RESILIENCE_CONFIG.get("hedge_min_samples", 20)
+            )
+            if p95 is not None:
+                hedge_delay = min(
+                    max(p95, RESILIENCE_CONFIG.get("hedge_min_delay", 0.5)),
+                    RESILIENCE_CONFIG.get("hedge_max_delay", 30.0)
+                )
+
+        if hedge_delay is None:
+            return self._call_model(model_id, messages, params, prompt_tokens)
+
+        # Copy the trace context so request spans nest under the caller's span
+        primary = _hedge_executor.submit(
+            contextvars.copy_context().run, self._call_model, model_id, messages, params, prompt_tokens
+        )
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        logger.info(f"Hedging {model_id} request after {hedge_delay:.2f}s")
+        hedge = _hedge_executor.submit(
+            contextvars.copy_context().run, self._call_model, model_id, messages, params, prompt_tokens
+        )
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    result = future.result()
+                    result["hedged"] = True
+                    return result
+                error = future.exception()
+
+        raise error
+
+    def _call_model(
+        self,
+        model_id: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        prompt_tokens: int = 0
+    ) -> Dict[str, Any]:
+        """Single raw request to the Z.AI chat completions API (rate limited)"""
+        with span("glm.request", model=model_id, prompt_tokens=prompt_tokens) as request_span, \
+                get_rate_governor().slot(prompt_tokens) as slot:
+            started = time.perf_counter()
+            try:
+                response = self._api.chat.completions.create(
+                    model=model_id,
+                    messages=messages,
+                    **params
+                )
+            except RateLimitError as e:
+                retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+                slot.throttle(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                raise
+            latency = time.perf_counter() - started
+            usage = response.usage
+            slot.complete(completion_tokens=usage.completion_tokens if usage else 0, latency=latency)
+            request_span.set_attribute("completion_tokens", usage.completion_tokens if usage else 0)
+
+        get_latency_tracker(model_id).record(latency)
+        return {
+            "content": response.choices[0].message.content or "",
+            "model": model_id,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens if usage else 0,
+                "completion_tokens": usage.completion_tokens if usage else 0,
+                "total_tokens": usage.total_tokens if usage else 0
+            },
+            "latency_seconds": latency,
+            "hedged": False
+        }
+
+    def token_budget(self, max_prompt_tokens: Optional[int] = None) -> TokenBudget:
+        """
+        Get the prompt token budget for this model
+
+        Args:
+            max_prompt_tokens: Optional cap below the context window
+
+        Returns:
+            TokenBudget sized from MODEL_CAPABILITIES
+        """
+        capabilities = MODEL_CAPABILITIES.get(self.model_id) or self.AVAILABLE_MODELS.get(self.model_id, {})
+        return TokenBudget(
+            model_id=self.model_id,
+            context_window=capabilities.get("context_window", 128000),
+            max_completion_tokens=self.default_params.get("max_tokens", capabilities.get("max_tokens", 4096)),
+            max_prompt_tokens=max_prompt_tokens
+        )
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model"""
         return {
             "model_id": self.model_id,
+            "fallback_model_id": self.fallback_model_id,
+            "circuit_state": get_circuit_breaker(self.model_id).state,
             "info": self.AVAILABLE_MODELS.get(self.model_id, {}),
             "provider": "Z.AI",
             "api_base": "https://open.bigmodel.cn/api/paas/v4/"
@@ -0,0 +1,197 @@
+"""
+Hashtag index for brief hashtags
+
+Hashtags are bucketed by category ("category:beauty") and by keyword /
+product tag ("tag:lam dep"), every bucket kept sorted by popularity. A
+brief asks for its category and product tags and gets the top-k hashtags
+across those buckets, deduplicated by hashtag_key (#ĂnVặt == #AnVat).
+The result comes from a lazy merge of the pre-sorted buckets, so it costs
+O(k log buckets) no matter how many hashtags are indexed.
+
+Popularity comes from the trends TrendMonitor upserts into tiktok_trends
+(engaged views = views * engagement rate), and decays with a half-life so
+yesterday's spike gives way to today's. Decay is folded into a static
+rank (log popularity + time * ln2 / half-life), which orders entries
+exactly as the decayed scores would at any later moment, so an upsert
+only repositions its own hashtag.
+
+The static per-category lists ContentStrategist used before seed the
+index; seeded tags rank below every observed trend, in seed order.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+import threading
+import time
+
+from .vietnamese_text import hashtag_key, match_key, nfc
+
+# Included in every lookup
+COMMON_BUCKET = "common"
+
+SEED_HASHTAGS = {
+    "beauty": ["#LàmĐẹp", "#BeautyVietNam", "#MakeupTips", "#Skincare"],
+    "fashion": ["#ThờiTrang", "#FashionVN", "#OOTD", "#StyleViệtNam"],
+    "food": ["#ĂnVặt", "#FoodVietNam", "#SnackTime", "#ĂnNgon"],
+    "electronics": ["#CôngNghệ", "#TechVN", "#Gadget", "#ĐiệnTử"],
+    COMMON_BUCKET: ["#TikTokShop", "#MuaSắm", "#GiảmGiá", "#Review"]
+}
+
+DEFAULT_HALF_LIFE = 24 * 3600.0  # seconds
+
+
+def category_bucket(category: str) -> str:
+    return f"category:{match_key(category)}"
+
+
+def tag_bucket(tag: str) -> str:
+    return f"tag:{match_key(tag)}"
+
+
+@dataclass
+class _Entry:
+    tag: str
+    rank: float
+    seq: int
+    popularity: float = 0.0
+    buckets: Set[str] = field(default_factory=set)
+
+    @property
+    def sort_key(self) -> Tuple[float, int, str]:
+        # Ascending order = most popular first; seq breaks ties (seed order)
+        return (-self.rank, self.seq, hashtag_key(self.tag))
+
+
+class HashtagIndex:
+    """
+    Popularity-ranked hashtags per category and tag
+
+    Args:
+        half_life: Seconds for an observed popularity to halve
+        seed: {category: [hashtags]} to start with (COMMON_BUCKET for all)
+    """
+
+    def __init__(self, half_life: float = DEFAULT_HALF_LIFE, seed: Optional[Dict[str, List[str]]] = None):
+        self.half_life = half_life
+        self._entries: Dict[str, _Entry] = {}
+        self._buckets: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+        for category, tags in (SEED_HASHTAGS if seed is None else seed).items():
+            bucket = COMMON_BUCKET if category == COMMON_BUCKET else category_bucket(category)
+            for tag in tags:
+                self.add(tag, buckets=[bucket])
+
+    def _rank(self, popularity: float, observed_at: float) -> float:
+        if popularity <= 0:
+            return float("-inf")
+        return math.log(popularity) + observed_at * math.log(2) / self.half_life
+
+    def add(self, tag: str, buckets: Iterable[str], popularity: float = 0.0, observed_at: Optional[float] = None):
+        """
+        Index a hashtag under buckets, raising its popularity if this one is higher
+
+        Args:
+            tag: Hashtag (with or without #)
+            buckets: Bucket names (category_bucket()/tag_bucket()/COMMON_BUCKET)
+            popularity: Engaged views (0 for seeded/static tags)
+            observed_at: Unix time of the observation (default now)
+        """
+        key = hashtag_key(tag)
+        if not key:
+            return
+        rank = self._rank(popularity, time.time() if observed_at is None else observed_at)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._seq += 1
+                tag = nfc(tag if tag.startswith("#") else f"#{tag}")
+                entry = self._entries[key] = _Entry(tag=tag, rank=rank, seq=self._seq)
+            elif rank > entry.rank:
+                # Reposition in the buckets it is already in
+                old_key = entry.sort_key
+                entry.rank = rank
+                for bucket in entry.buckets:
+                    items = self._buckets[bucket]
+                    del items[bisect_left(items, old_key)]
+                    insort(items, entry.sort_key)
+            entry.popularity = max(entry.popularity, popularity)
+
+            for bucket in set(buckets) - entry.buckets:
+                entry.buckets.add(bucket)
+                insort(self._buckets.setdefault(bucket, []), entry.sort_key)
+
+    def observe_trend(self, trend, observed_at: Optional[float] = None):
+        """Index an upserted trend's hashtag under its category and keywords"""
+        popularity = trend.get("views", 0) * trend.get("engagement_rate", 0) / 100
+        buckets = [tag_bucket(keyword) for keyword in trend.get("keywords", [])]
+        if trend.get("category"):
+            buckets.append(category_bucket(trend["category"]))
+        self.add(trend["hashtag"], buckets, popularity=popularity, observed_at=observed_at)
+
+    def top_k(
+        self,
+        categories: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        k: int = 10,
+        exclude: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Most popular hashtags for the categories/tags (plus the common ones)
+
+        Args:
+            categories: Product or trend categories
+            tags: Product tags / keywords
+            k: Number of hashtags
+            exclude: Hashtags already chosen (e.g. the trend's own)
+
+        Returns:
+            Up to k distinct hashtags, most popular first
+        """
+        seen = {hashtag_key(tag) for tag in exclude}
+        names = {category_bucket(c) for c in categories} | {tag_bucket(t) for t in tags} | {COMMON_BUCKET}
+        result = []
+
+        with self._lock:
+            buckets = [self._buckets[name] for name in names if name in self._buckets]
+            for _, _, key in heapq.merge(*buckets):
+                if key in seen:
+                    continue
+                seen.add(key)
+                result.append(self._entries[key].tag)
+                if len(result) >= k:
+                    break
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hashtags": len(self._entries),
+                "buckets": len(self._buckets),
+                "observed": sum(1 for entry in self._entries.values() if entry.popularity > 0)
+            }
+
+
+_index: Optional[HashtagIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_hashtag_index() -> HashtagIndex:
+    """The process-wide index, seeded on first use and fed by trend scans"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = HashtagIndex()
+        return _index
+
+
+def set_hashtag_index(index: Optional[HashtagIndex]):
+    """Replace the process-wide index (None reseeds on next use)"""
+    global _index
+    with _index_lock:
+        _index = index
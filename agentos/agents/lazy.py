@@ -0,0 +1,68 @@
+"""
+Lazy construction helpers for agents and knowledge bases
+
+Agents open Postgres storage, PgVector tables and a GLM client when they are
+constructed, which is too slow to do before the pod reports ready. Wrapping
+them in LazyResource defers that work to first use (or a background warm-up)
+and records how long each build took for the startup timing report.
+"""
+
+from typing import Callable, Dict, Generic, Optional, TypeVar
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# name -> seconds, in the order things were timed
+_startup_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+def record_startup_timing(name: str, seconds: float):
+    """Add a phase to the startup timing report"""
+    with _timings_lock:
+        _startup_timings[name] = round(seconds, 4)
+
+
+def get_startup_report() -> Dict[str, float]:
+    """Get all recorded startup phases (seconds)"""
+    with _timings_lock:
+        return dict(_startup_timings)
+
+
+class LazyResource(Generic[T]):
+    """
+    Build an expensive object on first use
+
+    Thread-safe: concurrent first callers wait for a single build. A failed
+    build is not cached, so the next call retries it.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        self.build_seconds: Optional[float] = None
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        """Return the instance, building it if needed"""
+        if self._instance is not None:
+            return self._instance
+
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                logger.info(f"Initializing {self.name}...")
+                self._instance = self._factory()
+                self.build_seconds = time.perf_counter() - started
+                record_startup_timing(self.name, self.build_seconds)
+                logger.info(f"✅ {self.name} initialized in {self.build_seconds:.2f}s")
+        return self._instance
@@ -0,0 +1,232 @@
+"""
+Agent Pool - Bounded pool of agent instances for concurrent requests
+
+agno Agent objects carry per-run state (messages, run response, session),
+so one instance must never serve two requests at the same time. The pool
+hands each request its own instance and takes it back afterwards:
+
+    async with pool.alease() as agent:
+        result = await asyncio.to_thread(agent.run_copy_generation, ...)
+
+Instances are built on demand up to `size`, pre-built by warm_up(), checked
+with health_check when they have been idle for a while, recycled after
+max_uses and discarded whenever a run raised (its state may be corrupt).
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PoolTimeout(TimeoutError):
+    """Raised when no instance became available within the checkout timeout"""
+
+
+class _PooledInstance(Generic[T]):
+    def __init__(self, instance: T):
+        self.instance = instance
+        self.uses = 0
+        self.last_checked = time.monotonic()
+
+
+def check_agent_storage(agent) -> bool:
+    """
+    Health check: the agent's Postgres storage still accepts connections
+
+    Agents without a SQLAlchemy-backed storage are treated as healthy.
+    """
+    engine = getattr(getattr(agent, "storage", None), "db_engine", None)
+    if engine is None:
+        return True
+    try:
+        from sqlalchemy import text
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning(f"Agent storage health check failed: {e}")
+        return False
+
+
+class AgentPool(Generic[T]):
+    """
+    Bounded pool of pre-built instances of one agent type
+
+    Args:
+        name: Pool name for logs and stats
+        factory: Builds a new instance
+        size: Maximum number of instances (and concurrent leases)
+        health_check: Returns False for instances that must be replaced
+        health_check_interval: Only re-check instances idle this long (seconds)
+        max_uses: Recycle an instance after this many leases (None = never)
+        checkout_timeout: Seconds to wait for a free instance
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], T],
+        size: int = 2,
+        health_check: Optional[Callable[[T], bool]] = None,
+        health_check_interval: float = 60.0,
+        max_uses: Optional[int] = None,
+        checkout_timeout: float = 30.0
+    ):
+        self.name = name
+        self.size = size
+        self._factory = factory
+        self._health_check = health_check
+        self.health_check_interval = health_check_interval
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+
+        self._idle: List[_PooledInstance[T]] = []
+        self._leased: Dict[int, _PooledInstance[T]] = {}
+        self._created = 0  # built or being built
+        self._condition = threading.Condition()
+
+    def _build(self) -> _PooledInstance[T]:
+        started = time.perf_counter()
+        try:
+            instance = self._factory()
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+        logger.info(f"Pool {self.name}: built instance in {time.perf_counter() - started:.2f}s")
+        return _PooledInstance(instance)
+
+    def _is_healthy(self, pooled: _PooledInstance[T]) -> bool:
+        if self._health_check is None:
+            return True
+        if time.monotonic() - pooled.last_checked < self.health_check_interval:
+            return True
+        pooled.last_checked = time.monotonic()
+        try:
+            return bool(self._health_check(pooled.instance))
+        except Exception as e:
+            logger.warning(f"Pool {self.name}: health check raised {e}")
+            return False
+
+    def _discard(self, pooled: _PooledInstance[T]):
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+
+    def checkout(self, timeout: Optional[float] = None) -> T:
+        """Take an instance, building one if the pool is not full yet"""
+        deadline = time.monotonic() + (self.checkout_timeout if timeout is None else timeout)
+
+        while True:
+            build = False
+            with self._condition:
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._condition.wait(timeout=remaining):
+                        raise PoolTimeout(f"No {self.name} instance available within timeout")
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    self._created += 1
+                    build = True
+
+            if build:
+                pooled = self._build()
+            elif not self._is_healthy(pooled):
+                logger.warning(f"Pool {self.name}: replacing unhealthy instance")
+                self._discard(pooled)
+                continue
+
+            with self._condition:
+                pooled.uses += 1
+                self._leased[id(pooled.instance)] = pooled
+            return pooled.instance
+
+    def release(self, instance: T, healthy: bool = True):
+        """Return an instance; unhealthy or worn-out instances are dropped"""
+        with self._condition:
+            pooled = self._leased.pop(id(instance), None)
+            if pooled is None:
+                return
+            if not healthy or (self.max_uses is not None and pooled.uses >= self.max_uses):
+                self._created -= 1
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+    def _release_abandoned(self, checkout: "asyncio.Future[T]"):
+        if not checkout.cancelled() and checkout.exception() is None:
+            self.release(checkout.result())
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Checkout for the duration of a with-block (sync callers)"""
+        instance = self.checkout(timeout)
+        healthy = True
+        try:
+            yield instance
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            self.release(instance, healthy=healthy)
+
+    @asynccontextmanager
+    async def alease(self, timeout: Optional[float] = None):
+        """Checkout without blocking the event loop (async callers)"""
+        checkout = asyncio.ensure_future(asyncio.to_thread(self.checkout, timeout))
+        try:
+            instance = await asyncio.shield(checkout)
+        except asyncio.CancelledError:
+            # The worker thread cannot be stopped and may still take an
+            # instance: hand it back once it does, or the pool shrinks
+            checkout.add_done_callback(self._release_abandoned)
+            raise
+        healthy = True
+        try:
+            yield instance
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            self.release(instance, healthy=healthy)
+
+    def warm_up(self, count: int = 1, prepare: Optional[Callable[[T], None]] = None):
+        """
+        Pre-build instances so the first requests don't pay for construction
+
+        Args:
+            count: Number of instances to have ready (capped at size)
+            prepare: Optional extra initialization run on each instance
+        """
+        instances = []
+        healthy = True
+        try:
+            for _ in range(min(count, self.size)):
+                instance = self.checkout()
+                instances.append(instance)
+                if prepare:
+                    prepare(instance)
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            for instance in instances:
+                self.release(instance, healthy=healthy)
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": len(self._leased)
+            }
@@ -0,0 +1,389 @@
+"""
+Rate Limiter - Client-side rate limiting and concurrency control for the Z.AI API
+
+Every GLM request passes through one process-wide RateGovernor:
+1. A requests-per-minute token bucket
+2. A tokens-per-minute token bucket (prompt tokens reserved up front,
+   completion tokens debited once the response arrives)
+3. An AIMD concurrency limit that halves on 429s / slow responses and
+   grows by one slot per window of healthy responses
+
+The two buckets can optionally live in Postgres (guarded by advisory locks)
+so all replicas share one budget instead of each assuming the full quota.
+"""
+
+from contextlib import contextmanager
+from typing import Optional
+import logging
+import threading
+import time
+
+# Import centralized configuration
+try:
+    from ..config.models import RATE_LIMIT_CONFIG
+except ImportError:
+    try:
+        from config.models import RATE_LIMIT_CONFIG
+    except ImportError:
+        RATE_LIMIT_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a request could not get capacity within the acquire timeout"""
+
+
+class TokenBucket:
+    """
+    In-process token bucket
+
+    Args:
+        capacity: Maximum burst size
+        refill_per_second: Sustained rate
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._updated_at = now
+
+    def try_acquire(self, amount: float) -> float:
+        """
+        Take amount tokens if available
+
+        Returns:
+            0.0 if acquired, otherwise seconds to wait before retrying
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.refill_per_second
+
+    def debit(self, amount: float):
+        """Charge tokens after the fact (the balance may go negative)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while (e.g. after a Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class PostgresTokenBucket:
+    """
+    Token bucket shared by all replicas through a Postgres row
+
+    Each acquire runs in a short transaction holding a transaction-level
+    advisory lock on the bucket name, so replicas serialize on the bucket
+    without long-lived row locks. Falls back to a local bucket whenever the
+    database is unreachable.
+    """
+
+    TABLE_NAME = "glm_rate_limits"
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float, db_url: str):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.db_url = db_url
+        self._conn = None
+        self._lock = threading.Lock()
+        self._local = TokenBucket(capacity, refill_per_second)
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            import psycopg2
+            self._conn = psycopg2.connect(self.db_url)
+            with self._conn, self._conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                        bucket TEXT PRIMARY KEY,
+                        tokens DOUBLE PRECISION NOT NULL,
+                        updated_at DOUBLE PRECISION NOT NULL,
+                        paused_until DOUBLE PRECISION NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+        return self._conn
+
+    def _update(self, amount: float, require_available: bool) -> float:
+        """Refill and charge the shared bucket inside one locked transaction"""
+        conn = self._connection()
+        with conn, conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"{self.TABLE_NAME}:{self.name}",))
+            cur.execute("SELECT EXTRACT(EPOCH FROM clock_timestamp())")
+            now = float(cur.fetchone()[0])
+            cur.execute(
+                f"SELECT tokens, updated_at, paused_until FROM {self.TABLE_NAME} WHERE bucket = %s",
+                (self.name,)
+            )
+            row = cur.fetchone()
+            tokens, updated_at, paused_until = row if row else (self.capacity, now, 0.0)
+
+            if require_available and now < paused_until:
+                return paused_until - now
+
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+            wait = 0.0
+            if not require_available or tokens >= amount:
+                tokens -= amount
+            else:
+                wait = (amount - tokens) / self.refill_per_second
+
+            cur.execute(
+                f"""
+                INSERT INTO {self.TABLE_NAME} (bucket, tokens, updated_at, paused_until)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (bucket) DO UPDATE
+                SET tokens = EXCLUDED.tokens, updated_at = EXCLUDED.updated_at
+                """,
+                (self.name, tokens, now, paused_until)
+            )
+            return wait
+
+    def try_acquire(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            try:
+                return self._update(amount, require_available=True)
+            except Exception as e:
+                logger.warning(f"Shared rate limit unavailable ({e}), using local bucket")
+                self._conn = None
+                return self._local.try_acquire(amount)
+
+    def debit(self, amount: float):
+        with self._lock:
+            try:
+                self._update(amount, require_available=False)
+            except Exception as e:
+                logger.warning(f"Shared rate limit unavailable ({e}), using local bucket")
+                self._conn = None
+                self._local.debit(amount)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn, conn.cursor() as cur:
+                    # Upsert like _update: a pause before the first charge
+                    # must still create the row (full bucket, paused)
+                    cur.execute(
+                        f"""
+                        INSERT INTO {self.TABLE_NAME} (bucket, tokens, updated_at, paused_until)
+                        VALUES (
+                            %s, %s,
+                            EXTRACT(EPOCH FROM clock_timestamp()),
+                            EXTRACT(EPOCH FROM clock_timestamp()) + %s
+                        )
+                        ON CONFLICT (bucket) DO UPDATE
+                        SET paused_until = GREATEST({self.TABLE_NAME}.paused_until, EXCLUDED.paused_until)
+                        """,
+                        (self.name, self.capacity, seconds)
+                    )
+            except Exception as e:
+                logger.warning(f"Shared rate limit unavailable ({e}), using local bucket")
+                self._conn = None
+                self._local.pause(seconds)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit
+
+    Additive increase: +1 slot after `limit` consecutive healthy responses.
+    Multiplicative decrease: limit * decrease_factor on a 429 or a response
+    slower than latency_target, at most once per congestion window - requests
+    already in flight when the limit was cut report the same congestion and
+    don't cut it again.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_target: float = 20.0,
+        decrease_factor: float = 0.5
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._healthy_streak = 0
+        # When the last decrease happened; outcomes of requests started
+        # before it belong to the window that was already reacted to
+        self._window_start = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a free slot; False if none freed up within timeout"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout=timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        throttled: bool = False,
+        started: Optional[float] = None
+    ):
+        """
+        Free a slot and adjust the limit from the outcome
+
+        started is the time.monotonic() at acquire; without it the request
+        is taken to have started `latency` seconds ago.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled or (latency is not None and latency > self.latency_target):
+                now = time.monotonic()
+                if started is None:
+                    started = now - (latency or 0.0)
+                self._healthy_streak = 0
+                if started >= self._window_start:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._window_start = now
+                    logger.info(f"GLM concurrency limit decreased to {int(self.limit)}")
+            elif latency is not None:
+                self._healthy_streak += 1
+                if self._healthy_streak >= int(self.limit):
+                    self.limit = min(self.max_limit, self.limit + 1)
+                    self._healthy_streak = 0
+            self._condition.notify_all()
+
+
+class RateGovernor:
+    """
+    Combined request, token and concurrency gate for GLM calls
+
+    Usage:
+        with governor.slot(prompt_tokens) as slot:
+            response = call_api()
+            slot.complete(completion_tokens=..., latency=...)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        tokens_per_minute: int = 200000,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        latency_target: float = 20.0,
+        acquire_timeout: float = 120.0,
+        db_url: Optional[str] = None
+    ):
+        if db_url:
+            self.request_bucket = PostgresTokenBucket("requests", requests_per_minute, requests_per_minute / 60.0, db_url)
+            self.token_bucket = PostgresTokenBucket("tokens", tokens_per_minute, tokens_per_minute / 60.0, db_url)
+        else:
+            self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+            self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+            latency_target=latency_target
+        )
+        self.acquire_timeout = acquire_timeout
+
+    def _wait_for(self, bucket, amount: float, deadline: float):
+        while True:
+            wait = bucket.try_acquire(amount)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"Rate limit wait of {wait:.1f}s exceeds acquire timeout")
+            time.sleep(min(wait, 1.0))
+
+    @contextmanager
+    def slot(self, prompt_tokens: int = 0):
+        """Block until the request fits every limit, then hold a concurrency slot"""
+        deadline = time.monotonic() + self.acquire_timeout
+        self._wait_for(self.request_bucket, 1, deadline)
+        self._wait_for(self.token_bucket, prompt_tokens, deadline)
+
+        if not self.concurrency.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise RateLimitTimeout("No GLM concurrency slot freed up within acquire timeout")
+
+        started = time.monotonic()
+        slot = _Slot(self)
+        try:
+            yield slot
+        finally:
+            self.concurrency.release(latency=slot.latency, throttled=slot.throttled, started=started)
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """React to a provider 429: pause the request bucket for Retry-After"""
+        if retry_after:
+            self.request_bucket.pause(retry_after)
+
+
+class _Slot:
+    """Outcome of one governed request"""
+
+    def __init__(self, governor: RateGovernor):
+        self._governor = governor
+        self.latency: Optional[float] = None
+        self.throttled = False
+
+    def complete(self, completion_tokens: int = 0, latency: Optional[float] = None):
+        self.latency = latency
+        if completion_tokens:
+            self._governor.token_bucket.debit(completion_tokens)
+
+    def throttle(self, retry_after: Optional[float] = None):
+        self.throttled = True
+        self._governor.throttled(retry_after)
+
+
+_governor: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> RateGovernor:
+    """Get the process-wide governor built from RATE_LIMIT_CONFIG"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateGovernor(
+                requests_per_minute=RATE_LIMIT_CONFIG.get("requests_per_minute", 60),
+                tokens_per_minute=RATE_LIMIT_CONFIG.get("tokens_per_minute", 200000),
+                initial_concurrency=RATE_LIMIT_CONFIG.get("initial_concurrency", 4),
+                min_concurrency=RATE_LIMIT_CONFIG.get("min_concurrency", 1),
+                max_concurrency=RATE_LIMIT_CONFIG.get("max_concurrency", 16),
+                latency_target=RATE_LIMIT_CONFIG.get("latency_target", 20.0),
+                acquire_timeout=RATE_LIMIT_CONFIG.get("acquire_timeout", 120.0),
+                db_url=RATE_LIMIT_CONFIG.get("shared_db_url")
+            )
+        return _governor
+
+
+def set_rate_governor(governor: Optional[RateGovernor]):
+    """Replace the process-wide governor (None rebuilds it from config on next use)"""
+    global _governor
+    with _governor_lock:
+        _governor = governor
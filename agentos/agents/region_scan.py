@@ -0,0 +1,274 @@
+"""
+Concurrent multi-region trend fetching
+
+TrendMonitor scans several markets (VN, TH, ID, PH) in one pass. Every
+region is fetched concurrently, so a scan takes about as long as its
+slowest region rather than the sum of all of them. Each region has its own
+limits, shared by every scan in the process:
+
+    requests_per_minute  token bucket, one token per page (upstream quotas
+                         are per market)
+    max_concurrency      in-flight page fetches for the region
+
+Regions are streamed: fetchers are async page iterators, and pages are
+handed to the caller as they arrive, interleaved across regions, so the
+caller scores one page while the next ones are in flight. A region whose
+page fails or exceeds fetch_timeout is logged and ends there (its earlier
+pages stand); the scan goes on with the others, and only fails if every
+region failed before its first page.
+
+The core is async (iter_region_pages_async); stream_region_pages() is the
+sync facade TrendMonitor uses from its worker thread. It runs the fetches
+on a private event loop in a helper thread and buffers at most
+prefetch_pages pages ahead of the caller. Limits are enforced with
+thread-safe primitives, so they hold across scans running on different
+event loops.
+"""
+
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+import time
+
+from .rate_limiter import RateLimitTimeout, TokenBucket
+from .tracing import span
+
+try:
+    from ..config.trends import TREND_SCAN_CONFIG
+except ImportError:
+    try:
+        from config.trends import TREND_SCAN_CONFIG
+    except ImportError:
+        TREND_SCAN_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+# (region) -> pages of trends
+RegionPageFetcher = Callable[[str], AsyncIterator[List[Dict]]]
+
+_DONE = object()
+
+
+@dataclass
+class RegionLimits:
+    """Request budget and concurrency cap of one region"""
+
+    region: str
+    requests_per_minute: float = 30
+    max_concurrency: int = 2
+    bucket: TokenBucket = field(init=False)
+    slots: threading.BoundedSemaphore = field(init=False)
+
+    def __post_init__(self):
+        self.bucket = TokenBucket(
+            capacity=max(1.0, self.requests_per_minute / 6),  # 10 s burst
+            refill_per_second=self.requests_per_minute / 60
+        )
+        self.slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    async def wait_for_budget(self, deadline: float):
+        while True:
+            wait = self.bucket.try_acquire(1)
+            if wait == 0.0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"No request budget for region {self.region} before the timeout")
+            await asyncio.sleep(wait)
+
+    async def wait_for_slot(self, deadline: float):
+        # Polled rather than blocking: the cap holds across event loops
+        # without parking a thread per waiting fetch
+        while not self.slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                raise RateLimitTimeout(f"No fetch slot for region {self.region} before the timeout")
+            await asyncio.sleep(0.01)
+
+
+_limits: Dict[str, RegionLimits] = {}
+_limits_lock = threading.Lock()
+
+
+def get_region_limits(region: str) -> RegionLimits:
+    """The process-wide limits of a region (built from TREND_SCAN_CONFIG on first use)"""
+    region = region.upper()
+    with _limits_lock:
+        limits = _limits.get(region)
+        if limits is None:
+            settings = TREND_SCAN_CONFIG.get("region_limits", {}).get(
+                region, TREND_SCAN_CONFIG.get("default_region_limit", {})
+            )
+            limits = _limits[region] = RegionLimits(region=region, **settings)
+        return limits
+
+
+def set_region_limits(limits: Optional[RegionLimits], region: Optional[str] = None):
+    """Replace one region's limits (limits=None drops them; region=None drops all)"""
+    with _limits_lock:
+        if region is None:
+            _limits.clear()
+        elif limits is None:
+            _limits.pop(region.upper(), None)
+        else:
+            _limits[region.upper()] = limits
+
+
+async def _region_pages(fetch_pages: RegionPageFetcher, region: str, timeout: float) -> AsyncIterator[List[Dict]]:
+    limits = get_region_limits(region)
+    pages = fetch_pages(region)
+    page_number = 0
+    try:
+        while True:
+            deadline = time.monotonic() + timeout
+            await limits.wait_for_budget(deadline)
+            await limits.wait_for_slot(deadline)
+            try:
+                with span("trend_monitor.fetch", region=region, page=page_number) as fetch_span:
+                    page = await asyncio.wait_for(pages.__anext__(), timeout=max(0.0, deadline - time.monotonic()))
+                    fetch_span.set_attribute("trend.count", len(page))
+            except StopAsyncIteration:
+                return
+            finally:
+                limits.slots.release()
+            page_number += 1
+            yield page
+    finally:
+        await pages.aclose()
+
+
+async def iter_region_pages_async(
+    fetch_pages: RegionPageFetcher,
+    regions: List[str],
+    timeout: Optional[float] = None,
+    prefetch_pages: Optional[int] = None
+) -> AsyncIterator[Tuple[str, List[Dict]]]:
+    """
+    Fetch every region concurrently, yielding pages as they arrive
+
+    Args:
+        fetch_pages: Called with the region code; returns an async iterator of pages
+        regions: Region codes
+        timeout: Seconds per page (default TREND_SCAN_CONFIG fetch_timeout)
+        prefetch_pages: Pages fetched or in flight ahead of the caller, across
+            all regions (default TREND_SCAN_CONFIG prefetch_pages)
+
+    Yields:
+        (region, page) in arrival order
+
+    Raises:
+        The first region's error if every region failed before its first page
+    """
+    timeout = TREND_SCAN_CONFIG.get("fetch_timeout", 30.0) if timeout is None else timeout
+    prefetch_pages = TREND_SCAN_CONFIG.get("prefetch_pages", 4) if prefetch_pages is None else prefetch_pages
+    regions = list(dict.fromkeys(region.upper() for region in regions))
+    # One credit per page fetched but not yet taken by the caller; arrived
+    # needs no bound of its own
+    credits = asyncio.Semaphore(max(1, prefetch_pages))
+    arrived: asyncio.Queue = asyncio.Queue()
+    delivered = set()
+    errors = []
+
+    async def pump(region: str):
+        pages = _region_pages(fetch_pages, region, timeout)
+        try:
+            while True:
+                await credits.acquire()
+                try:
+                    page = await pages.__anext__()
+                except BaseException:
+                    credits.release()
+                    raise
+                delivered.add(region)
+                arrived.put_nowait((region, page))
+        except StopAsyncIteration:
+            delivered.add(region)
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError) and not isinstance(e, RateLimitTimeout):
+                e = RateLimitTimeout(f"Fetching region {region} timed out after {timeout}s")
+            logger.warning(f"Trend fetch failed for region {region}: {e}")
+            errors.append(e)
+        finally:
+            await pages.aclose()
+        arrived.put_nowait((region, _DONE))
+
+    tasks = [asyncio.create_task(pump(region)) for region in regions]
+    try:
+        pending = len(tasks)
+        while pending:
+            region, page = await arrived.get()
+            if page is _DONE:
+                pending -= 1
+            else:
+                yield region, page
+                # The caller is back for the next page: this one is taken
+                credits.release()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if errors and not delivered:
+        raise errors[0]
+
+
+def stream_region_pages(
+    fetch_pages: RegionPageFetcher,
+    regions: List[str],
+    timeout: Optional[float] = None
+) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Sync facade for iter_region_pages_async (usable with or without a running loop)
+
+    Pages are fetched on a private loop in a helper thread, keeping cost
+    labels and the current span, while the caller processes earlier ones:
+    at most prefetch_pages ahead (one of them waiting in the handoff queue,
+    the rest fetched or in flight). Closing the iterator early stops the
+    fetches.
+    """
+    prefetch_pages = max(1, TREND_SCAN_CONFIG.get("prefetch_pages", 4) - 1)
+    handoff: queue.Queue = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def produce():
+        pages = iter_region_pages_async(fetch_pages, regions, timeout, prefetch_pages)
+        try:
+            async for item in pages:
+                # Blocks a default-executor thread, not the loop: the other
+                # regions keep fetching on their credits meanwhile
+                if not await asyncio.to_thread(put, item):
+                    return
+        finally:
+            await pages.aclose()
+
+    def run():
+        outcome = _DONE
+        try:
+            asyncio.run(produce())
+        except BaseException as e:
+            outcome = e
+        put(outcome)
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name="region-scan", daemon=True).start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,278 @@
+"""
+Scan checkpoints: only new or materially changed trends are processed
+
+A trend's fingerprint is a short hash of its material fields, bucketed so
+noise does not count as change:
+
+    views            log bucket (views_factor: 2.0 = a doubling is a change)
+    engagement_rate  engagement_step percentage-point buckets
+    growth_rate      growth_step buckets (measured growth if known)
+    category, keywords (accent/case-insensitive)
+    emerging / accelerating flags
+
+Only the trend's own fields count: callers scanning for different product
+categories (n8n for beauty+fashion, the UI for beauty) see the same
+fingerprint, so alternating between them does not re-brief anything.
+
+Two checkpoints per hashtag and region:
+
+    scanned  TrendMonitor reuses the stored analysis of an unchanged trend
+             instead of rescoring it, and skips its vector upsert. Analyses
+             depend on the product categories, so the last few category
+             sets each keep their own; an unchanged trend scanned for a new
+             set is rescored without counting as changed
+    briefed  the workflow only briefs trends whose fingerprint differs from
+             the one it last briefed (so a trend past max_briefs_per_day is
+             still briefed the next day)
+
+Checkpoints are kept in memory and, if a path is configured, saved as one
+JSON file (written to a temp file and renamed, so a crash never leaves a
+torn checkpoint).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+from .schemas import TrendAnalysis
+from .trend_history import trend_key
+from .vietnamese_text import match_key
+
+try:
+    from ..config.trends import SCAN_CHECKPOINT_CONFIG
+except ImportError:
+    try:
+        from config.trends import SCAN_CHECKPOINT_CONFIG
+    except ImportError:
+        SCAN_CHECKPOINT_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+# Category sets whose analyses are kept per hashtag
+MAX_CATEGORY_SETS = 4
+
+
+def category_key(product_categories: Iterable[str]) -> str:
+    """Order/accent/case-insensitive key of a product category set"""
+    return ",".join(sorted({match_key(category) for category in product_categories}))
+
+
+@dataclass
+class _Checkpoint:
+    fingerprint: str
+    # category_key -> analysis of the fingerprinted trend, oldest first
+    analyses: Dict[str, TrendAnalysis] = field(default_factory=dict)
+    scanned_at: float = 0.0
+    briefed: Optional[str] = None
+    briefed_at: Optional[float] = None
+
+
+class ScanCheckpoint:
+    """
+    Per-hashtag fingerprints of the last scan and the last brief
+
+    Args:
+        path: JSON file to persist to (None: memory only)
+        views_factor: Views ratio that counts as a change
+        engagement_step: Engagement-rate bucket width (percentage points)
+        growth_step: Growth-rate bucket width (percentage points)
+        max_age: Seconds after which an unseen hashtag's checkpoint is dropped
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        views_factor: float = 2.0,
+        engagement_step: float = 2.0,
+        growth_step: float = 100.0,
+        max_age: float = 7 * 24 * 3600.0
+    ):
+        self.path = path
+        self.views_factor = views_factor
+        self.engagement_step = engagement_step
+        self.growth_step = growth_step
+        self.max_age = max_age
+        self._checkpoints: Dict[str, _Checkpoint] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for key, data in json.load(f).items():
+                        self._checkpoints[key] = _Checkpoint(
+                            fingerprint=data["fingerprint"],
+                            analyses={
+                                categories: TrendAnalysis.from_dict(analysis)
+                                for categories, analysis in data.get("analyses", {}).items()
+                            },
+                            scanned_at=data.get("scanned_at", 0.0),
+                            briefed=data.get("briefed"),
+                            briefed_at=data.get("briefed_at")
+                        )
+            except (OSError, ValueError, KeyError) as e:
+                # Losing checkpoints only costs one full scan
+                logger.warning(f"Ignoring unreadable scan checkpoint {path}: {e}")
+                self._checkpoints = {}
+
+    def fingerprint(
+        self,
+        trend,
+        growth_rate: Optional[float] = None,
+        accelerating: bool = False
+    ) -> str:
+        """Hash of the trend's bucketed material fields"""
+        views = trend.get("views", 0)
+        growth_rate = trend.get("growth_rate", 0) if growth_rate is None else growth_rate
+        material = (
+            math.floor(math.log(views, self.views_factor)) if views > 0 else None,
+            math.floor(trend.get("engagement_rate", 0) / self.engagement_step),
+            math.floor(growth_rate / self.growth_step),
+            match_key(trend.get("category", "")),
+            sorted({match_key(keyword) for keyword in trend.get("keywords", [])}),
+            trend.get("emerging") is not None,
+            accelerating
+        )
+        return hashlib.blake2b(repr(material).encode("utf-8"), digest_size=8).hexdigest()
+
+    def classify(self, trend, fingerprint: str) -> str:
+        """NEW, CHANGED or UNCHANGED against the last scan of the trend"""
+        with self._lock:
+            checkpoint = self._checkpoints.get(trend_key(trend["hashtag"], trend.get("region")))
+        if checkpoint is None:
+            return NEW
+        return UNCHANGED if checkpoint.fingerprint == fingerprint else CHANGED
+
+    def analysis(self, trend, product_categories: Iterable[str]) -> Optional[TrendAnalysis]:
+        """Analysis stored for these categories (None if not scored for them since it changed)"""
+        with self._lock:
+            checkpoint = self._checkpoints.get(trend_key(trend["hashtag"], trend.get("region")))
+            if checkpoint is None:
+                return None
+            return checkpoint.analyses.get(category_key(product_categories))
+
+    def mark_scanned(self, trends: Iterable, product_categories: Iterable[str], scanned_at: Optional[float] = None):
+        """Record each trend's fingerprint and analysis (per page of a scan; commit() at the end)"""
+        scanned_at = time.time() if scanned_at is None else scanned_at
+        categories = category_key(product_categories)
+        with self._lock:
+            for trend in trends:
+                key = trend_key(trend["hashtag"], trend.get("region"))
+                checkpoint = self._checkpoints.get(key)
+                if checkpoint is None:
+                    checkpoint = self._checkpoints[key] = _Checkpoint(fingerprint=trend["fingerprint"])
+                elif checkpoint.fingerprint != trend["fingerprint"]:
+                    # Analyses for other category sets describe the old trend
+                    checkpoint.fingerprint = trend["fingerprint"]
+                    checkpoint.analyses.clear()
+                checkpoint.scanned_at = scanned_at
+                analysis = trend.get("analysis")
+                if analysis is not None:
+                    checkpoint.analyses.pop(categories, None)
+                    checkpoint.analyses[categories] = analysis
+                    if len(checkpoint.analyses) > MAX_CATEGORY_SETS:
+                        del checkpoint.analyses[next(iter(checkpoint.analyses))]
+
+    def commit(self, scanned_at: Optional[float] = None):
+        """End of a scan: drop checkpoints not seen for max_age, then save"""
+        cutoff = (time.time() if scanned_at is None else scanned_at) - self.max_age
+        with self._lock:
+            for key in [key for key, checkpoint in self._checkpoints.items() if checkpoint.scanned_at < cutoff]:
+                del self._checkpoints[key]
+        self.save()
+
+    def needs_brief(self, trend) -> bool:
+        """True unless the trend was already briefed with its current fingerprint"""
+        fingerprint = trend.get("fingerprint")
+        if fingerprint is None:
+            return True
+        with self._lock:
+            checkpoint = self._checkpoints.get(trend_key(trend["hashtag"], trend.get("region")))
+        return checkpoint is None or checkpoint.briefed != fingerprint
+
+    def mark_briefed(self, trend, briefed_at: Optional[float] = None):
+        """Record that the trend was briefed with its current fingerprint, then save"""
+        fingerprint = trend.get("fingerprint")
+        if fingerprint is None:
+            return
+        with self._lock:
+            checkpoint = self._checkpoints.setdefault(
+                trend_key(trend["hashtag"], trend.get("region")),
+                _Checkpoint(fingerprint=fingerprint, scanned_at=time.time())
+            )
+            checkpoint.briefed = fingerprint
+            checkpoint.briefed_at = time.time() if briefed_at is None else briefed_at
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                key: {
+                    "fingerprint": checkpoint.fingerprint,
+                    "analyses": {
+                        categories: analysis.to_dict() for categories, analysis in checkpoint.analyses.items()
+                    },
+                    "scanned_at": checkpoint.scanned_at,
+                    "briefed": checkpoint.briefed,
+                    "briefed_at": checkpoint.briefed_at
+                }
+                for key, checkpoint in self._checkpoints.items()
+            }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Checkpoints are an optimization; a scan must not fail on them
+            logger.warning(f"Could not save scan checkpoint: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hashtags": len(self._checkpoints),
+                "briefed": sum(1 for checkpoint in self._checkpoints.values() if checkpoint.briefed),
+                "backend": "file" if self.path else "memory"
+            }
+
+
+def create_scan_checkpoint(config: Optional[Dict] = None) -> ScanCheckpoint:
+    config = SCAN_CHECKPOINT_CONFIG if config is None else config
+    return ScanCheckpoint(**{
+        key: config[key]
+        for key in ("path", "views_factor", "engagement_step", "growth_step", "max_age")
+        if key in config
+    })
+
+
+_checkpoint: Optional[ScanCheckpoint] = None
+_checkpoint_lock = threading.Lock()
+
+
+def get_scan_checkpoint() -> ScanCheckpoint:
+    """The process-wide checkpoints shared by TrendMonitor and the workflow"""
+    global _checkpoint
+    with _checkpoint_lock:
+        if _checkpoint is None:
+            _checkpoint = create_scan_checkpoint()
+        return _checkpoint
+
+
+def set_scan_checkpoint(checkpoint: Optional[ScanCheckpoint]):
+    """Replace the process-wide checkpoints (None reloads them from config on next use)"""
+    global _checkpoint
+    with _checkpoint_lock:
+        _checkpoint = checkpoint
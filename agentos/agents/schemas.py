@@ -0,0 +1,226 @@
+"""
+Typed records for trends, content briefs and generated copy
+
+Dataclasses instead of nested dicts: instances of a record type share one
+attribute key table (PEP 412), so a brief held in the approval queues costs
+a fraction of the equivalent dict tree, and the same object is passed from
+TrendMonitor through ContentStrategist and TextCreator to the API without
+being copied.
+
+Records keep dict-style access (brief["hashtags"], brief.get("media_url"),
+brief["status"] = ...) so existing callers and plain-dict inputs (tests,
+API payloads) work unchanged. Unset optional fields read as None (missing
+through get()/`in`) but are not stored on the instance: the instance
+__dict__ holds exactly the fields that are set, so encoders serialize it
+directly, as fast as a plain dict and without "field": null noise.
+
+Serialization:
+    record.to_dict()          Plain dicts/lists of the set fields
+    Brief.from_dict(data)     Build from a plain dict (unknown keys ignored)
+    json_default              `default=` hook for json.dumps
+    orjson                    Serializes records natively (agents/fast_json.py)
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+
+def to_plain(value: Any) -> Any:
+    """Records (also inside lists/dicts) as plain dicts; anything else as is"""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    return value
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps(default=...) hook: records as their set fields, other objects as str()"""
+    if isinstance(obj, _Record):
+        # Nested records come back through this hook
+        return obj.__dict__
+    return str(obj)
+
+
+class _Record:
+    """Dict-style access shared by the records below"""
+
+    # Set by @_record
+    _field_names: ClassVar[Tuple[str, ...]] = ()
+    # Fields defaulting to None: None is not stored, the class default is read
+    _none_defaults: ClassVar[frozenset] = frozenset()
+    # Fields holding a nested record, converted by from_dict()
+    _nested: ClassVar[Dict[str, type]] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._field_names:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._field_names:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if value is None and name in self._none_defaults:
+            self.__dict__.pop(name, None)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._field_names and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in self._field_names else None
+        return default if value is None else value
+
+    def keys(self):
+        return self._field_names
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: to_plain(value) for name, value in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        if isinstance(data, cls):
+            return data
+        values = {key: value for key, value in data.items() if key in cls._field_names}
+        for name, record_type in cls._nested.items():
+            if isinstance(values.get(name), dict):
+                values[name] = record_type.from_dict(values[name])
+        return cls(**values)
+
+
+def _record(cls):
+    """Dataclass with the field tables _Record looks keys up in"""
+    cls = dataclass(cls)
+    cls._field_names = tuple(f.name for f in fields(cls))
+    cls._none_defaults = frozenset(f.name for f in fields(cls) if f.default is None)
+    return cls
+
+
+@_record
+class TrendAnalysis(_Record):
+    trend_id: str
+    relevance_score: float = 0.0
+    reasons: List[str] = field(default_factory=list)
+    recommended_action: str = "monitor"
+
+
+@_record
+class TrendMomentum(_Record):
+    growth_rate: float = 0.0
+    acceleration: Optional[float] = None
+    engagement_change: float = 0.0
+    samples: int = 0
+    span_hours: float = 0.0
+
+
+@_record
+class EmergingSignal(_Record):
+    hashtag: str
+    z_score: float = 0.0
+    velocity: float = 0.0
+    baseline_velocity: float = 0.0
+    engagement_z: float = 0.0
+    samples: int = 0
+    emerging_since: Optional[float] = None
+    observed_at: Optional[float] = None
+
+
+@_record
+class Trend(_Record):
+    _nested: ClassVar[Dict[str, type]] = {
+        "analysis": TrendAnalysis,
+        "momentum": TrendMomentum,
+        "emerging": EmergingSignal
+    }
+
+    hashtag: str
+    views: int = 0
+    posts: int = 0
+    engagement_rate: float = 0.0
+    growth_rate: float = 0.0
+    category: str = ""
+    keywords: List[str] = field(default_factory=list)
+    trending_since: Optional[str] = None
+    # Market the trend was fetched for
+    region: str = "VN"
+    # Trend sources that reported it (trend_sources/)
+    sources: List[str] = field(default_factory=list)
+    # Measured across scans (agents/trend_history.py)
+    momentum: Optional[TrendMomentum] = None
+    # Set while the trend's view velocity is anomalous (agents/trend_detector.py)
+    emerging: Optional[EmergingSignal] = None
+    # Scan checkpoint (agents/scan_checkpoint.py): "new", "changed" or "unchanged"
+    fingerprint: Optional[str] = None
+    change: Optional[str] = None
+    analysis: Optional[TrendAnalysis] = None
+
+
+@_record
+class ScriptOutline(_Record):
+    opening: str = ""
+    main_content: str = ""
+    cta: str = ""
+
+
+@_record
+class SuccessMetrics(_Record):
+    target_views: int = 0
+    target_engagement_rate: float = 0.0
+    target_conversions: int = 0
+    expected_revenue_vnd: int = 0
+
+
+@_record
+class Brief(_Record):
+    _nested: ClassVar[Dict[str, type]] = {
+        "script_outline": ScriptOutline,
+        "success_metrics": SuccessMetrics
+    }
+
+    trend_id: str
+    products: List[str] = field(default_factory=list)
+    content_format: str = "tiktok_video"
+    created_at: Optional[str] = None
+    vietnamese_hook: str = ""
+    content_angle: str = ""
+    script_outline: ScriptOutline = field(default_factory=ScriptOutline)
+    visual_suggestions: List[str] = field(default_factory=list)
+    vietnamese_voiceover: str = ""
+    hashtags: List[str] = field(default_factory=list)
+    optimal_posting_time: str = ""
+    success_metrics: SuccessMetrics = field(default_factory=SuccessMetrics)
+    cultural_notes: List[str] = field(default_factory=list)
+    # Set when the brief came from a live LLM call
+    llm_output: Optional[str] = None
+    model_id: Optional[str] = None
+    # Approval workflow (main.py)
+    status: Optional[str] = None
+    approved_at: Optional[str] = None
+    feedback: Optional[str] = None
+    media_url: Optional[str] = None
+
+
+@_record
+class CopyText(_Record):
+    body: str
+    hashtags: List[str] = field(default_factory=list)
+    call_to_action: str = ""
+
+
+@_record
+class CopyResult(_Record):
+    _nested: ClassVar[Dict[str, type]] = {"copy": CopyText}
+
+    platform: str
+    variant: str
+    tone: str
+    copy: CopyText
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Set for A/B variants
+    variant_id: Optional[str] = None
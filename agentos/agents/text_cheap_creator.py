@@ -17,7 +17,9 @@ from agno.os import AgentOS
 import logging
 from datetime import datetime
 import os
+from .copy_validation import CopyValidator, grapheme_length, segment
 from .glm_model import create_vietnamese_glm
+from .schemas import CopyResult, CopyText
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +41,9 @@ class TextCheapCreator(Agent):
         "youtube_description": 5000
     }
 
+    # Precompiled checks shared by every copy this class generates
+    validator = CopyValidator(PLATFORM_LIMITS)
+
     def __init__(
         self,
         db_url: str,
@@ -82,8 +87,8 @@ class TextCheapCreator(Agent):
         )
 
     def count_characters(self, text: str) -> int:
-        """Count characters in text (excluding spaces for some platforms)"""
-        return len(text)
+        """Count characters as the platforms do (grapheme clusters, so an emoji is 1)"""
+        return grapheme_length(text)
 
     def validate_hashtags(self, hashtags: List[str]) -> Dict:
         """
@@ -95,25 +100,7 @@ class TextCheapCreator(Agent):
         Returns:
             Validation results
         """
-        issues = []
-
-        if len(hashtags) > 30:
-            issues.append("Too many hashtags (max 30 recommended)")
-
-        if len(hashtags) < 3:
-            issues.append("Too few hashtags (min 3 recommended)")
-
-        for tag in hashtags:
-            if not tag.startswith("#"):
-                issues.append(f"Hashtag missing #: {tag}")
-            if " " in tag:
-                issues.append(f"Hashtag contains space: {tag}")
-
-        return {
-            "valid": len(issues) == 0,
-            "count": len(hashtags),
-            "issues": issues
-        }
+        return self.validator.check_hashtags(hashtags)
 
     def optimize_emojis(self, text: str, max_emojis: int = 5) -> Dict:
         """
@@ -126,17 +113,7 @@ class TextCheapCreator(Agent):
         Returns:
             Emoji analysis
         """
-        # Simple emoji detection (in production use emoji library)
-        emoji_chars = ['😍', '💄', '✨', '🔥', '💖', '👗', '🎉', '💯', '😊', '🌟',
-                       '💕', '❤️', '🥰', '😘', '🤩', '💋', '👄', '🎀', '💅', '🌸']
-
-        emoji_count = sum(text.count(emoji) for emoji in emoji_chars)
-
-        return {
-            "emoji_count": emoji_count,
-            "optimal": 2 <= emoji_count <= max_emojis,
-            "recommendation": "Add more emojis" if emoji_count < 2 else "Good emoji usage" if emoji_count <= max_emojis else "Too many emojis"
-        }
+        return self.validator.check_emojis(segment(text)["emojis"], max_emojis)
 
     def generate_platform_copy(
         self,
@@ -144,7 +121,7 @@ class TextCheapCreator(Agent):
         platform: str,
         variant: str = "default",
         tone: str = "casual"
-    ) -> Dict:
+    ) -> CopyResult:
         """
         Generate platform-specific Vietnamese copy
 
@@ -160,7 +137,7 @@ class TextCheapCreator(Agent):
         logger.info(f"Generating {platform} copy: variant={variant}, tone={tone}")
 
         # Get platform constraints
-        char_limit = self.PLATFORM_LIMITS.get(f"{platform}_optimal", 500)
+        char_limit = self.validator.optimal_length(platform)
 
         # Build prompt for GLM
         prompt = self._build_copy_prompt(brief, platform, variant, tone, char_limit)
@@ -170,27 +147,40 @@ class TextCheapCreator(Agent):
         # generated_copy = response.content
 
         # Mock response for demonstration
-        generated_copy = self._generate_mock_copy(brief, platform, variant, tone)
-
-        # Validate copy
-        char_count = self.count_characters(generated_copy["body"])
-        hashtag_validation = self.validate_hashtags(generated_copy["hashtags"])
-        emoji_analysis = self.optimize_emojis(generated_copy["body"])
-
-        return {
-            "platform": platform,
-            "variant": variant,
-            "tone": tone,
-            "copy": generated_copy,
-            "metadata": {
-                "character_count": char_count,
-                "character_limit": char_limit,
-                "within_limit": char_count <= char_limit,
-                "hashtag_validation": hashtag_validation,
-                "emoji_analysis": emoji_analysis,
-                "generated_at": datetime.now().isoformat()
-            }
-        }
+        generated_copy = CopyText.from_dict(self._generate_mock_copy(brief, platform, variant, tone))
+
+        # Validate copy: lengths, emoji and hashtags in one pass
+        metadata = self.validator.validate(
+            platform,
+            generated_copy.body,
+            generated_copy.hashtags,
+            generated_copy.call_to_action
+        )
+
+        # Local repairs only (hashtags, trimming); no LLM round trip
+        repairs = self.validator.repair(
+            platform,
+            generated_copy,
+            metadata,
+            fallback_hashtags=brief.get("hashtags", [])
+        )
+        if repairs:
+            metadata = self.validator.validate(
+                platform,
+                generated_copy.body,
+                generated_copy.hashtags,
+                generated_copy.call_to_action
+            )
+        metadata["repairs"] = repairs
+        metadata["generated_at"] = datetime.now().isoformat()
+
+        return CopyResult(
+            platform=platform,
+            variant=variant,
+            tone=tone,
+            copy=generated_copy,
+            metadata=metadata
+        )
 
     def _build_copy_prompt(
         self,
@@ -307,7 +297,7 @@ Generate the copy now:
         brief: Dict,
         platform: str,
         num_variants: int = 3
-    ) -> List[Dict]:
+    ) -> List[CopyResult]:
         """
         Generate multiple A/B testing variants
 
@@ -336,7 +326,7 @@ Generate the copy now:
                 tone=tone
             )
 
-            copy["variant_id"] = f"{platform}_v{i+1}_{variant_type}"
+            copy.variant_id = f"{platform}_v{i+1}_{variant_type}"
             variants.append(copy)
 
         logger.info(f"Generated {len(variants)} variants")
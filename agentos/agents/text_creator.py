@@ -14,12 +14,21 @@ from agno.storage.postgres import PostgresStorage
 from typing import List, Dict, Optional
 import logging
 from datetime import datetime
+import json
 import os
+from .copy_validation import CopyValidator, grapheme_length, segment
+from .cost_accounting import cost_scope
 from .glm_model import create_vietnamese_glm
+from .schemas import CopyResult, CopyText
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
 
+class CopyGenerationError(RuntimeError):
+    """The live model returned no usable copy"""
+
+
 class TextCreator(Agent):
     """
     Agent that generates final Vietnamese social media copy from content briefs
@@ -37,6 +46,9 @@ class TextCreator(Agent):
         "youtube_description": 5000
     }
 
+    # Precompiled checks shared by every copy this class generates
+    validator = CopyValidator(PLATFORM_LIMITS)
+
     def __init__(
         self,
         db_url: str,
@@ -79,9 +91,11 @@ class TextCreator(Agent):
             markdown=True
         )
 
+        self.glm = glm_model
+
     def count_characters(self, text: str) -> int:
-        """Count characters in text (excluding spaces for some platforms)"""
-        return len(text)
+        """Count characters as the platforms do (grapheme clusters, so an emoji is 1)"""
+        return grapheme_length(text)
 
     def validate_hashtags(self, hashtags: List[str]) -> Dict:
         """
@@ -93,25 +107,7 @@ class TextCreator(Agent):
         Returns:
             Validation results
         """
-        issues = []
-
-        if len(hashtags) > 30:
-            issues.append("Too many hashtags (max 30 recommended)")
-
-        if len(hashtags) < 3:
-            issues.append("Too few hashtags (min 3 recommended)")
-
-        for tag in hashtags:
-            if not tag.startswith("#"):
-                issues.append(f"Hashtag missing #: {tag}")
-            if " " in tag:
-                issues.append(f"Hashtag contains space: {tag}")
-
-        return {
-            "valid": len(issues) == 0,
-            "count": len(hashtags),
-            "issues": issues
-        }
+        return self.validator.check_hashtags(hashtags)
 
     def optimize_emojis(self, text: str, max_emojis: int = 5) -> Dict:
         """
@@ -124,17 +120,7 @@ class TextCreator(Agent):
         Returns:
             Emoji analysis
         """
-        # Simple emoji detection (in production use emoji library)
-        emoji_chars = ['😍', '💄', '✨', '🔥', '💖', '👗', '🎉', '💯', '😊', '🌟',
-                       '💕', '❤️', '🥰', '😘', '🤩', '💋', '👄', '🎀', '💅', '🌸']
-
-        emoji_count = sum(text.count(emoji) for emoji in emoji_chars)
-
-        return {
-            "emoji_count": emoji_count,
-            "optimal": 2 <= emoji_count <= max_emojis,
-            "recommendation": "Add more emojis" if emoji_count < 2 else "Good emoji usage" if emoji_count <= max_emojis else "Too many emojis"
-        }
+        return self.validator.check_emojis(segment(text)["emojis"], max_emojis)
 
     def generate_platform_copy(
         self,
@@ -142,7 +128,7 @@ class TextCreator(Agent):
         platform: str,
         variant: str = "default",
         tone: str = "casual"
-    ) -> Dict:
+    ) -> CopyResult:
         """
         Generate platform-specific Vietnamese copy
 
@@ -154,41 +140,70 @@ class TextCreator(Agent):
 
         Returns:
             Generated copy with metadata
+
+        Raises:
+            CopyGenerationError: In live mode, if the model response holds no
+                valid copy (mock copy is only for offline runs)
         """
         logger.info(f"Generating {platform} copy: variant={variant}, tone={tone}")
 
         # Get platform constraints
-        char_limit = self.PLATFORM_LIMITS.get(f"{platform}_optimal", 500)
+        char_limit = self.validator.optimal_length(platform)
 
         # Build prompt for Claude
         prompt = self._build_copy_prompt(brief, platform, variant, tone, char_limit)
 
-        # In production: Call Claude API
-        # response = self.model.generate(prompt)
-        # generated_copy = response.content
-
-        # Mock response for demonstration
-        generated_copy = self._generate_mock_copy(brief, platform, variant, tone)
-
-        # Validate copy
-        char_count = self.count_characters(generated_copy["body"])
-        hashtag_validation = self.validate_hashtags(generated_copy["hashtags"])
-        emoji_analysis = self.optimize_emojis(generated_copy["body"])
-
-        return {
-            "platform": platform,
-            "variant": variant,
-            "tone": tone,
-            "copy": generated_copy,
-            "metadata": {
-                "character_count": char_count,
-                "character_limit": char_limit,
-                "within_limit": char_count <= char_limit,
-                "hashtag_validation": hashtag_validation,
-                "emoji_analysis": emoji_analysis,
-                "generated_at": datetime.now().isoformat()
-            }
-        }
+        # Call GLM in live mode, otherwise use mock copy for demonstration
+        generated_copy = None
+        with span("text_creator.copy_llm_call", platform=platform, variant=variant, live=self.glm.live), \
+                cost_scope(agent="TextCreator", brief_id=brief.get("trend_id")):
+            if self.glm.live:
+                response = self.glm.complete(prompt)
+                generated_copy = self._parse_copy_response(response["content"])
+                if generated_copy is None:
+                    raise CopyGenerationError(f"Unparseable {platform} copy response from the model")
+        if generated_copy is None:
+            generated_copy = self._generate_mock_copy(brief, platform, variant, tone)
+
+        generated_copy = CopyText.from_dict(generated_copy)
+
+        # Validate copy: lengths, emoji and hashtags in one pass
+        metadata = self.validator.validate(
+            platform,
+            generated_copy.body,
+            generated_copy.hashtags,
+            generated_copy.call_to_action
+        )
+
+        # Repair instead of regenerating: hashtags and over-length bodies are
+        # fixed locally, the LLM only gets a short rewrite prompt when trimming
+        # to whole sentences would keep too little
+        with cost_scope(agent="TextCreator", brief_id=brief.get("trend_id")):
+            repairs = self.validator.repair(
+                platform,
+                generated_copy,
+                metadata,
+                fallback_hashtags=brief.get("hashtags", []),
+                shorten=self._shorten_with_llm if self.glm.live else None
+            )
+        if repairs:
+            logger.info(f"Repaired {platform} copy: {', '.join(repairs)}")
+            metadata = self.validator.validate(
+                platform,
+                generated_copy.body,
+                generated_copy.hashtags,
+                generated_copy.call_to_action
+            )
+        metadata["repairs"] = repairs
+        metadata["generated_at"] = datetime.now().isoformat()
+
+        return CopyResult(
+            platform=platform,
+            variant=variant,
+            tone=tone,
+            copy=generated_copy,
+            metadata=metadata
+        )
 
     def _build_copy_prompt(
         self,
@@ -234,6 +249,42 @@ Generate the copy now:
 """
         return prompt
 
+    def _shorten_with_llm(self, body: str, limit: int) -> Optional[str]:
+        """Targeted repair prompt: shorten just the body (None if the call fails)"""
+        prompt = (
+            f"Rút gọn đoạn nội dung mạng xã hội sau còn tối đa {limit} ký tự (emoji tính là 1 ký tự). "
+            "Giữ ý chính, giọng văn và emoji quan trọng. Chỉ trả về nội dung đã rút gọn, không giải thích.\n\n"
+            f"{body}"
+        )
+        with span("text_creator.repair_llm_call", limit=limit):
+            try:
+                # Roughly one token per character is plenty for Vietnamese
+                response = self.glm.complete(prompt, max_tokens=max(64, limit))
+            except Exception as e:
+                logger.warning(f"Copy repair call failed, truncating instead: {e}")
+                return None
+        return response["content"].strip().strip('"').strip() or None
+
+    def _parse_copy_response(self, content: str) -> Optional[Dict]:
+        """Extract the JSON copy object from a model response (None if malformed)"""
+        start, end = content.find("{"), content.rfind("}")
+        if start == -1 or end <= start:
+            logger.warning("Copy response contained no JSON object")
+            return None
+
+        try:
+            parsed = json.loads(content[start:end + 1])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not parse copy response: {e}")
+            return None
+
+        if not isinstance(parsed.get("body"), str) or not isinstance(parsed.get("hashtags"), list):
+            logger.warning("Copy response is missing body/hashtags")
+            return None
+
+        parsed.setdefault("call_to_action", "")
+        return parsed
+
     def _generate_mock_copy(
         self,
         brief: Dict,
@@ -305,7 +356,7 @@ Generate the copy now:
         brief: Dict,
         platform: str,
         num_variants: int = 3
-    ) -> List[Dict]:
+    ) -> List[CopyResult]:
         """
         Generate multiple A/B testing variants
 
@@ -334,7 +385,7 @@ Generate the copy now:
                 tone=tone
             )
 
-            copy["variant_id"] = f"{platform}_v{i+1}_{variant_type}"
+            copy.variant_id = f"{platform}_v{i+1}_{variant_type}"
             variants.append(copy)
 
         logger.info(f"Generated {len(variants)} variants")
@@ -0,0 +1,135 @@
+"""
+Token Budget - Pre-flight token counting and context-budget enforcement
+
+GLM models do not ship a public tokenizer, so prompts are estimated with
+tiktoken's cl100k_base encoding (close for mixed Vietnamese/English text).
+Exact counts come back in the API usage block after each call; the estimate
+is only used to size prompts before sending and as a fallback when usage
+is missing.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Per-message framing overhead used by OpenAI-compatible chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+
+class TokenBudgetExceeded(ValueError):
+    """Raised when a prompt cannot be made to fit the model's budget"""
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once (None if tiktoken is unavailable)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # ImportError, or no cached BPE file offline
+        logger.warning(f"tiktoken unavailable, using heuristic token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in text
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Token count (tiktoken when available, ~3 chars/token otherwise)
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 3)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate prompt tokens for a list of chat messages"""
+    total = REPLY_PRIMING_TOKENS
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS + count_tokens(message.get("content") or "")
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 3]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+class TokenBudget:
+    """
+    Prompt budget for one model call
+
+    The prompt limit is the context window minus the tokens reserved for the
+    completion, optionally capped further by max_prompt_tokens to keep
+    latency and spend in check.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        context_window: int,
+        max_completion_tokens: int,
+        max_prompt_tokens: Optional[int] = None
+    ):
+        self.model_id = model_id
+        self.context_window = context_window
+        self.max_completion_tokens = max_completion_tokens
+        self.prompt_limit = context_window - max_completion_tokens
+        if max_prompt_tokens is not None:
+            self.prompt_limit = min(self.prompt_limit, max_prompt_tokens)
+
+    def count(self, text: str) -> int:
+        return count_tokens(text)
+
+    def fits(self, text: str, limit: Optional[int] = None) -> bool:
+        return count_tokens(text) <= (self.prompt_limit if limit is None else limit)
+
+    def remaining(self, text: str) -> int:
+        """Tokens left in the prompt budget after text"""
+        return self.prompt_limit - count_tokens(text)
+
+    def completion_allowance(self, prompt_tokens: int) -> int:
+        """Largest max_tokens that still fits the context window"""
+        return max(0, min(self.max_completion_tokens, self.context_window - prompt_tokens))
+
+    def fit(self, candidates: Iterable[str], limit: Optional[int] = None) -> str:
+        """
+        Pick the first candidate rendering that fits the budget
+
+        Candidates should be ordered from most to least detailed. If none
+        fits, the last (smallest) one is truncated to the limit.
+
+        Args:
+            candidates: Progressively smaller renderings of the same context
+            limit: Token limit (defaults to the full prompt limit)
+
+        Returns:
+            Context text within the limit
+        """
+        limit = self.prompt_limit if limit is None else limit
+        smallest = ""
+        for candidate in candidates:
+            if count_tokens(candidate) <= limit:
+                return candidate
+            smallest = candidate
+
+        logger.warning(f"No context rendering fits {limit} tokens, truncating")
+        return truncate_to_tokens(smallest, limit)
@@ -0,0 +1,235 @@
+"""
+Tracing - Span-level latency instrumentation for the trend-to-content pipeline
+
+Uses OpenTelemetry when it is installed and falls back to a small built-in
+tracer otherwise, so agents can always call span() unconditionally.
+
+Exporters (AGENTOS_TRACE_EXPORTER):
+- none: spans are created (trace ids still propagate) but not exported
+- file: one JSON object per finished span in AGENTOS_TRACE_FILE
+- otlp: OTLP/HTTP to a local collector (OTEL_EXPORTER_OTLP_ENDPOINT,
+  default http://localhost:4318), requires the OpenTelemetry packages
+
+Trace context arrives with the HTTP request (W3C traceparent header) and
+flows through contextvars, which asyncio.to_thread copies into worker
+threads, so agent spans nest under the request span.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Mapping, Optional
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.propagate import extract as otel_extract
+    # The API alone is not enough: configure_tracing and the file exporter
+    # need the SDK
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_span_listeners: List[Callable[[str, float, Dict[str, Any]], None]] = []
+_exporter = os.getenv("AGENTOS_TRACE_EXPORTER", "none").lower()
+_trace_file = os.getenv("AGENTOS_TRACE_FILE", "traces.jsonl")
+_file_lock = threading.Lock()
+
+
+def _clean_attributes(attributes: Mapping[str, Any]) -> Dict[str, Any]:
+    """Span attributes must be primitives; drop None and stringify the rest"""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def _write_span_record(record: Dict[str, Any]):
+    with _file_lock:
+        with open(_trace_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def register_span_listener(listener: Callable[[str, float, Dict[str, Any]], None]):
+    """Call listener(name, duration_seconds, attributes) whenever a span ends"""
+    _span_listeners.append(listener)
+
+
+def _notify_listeners(name: str, duration: float, attributes: Dict[str, Any]):
+    for listener in _span_listeners:
+        try:
+            listener(name, duration, attributes)
+        except Exception as e:
+            logger.error(f"Span listener failed: {e}")
+
+
+# Built-in tracer (used when OpenTelemetry is not installed)
+
+class _Span:
+    """Minimal span with OpenTelemetry-style ids and JSON export"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "UNSET"
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value if isinstance(value, (str, bool, int, float)) else str(value)
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        if _exporter == "file":
+            _write_span_record({
+                "name": self.name,
+                "context": {"trace_id": f"0x{self.trace_id}", "span_id": f"0x{self.span_id}"},
+                "parent_id": f"0x{self.parent_id}" if self.parent_id else None,
+                "start_time": self.start_ns,
+                "end_time": self.end_ns,
+                "status": {"status_code": self.status},
+                "attributes": self.attributes,
+                "resource": {"service.name": "agentos"}
+            })
+
+
+_current_span: ContextVar[Optional[_Span]] = ContextVar("agentos_current_span", default=None)
+
+
+@contextmanager
+def _fallback_span(name: str, attributes: Dict[str, Any], trace_id: Optional[str] = None, parent_id: Optional[str] = None):
+    parent = _current_span.get()
+    if trace_id is None:
+        trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        parent_id = parent.span_id if parent else None
+
+    current = _Span(name, trace_id, parent_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+        current.status = "OK"
+    except BaseException:
+        current.status = "ERROR"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+        _notify_listeners(name, (current.end_ns - current.start_ns) / 1e9, current.attributes)
+
+
+def _parse_traceparent(header: Optional[str]):
+    """Parse a W3C traceparent header into (trace_id, parent_span_id)"""
+    if not header:
+        return None, None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    return parts[1], parts[2]
+
+
+# OpenTelemetry integration
+
+if OTEL_AVAILABLE:
+    class JsonLinesSpanExporter(SpanExporter):
+        """Write finished OpenTelemetry spans to a JSON-lines file"""
+
+        def export(self, spans):
+            for finished in spans:
+                _write_span_record(json.loads(finished.to_json(indent=None)))
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            pass
+
+
+def configure_tracing(service_name: str = "agentos"):
+    """Install the OpenTelemetry tracer provider for the configured exporter"""
+    if not OTEL_AVAILABLE:
+        if _exporter == "otlp":
+            logger.warning("OpenTelemetry not installed; OTLP export disabled, spans are not exported")
+        logger.info(f"Tracing with built-in tracer (exporter={_exporter})")
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if _exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    elif _exporter == "file":
+        provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter()))
+    otel_trace.set_tracer_provider(provider)
+    logger.info(f"Tracing with OpenTelemetry (exporter={_exporter})")
+
+
+@contextmanager
+def _otel_span(name: str, attributes: Dict[str, Any], **kwargs):
+    tracer = otel_trace.get_tracer("agentos")
+    started = time.perf_counter()
+    with tracer.start_as_current_span(name, attributes=attributes, **kwargs) as current:
+        try:
+            yield current
+        finally:
+            _notify_listeners(name, time.perf_counter() - started, attributes)
+
+
+# Public API
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a pipeline stage as a child of the current span
+
+    Usage:
+        with span("trend_monitor.fetch", region="VN") as s:
+            trends = fetch()
+            s.set_attribute("trend.count", len(trends))
+    """
+    attributes = _clean_attributes(attributes)
+    if OTEL_AVAILABLE:
+        with _otel_span(name, attributes) as current:
+            yield current
+    else:
+        with _fallback_span(name, attributes) as current:
+            yield current
+
+
+@contextmanager
+def request_span(headers: Mapping[str, str], name: str, **attributes):
+    """Start a server span continuing the caller's traceparent, if any"""
+    attributes = _clean_attributes(attributes)
+    if OTEL_AVAILABLE:
+        with _otel_span(
+            name,
+            attributes,
+            context=otel_extract(dict(headers)),
+            kind=otel_trace.SpanKind.SERVER
+        ) as current:
+            yield current
+    else:
+        trace_id, parent_id = _parse_traceparent(headers.get("traceparent"))
+        with _fallback_span(name, attributes, trace_id=trace_id, parent_id=parent_id) as current:
+            yield current
+
+
+def current_trace_id() -> Optional[str]:
+    """Hex trace id of the active span (None outside a span)"""
+    if OTEL_AVAILABLE:
+        context = otel_trace.get_current_span().get_span_context()
+        return f"{context.trace_id:032x}" if context.is_valid else None
+    current = _current_span.get()
+    return current.trace_id if current else None
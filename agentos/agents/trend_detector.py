@@ -0,0 +1,299 @@
+"""
+Streaming early-trend detection
+
+Fixed thresholds (growth_rate > 200, engagement_rate > 10) only fire once a
+trend is already big. This detector instead asks whether a hashtag is
+growing unusually fast *for that hashtag*: every scan snapshot updates a
+small per-hashtag state in O(1), and a snapshot whose view velocity sits
+far above its own recent baseline is flagged as emerging.
+
+    velocity  = ln(views / previous views) per hour since the previous snapshot
+    baseline  = exponentially weighted mean and variance of velocity
+    z_score   = (velocity - baseline mean) / baseline std
+
+The EWMA weight is time-aware (alpha = 1 - exp(-dt / time_constant)), so
+irregular scan intervals are weighted by the time they cover. A snapshot is
+scored against the baseline *before* it is folded in. Engagement rate gets
+the same treatment (its log change per hour) and is reported alongside as
+engagement_z, but only velocity decides.
+
+No history is rescanned: state is a handful of floats per hashtag, rebuilt
+on start from TrendHistory's samples and dropped after max_idle without a
+sample.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+import logging
+import math
+import threading
+import time
+
+from .schemas import EmergingSignal
+from .trend_history import get_trend_history, trend_key
+
+try:
+    from ..config.trends import EMERGING_DETECTOR_CONFIG
+except ImportError:
+    try:
+        from config.trends import EMERGING_DETECTOR_CONFIG
+    except ImportError:
+        EMERGING_DETECTOR_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+
+def _log(value: float) -> Optional[float]:
+    return math.log(value) if value > 0 else None
+
+
+class _Ewma:
+    """Exponentially weighted mean/variance, updated in place"""
+
+    __slots__ = ("mean", "var")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.var = 0.0
+
+    def z_score(self, value: float, min_std: float) -> float:
+        return (value - self.mean) / max(math.sqrt(self.var), min_std)
+
+    def update(self, value: float, alpha: float, first: bool):
+        if first:
+            self.mean = value
+            return
+        diff = value - self.mean
+        increment = alpha * diff
+        self.mean += increment
+        self.var = (1 - alpha) * (self.var + diff * increment)
+
+
+class _State:
+    """One hashtag's detector state"""
+
+    __slots__ = (
+        "last_ts", "last_log_views", "last_log_engagement",
+        "velocity", "engagement", "updates", "emerging_since", "signal"
+    )
+
+    def __init__(self, observed_at: float, views: float, engagement: float):
+        self.last_ts = observed_at
+        self.last_log_views = _log(views)
+        self.last_log_engagement = _log(engagement)
+        self.velocity = _Ewma()
+        self.engagement = _Ewma()
+        self.updates = 0
+        self.emerging_since: Optional[float] = None
+        self.signal: Optional[EmergingSignal] = None
+
+
+class EmergingTrendDetector:
+    """
+    Per-hashtag EWMA/z-score anomaly detector over trend snapshots
+
+    Args:
+        time_constant: EWMA memory in seconds
+        z_threshold: Velocity z-score at or above which a trend is emerging
+        min_samples: Velocity updates before a hashtag can be flagged
+        min_std: Floor on the velocity std (log views per hour)
+        min_interval: Snapshots closer than this (seconds) to the previous
+            one are not folded in; the previous verdict stands
+        max_idle: Seconds without a sample before a hashtag is forgotten
+    """
+
+    def __init__(
+        self,
+        time_constant: float = 12 * 3600.0,
+        z_threshold: float = 3.0,
+        min_samples: int = 3,
+        min_std: float = 0.01,
+        min_interval: float = 600.0,
+        max_idle: float = 3 * 24 * 3600.0
+    ):
+        self.time_constant = time_constant
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.min_std = min_std
+        self.min_interval = min_interval
+        self.max_idle = max_idle
+        # Least recently updated first, so idle states are evicted from the front
+        self._states: "OrderedDict[str, _State]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        hashtag: str,
+        views: float,
+        engagement_rate: float = 0.0,
+        observed_at: Optional[float] = None,
+        region: Optional[str] = None
+    ) -> Optional[EmergingSignal]:
+        """
+        Fold one snapshot into the hashtag's state (per region)
+
+        Returns:
+            EmergingSignal if the snapshot's velocity is anomalous, else None
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        return self._observe(trend_key(hashtag, region), hashtag, views, engagement_rate, observed_at)
+
+    def _observe(
+        self,
+        key: str,
+        hashtag: str,
+        views: float,
+        engagement_rate: float,
+        observed_at: float
+    ) -> Optional[EmergingSignal]:
+        with self._lock:
+            self._evict(observed_at)
+            state = self._states.get(key)
+            if state is None:
+                self._states[key] = _State(observed_at, views, engagement_rate)
+                return None
+            self._states.move_to_end(key)
+            return self._update(state, hashtag, views, engagement_rate, observed_at)
+
+    def _update(
+        self,
+        state: _State,
+        hashtag: str,
+        views: float,
+        engagement_rate: float,
+        observed_at: float
+    ) -> Optional[EmergingSignal]:
+        dt = observed_at - state.last_ts
+        if dt < self.min_interval:
+            # Back-to-back scans: the ratio over seconds is noise
+            return state.signal
+
+        log_views = _log(views)
+        log_engagement = _log(engagement_rate)
+        if log_views is None or state.last_log_views is None:
+            # Nothing to take a ratio of yet
+            state.last_ts, state.last_log_views, state.last_log_engagement = observed_at, log_views, log_engagement
+            return None
+
+        hours = dt / 3600
+        velocity = (log_views - state.last_log_views) / hours
+        engagement_delta = (
+            (log_engagement - state.last_log_engagement) / hours
+            if log_engagement is not None and state.last_log_engagement is not None else 0.0
+        )
+
+        # Score against the baseline before this snapshot joins it
+        z_score = state.velocity.z_score(velocity, self.min_std)
+        engagement_z = state.engagement.z_score(engagement_delta, self.min_std)
+        warmed_up = state.updates >= self.min_samples
+
+        alpha = 1 - math.exp(-dt / self.time_constant)
+        first = state.updates == 0
+        baseline_velocity = state.velocity.mean
+        state.velocity.update(velocity, alpha, first)
+        state.engagement.update(engagement_delta, alpha, first)
+        state.updates += 1
+        state.last_ts, state.last_log_views, state.last_log_engagement = observed_at, log_views, log_engagement
+
+        if not (warmed_up and velocity > 0 and z_score >= self.z_threshold):
+            state.emerging_since = state.signal = None
+            return None
+        if state.emerging_since is None:
+            state.emerging_since = observed_at
+
+        state.signal = EmergingSignal(
+            hashtag=hashtag,
+            z_score=round(z_score, 2),
+            velocity=round(velocity, 4),
+            baseline_velocity=round(baseline_velocity, 4),
+            engagement_z=round(engagement_z, 2),
+            samples=state.updates,
+            emerging_since=state.emerging_since,
+            observed_at=observed_at
+        )
+        return state.signal
+
+    def _evict(self, now: float):
+        cutoff = now - self.max_idle
+        while self._states:
+            key, state = next(iter(self._states.items()))
+            if state.last_ts >= cutoff:
+                break
+            del self._states[key]
+
+    def observe(self, trends: Iterable, observed_at: Optional[float] = None) -> List[EmergingSignal]:
+        """
+        Feed one scan's trends; attaches each trend's signal (or None) as trend.emerging
+
+        Returns:
+            Signals for the emerging trends, strongest first
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        signals = []
+        for trend in trends:
+            signal = self.update(
+                trend["hashtag"],
+                float(trend.get("views", 0)),
+                float(trend.get("engagement_rate", 0)),
+                observed_at,
+                trend.get("region")
+            )
+            trend["emerging"] = signal
+            if signal is not None:
+                signals.append(signal)
+        signals.sort(key=lambda signal: signal.z_score, reverse=True)
+        return signals
+
+    def warm_start(self, history) -> int:
+        """Rebuild baselines from a TrendHistory's kept samples; returns samples replayed"""
+        replayed = 0
+        for key, observed_at, views, engagement in history.replay():
+            self._observe(key, key, views, engagement, observed_at)
+            replayed += 1
+        with self._lock:
+            # Replay order is per hashtag, not global: re-sort for eviction
+            for key in sorted(self._states, key=lambda key: self._states[key].last_ts):
+                self._states.move_to_end(key)
+                # Replayed signals carry the history key, not the display
+                # hashtag; the next live update within min_interval must not
+                # hand one out (emerging_since is kept)
+                self._states[key].signal = None
+        return replayed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hashtags": len(self._states),
+                "emerging": sum(1 for state in self._states.values() if state.emerging_since is not None)
+            }
+
+
+def create_emerging_detector(config: Optional[Dict] = None) -> EmergingTrendDetector:
+    config = EMERGING_DETECTOR_CONFIG if config is None else config
+    return EmergingTrendDetector(**{
+        key: config[key]
+        for key in ("time_constant", "z_threshold", "min_samples", "min_std", "min_interval", "max_idle")
+        if key in config
+    })
+
+
+_detector: Optional[EmergingTrendDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_emerging_detector() -> EmergingTrendDetector:
+    """The process-wide detector, warm-started from the trend history on first use"""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = create_emerging_detector()
+            replayed = _detector.warm_start(get_trend_history())
+            logger.info(f"Emerging trend detector: warm-started from {replayed} samples")
+        return _detector
+
+
+def set_emerging_detector(detector: Optional[EmergingTrendDetector]):
+    """Replace the process-wide detector (None rebuilds it on next use)"""
+    global _detector
+    with _detector_lock:
+        _detector = detector
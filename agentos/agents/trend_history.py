@@ -0,0 +1,434 @@
+"""
+Per-hashtag trend metric history and momentum
+
+Every scan appends one sample per fetched trend (views, posts, engagement
+rate). Samples are kept per hashtag in compact columns (array('d') for
+time, views and posts, array('f') for engagement), so windowed queries are
+two binary searches and a couple of interpolations, with no history
+refetch from upstream.
+
+Growth is measured, not taken from the payload:
+    growth_rate   view growth over the window, in % per window (same unit
+                  as the upstream 24h growth_rate)
+    acceleration  growth rate of the latest half window minus that of the
+                  half before it, in percentage points (> 0: speeding up)
+
+Persistence is an append-only log replayed on start:
+    FileTrendLog      fixed-size binary records, memory-mapped on load
+    PostgresTrendLog  narrow trend_metrics table, BRIN-indexed on time
+
+Series are per hashtag *and region*: outside DEFAULT_REGION a sample is
+logged under "<region>/<hashtag>" (trend_label) and keyed by trend_key, so
+#Skincare in VN and in TH never share a history.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from .schemas import TrendMomentum
+from .vietnamese_text import hashtag_key
+
+try:
+    from ..config.trends import TREND_HISTORY_CONFIG
+except ImportError:
+    try:
+        from config.trends import TREND_HISTORY_CONFIG
+    except ImportError:
+        TREND_HISTORY_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+# Growth-rate increase (percentage points) that counts as accelerating
+ACCELERATION_THRESHOLD = TREND_HISTORY_CONFIG.get("acceleration_threshold", 50.0)
+
+# Region whose trends are labelled and keyed by hashtag alone
+DEFAULT_REGION = "VN"
+
+# (trend label, observed_at unix seconds, views, posts, engagement_rate)
+Sample = Tuple[str, float, float, float, float]
+
+
+def trend_key(hashtag: str, region: Optional[str] = None) -> str:
+    """Key for per-trend state: hashtag_key, prefixed by the region outside DEFAULT_REGION"""
+    key = hashtag_key(hashtag)
+    if not region or region.upper() == DEFAULT_REGION:
+        return key
+    return f"{region.upper()}/{key}"
+
+
+def trend_label(trend) -> str:
+    """The trend's hashtag, prefixed by its region outside DEFAULT_REGION (as logged)"""
+    region = trend.get("region")
+    if not region or region.upper() == DEFAULT_REGION:
+        return trend["hashtag"]
+    return f"{region.upper()}/{trend['hashtag']}"
+
+
+def _label_key(label: str) -> str:
+    region, _, hashtag = label.rpartition("/")
+    return trend_key(hashtag, region)
+
+
+def _growth_pct(start: float, end: float) -> float:
+    return (end - start) / start * 100 if start > 0 else 0.0
+
+
+class _Series:
+    """One hashtag's samples, time-ordered, column per metric"""
+
+    __slots__ = ("ts", "views", "posts", "engagement")
+
+    def __init__(self):
+        self.ts = array("d")
+        self.views = array("d")
+        self.posts = array("d")
+        self.engagement = array("f")
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def append(self, observed_at: float, views: float, posts: float, engagement: float):
+        # Scans arrive in order; an out-of-order sample is inserted in place
+        i = len(self.ts) if not self.ts or observed_at >= self.ts[-1] else bisect_right(self.ts, observed_at)
+        self.ts.insert(i, observed_at)
+        self.views.insert(i, views)
+        self.posts.insert(i, posts)
+        self.engagement.insert(i, engagement)
+
+    def trim(self, cutoff: float):
+        drop = bisect_left(self.ts, cutoff)
+        if drop:
+            for column in (self.ts, self.views, self.posts, self.engagement):
+                del column[:drop]
+
+    def value_at(self, column: array, at: float) -> float:
+        """Linear interpolation of column at time at (clamped to the series)"""
+        i = bisect_left(self.ts, at)
+        if i == 0:
+            return column[0]
+        if i == len(self.ts):
+            return column[-1]
+        t0, t1 = self.ts[i - 1], self.ts[i]
+        if t1 == t0:
+            return column[i]
+        return column[i - 1] + (column[i] - column[i - 1]) * (at - t0) / (t1 - t0)
+
+
+class TrendHistory:
+    """
+    In-memory columnar history with an optional persistent log
+
+    Args:
+        log: FileTrendLog/PostgresTrendLog to append to and replay from
+        window: Growth window in seconds
+        max_age: Seconds of history kept
+        min_span: Seconds of history needed before momentum is reported
+    """
+
+    def __init__(
+        self,
+        log=None,
+        window: float = 24 * 3600.0,
+        max_age: float = 14 * 24 * 3600.0,
+        min_span: float = 6 * 3600.0
+    ):
+        self.log = log
+        self.window = window
+        self.max_age = max_age
+        self.min_span = min_span
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+        if log is not None:
+            cutoff = time.time() - max_age
+            loaded = 0
+            for label, observed_at, views, posts, engagement in log.load(since=cutoff):
+                self._series_for(label).append(observed_at, views, posts, engagement)
+                loaded += 1
+            logger.info(f"Trend history: replayed {loaded} samples for {len(self._series)} trends")
+
+    def _series_for(self, label: str) -> _Series:
+        key = _label_key(label)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def record(self, trends: Iterable, observed_at: Optional[float] = None) -> int:
+        """
+        Append one sample per trend (a scan), persisting them as one batch
+
+        Args:
+            trends: Trend records/dicts with hashtag, views, posts,
+                engagement_rate (and region, if not DEFAULT_REGION)
+            observed_at: Unix time of the scan (default now)
+
+        Returns:
+            Number of samples recorded
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        samples: List[Sample] = [
+            (
+                trend_label(trend),
+                observed_at,
+                float(trend.get("views", 0)),
+                float(trend.get("posts", 0)),
+                float(trend.get("engagement_rate", 0))
+            )
+            for trend in trends
+        ]
+        cutoff = observed_at - self.max_age
+        with self._lock:
+            for label, ts, views, posts, engagement in samples:
+                series = self._series_for(label)
+                series.append(ts, views, posts, engagement)
+                if series.ts[0] < cutoff:
+                    series.trim(cutoff)
+            if self.log is not None and samples:
+                try:
+                    self.log.append(samples)
+                except Exception as e:
+                    # History is an optimization; a scan must not fail on it
+                    logger.warning(f"Could not persist trend history: {e}")
+        return len(samples)
+
+    def momentum(
+        self,
+        hashtag: str,
+        window: Optional[float] = None,
+        region: Optional[str] = None
+    ) -> Optional[TrendMomentum]:
+        """
+        Measured growth/acceleration up to the latest sample
+
+        Returns:
+            TrendMomentum, or None until min_span of history exists. With
+            less than a full window, growth is scaled to a per-window rate
+            and acceleration is None.
+        """
+        window = window or self.window
+        with self._lock:
+            series = self._series.get(trend_key(hashtag, region))
+            if series is None or len(series) < 2:
+                return None
+            end = series.ts[-1]
+            span = end - series.ts[0]
+            if span < min(self.min_span, window):
+                return None
+
+            measured = min(window, span)
+            start = end - measured
+            views_end = series.views[-1]
+            views_start = series.value_at(series.views, start)
+            growth = _growth_pct(views_start, views_end) * window / measured
+
+            acceleration = None
+            if span >= window:
+                views_mid = series.value_at(series.views, end - window / 2)
+                # Both halves as % per window
+                recent = _growth_pct(views_mid, views_end) * 2
+                earlier = _growth_pct(views_start, views_mid) * 2
+                acceleration = round(recent - earlier, 2)
+
+            return TrendMomentum(
+                growth_rate=round(growth, 2),
+                acceleration=acceleration,
+                engagement_change=round(series.engagement[-1] - series.value_at(series.engagement, start), 2),
+                samples=len(series),
+                span_hours=round(span / 3600, 2)
+            )
+
+    def replay(self) -> Iterator[Tuple[str, float, float, float]]:
+        """(trend_key, observed_at, views, engagement) for every kept sample, time-ordered per trend"""
+        with self._lock:
+            snapshot = [
+                (key, series.ts.tolist(), series.views.tolist(), series.engagement.tolist())
+                for key, series in self._series.items()
+            ]
+        for key, ts, views, engagement in snapshot:
+            for sample in zip(ts, views, engagement):
+                yield (key, *sample)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hashtags": len(self._series),
+                "samples": sum(len(series) for series in self._series.values()),
+                "backend": type(self.log).__name__ if self.log is not None else "memory"
+            }
+
+
+class FileTrendLog:
+    """
+    Append-only local log: fixed 32-byte records plus a hashtag dictionary
+
+    <path> holds (hashtag id, observed_at, views, posts, engagement) records;
+    <path>.tags holds one hashtag per line, its line number being the id.
+    """
+
+    RECORD = struct.Struct("<Idddf")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tags_path = f"{path}.tags"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._ids: Dict[str, int] = {}
+        self._tags: List[str] = []
+        if os.path.exists(self.tags_path):
+            with open(self.tags_path, encoding="utf-8") as f:
+                for line in f:
+                    self._register(line.rstrip("\n"))
+
+    def _register(self, hashtag: str) -> int:
+        self._ids[hashtag] = len(self._tags)
+        self._tags.append(hashtag)
+        return self._ids[hashtag]
+
+    def append(self, samples: List[Sample]):
+        new_tags = []
+        records = bytearray()
+        for hashtag, observed_at, views, posts, engagement in samples:
+            tag_id = self._ids.get(hashtag)
+            if tag_id is None:
+                tag_id = self._register(hashtag)
+                new_tags.append(hashtag)
+            records += self.RECORD.pack(tag_id, observed_at, views, posts, engagement)
+
+        # Dictionary first, so every record's id resolves after a crash
+        if new_tags:
+            with open(self.tags_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{tag}\n" for tag in new_tags))
+        with open(self.path, "ab") as f:
+            f.write(records)
+
+    def load(self, since: float = 0.0) -> Iterator[Sample]:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self.RECORD.size:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Ignore a torn trailing record from an interrupted write
+            usable = len(mapped) - len(mapped) % self.RECORD.size
+            view = memoryview(mapped)[:usable]
+            try:
+                for tag_id, observed_at, views, posts, engagement in self.RECORD.iter_unpack(view):
+                    if observed_at >= since and tag_id < len(self._tags):
+                        yield self._tags[tag_id], observed_at, views, posts, engagement
+            finally:
+                view.release()
+
+
+class PostgresTrendLog:
+    """trend_metrics table: one narrow row per hashtag per scan"""
+
+    TABLE_NAME = "trend_metrics"
+
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            import psycopg2
+            self._conn = psycopg2.connect(self.db_url, connect_timeout=5)
+            with self._conn, self._conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                        hashtag TEXT NOT NULL,
+                        observed_at TIMESTAMPTZ NOT NULL,
+                        views BIGINT NOT NULL,
+                        posts BIGINT NOT NULL,
+                        engagement_rate REAL NOT NULL
+                    )
+                    """
+                )
+                # Append-only and time-ordered: a BRIN index stays tiny
+                cur.execute(
+                    f"""
+                    CREATE INDEX IF NOT EXISTS {self.TABLE_NAME}_observed_brin
+                    ON {self.TABLE_NAME} USING BRIN (observed_at)
+                    """
+                )
+        return self._conn
+
+    def append(self, samples: List[Sample]):
+        from psycopg2.extras import execute_values
+
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn, conn.cursor() as cur:
+                    execute_values(
+                        cur,
+                        f"INSERT INTO {self.TABLE_NAME} (hashtag, observed_at, views, posts, engagement_rate) VALUES %s",
+                        samples,
+                        template="(%s, to_timestamp(%s), %s, %s, %s)"
+                    )
+            except Exception:
+                self._conn = None
+                raise
+
+    def load(self, since: float = 0.0) -> Iterator[Sample]:
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn, conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        SELECT hashtag, extract(epoch FROM observed_at), views, posts, engagement_rate
+                        FROM {self.TABLE_NAME}
+                        WHERE observed_at >= to_timestamp(%s)
+                        ORDER BY observed_at
+                        """,
+                        (since,)
+                    )
+                    rows = cur.fetchall()
+            except Exception:
+                self._conn = None
+                raise
+        for hashtag, observed_at, views, posts, engagement in rows:
+            yield hashtag, float(observed_at), float(views), float(posts), float(engagement)
+
+
+def create_trend_history(config: Optional[Dict] = None) -> TrendHistory:
+    """Local log if a path is configured, else Postgres if reachable, else memory only"""
+    config = TREND_HISTORY_CONFIG if config is None else config
+    settings = {
+        key: config[key] for key in ("window", "max_age", "min_span") if key in config
+    }
+
+    if config.get("path"):
+        return TrendHistory(FileTrendLog(config["path"]), **settings)
+    if config.get("db_url"):
+        try:
+            return TrendHistory(PostgresTrendLog(config["db_url"]), **settings)
+        except Exception as e:
+            logger.warning(f"Trend history store unavailable ({e}), keeping history in memory only")
+    return TrendHistory(**settings)
+
+
+_history: Optional[TrendHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_trend_history() -> TrendHistory:
+    """The process-wide history shared by every TrendMonitor instance"""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = create_trend_history()
+        return _history
+
+
+def set_trend_history(history: Optional[TrendHistory]):
+    """Replace the process-wide history (None rebuilds it from config on next use)"""
+    global _history
+    with _history_lock:
+        _history = history
@@ -11,11 +11,21 @@ This agent:
 from agno import Agent
 from agno.storage.postgres import PostgresStorage
 from agno.knowledge.vector_db import PgVector
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import logging
 from datetime import datetime, timedelta
 import os
+import time
 from .glm_model import create_vietnamese_glm
+from .hashtag_index import get_hashtag_index
+from .region_scan import TREND_SCAN_CONFIG, stream_region_pages
+from .scan_checkpoint import UNCHANGED, get_scan_checkpoint
+from .schemas import Trend, TrendAnalysis
+from .trend_detector import get_emerging_detector
+from .trend_history import ACCELERATION_THRESHOLD, DEFAULT_REGION, get_trend_history
+from .tracing import span
+from .vietnamese_text import match_key
+from trend_sources.service import TrendSourceService
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +36,11 @@ class TrendMonitor(Agent):
     for Vietnamese e-commerce marketing
     """
 
+    # Shopping-intent keywords, as accent/case-insensitive match keys
+    ECOMMERCE_KEYWORDS = frozenset(
+        match_key(keyword) for keyword in ("mua sắm", "shopping", "giảm giá", "khuyến mãi")
+    )
+
     def __init__(
         self,
         db_url: str,
@@ -70,6 +85,7 @@ class TrendMonitor(Agent):
 
         self.tickertrends_api_key = tickertrends_api_key
         self.vector_db = vector_db
+        self.trend_sources = TrendSourceService(tickertrends_api_key=tickertrends_api_key)
 
     def fetch_tiktok_trends(
         self,
@@ -86,88 +102,46 @@ class TrendMonitor(Agent):
             time_range: Time range for trends (24h, 7d, 30d)
 
         Returns:
-            List of trending topics with metadata
+            List of trending topics with metadata (and the sources that reported them)
         """
-        # In production, this would call TickerTrends API
-        # For now, returning mock data structure
-
         logger.info(f"Fetching TikTok trends for region={region}, limit={limit}, time_range={time_range}")
 
-        # Mock data - replace with actual API call
-        # Example API call:
-        # import requests
-        # response = requests.get(
-        #     "https://api.tickertrends.com/v1/trends",
-        #     headers={"Authorization": f"Bearer {self.tickertrends_api_key}"},
-        #     params={"region": region, "limit": limit, "time_range": time_range}
-        # )
-        # trends = response.json()["data"]
-
-        mock_trends = [
-            {
-                "hashtag": "#ReviewSảnPhẩm",
-                "views": 125000000,
-                "posts": 45200,
-                "engagement_rate": 8.5,
-                "growth_rate": 245,  # percentage growth in 24h
-                "category": "product_reviews",
-                "keywords": ["đánh giá", "review", "mua sắm", "shopping"],
-                "trending_since": "2025-11-23T10:00:00Z"
-            },
-            {
-                "hashtag": "#TikTokShop",
-                "views": 890000000,
-                "posts": 125000,
-                "engagement_rate": 12.3,
-                "growth_rate": 180,
-                "category": "ecommerce",
-                "keywords": ["tiktok shop", "mua hàng", "giảm giá", "khuyến mãi"],
-                "trending_since": "2025-11-22T08:00:00Z"
-            },
-            {
-                "hashtag": "#BeautyHacks",
-                "views": 67000000,
-                "posts": 23400,
-                "engagement_rate": 9.2,
-                "growth_rate": 320,
-                "category": "beauty",
-                "keywords": ["làm đẹp", "beauty", "skincare", "makeup"],
-                "trending_since": "2025-11-24T06:00:00Z"
-            },
-            {
-                "hashtag": "#TechViệtNam",
-                "views": 45000000,
-                "posts": 12800,
-                "engagement_rate": 7.8,
-                "growth_rate": 156,
-                "category": "technology",
-                "keywords": ["công nghệ", "tech", "điện thoại", "gadget"],
-                "trending_since": "2025-11-23T14:00:00Z"
-            },
-            {
-                "hashtag": "#ĂnVặt",
-                "views": 234000000,
-                "posts": 67800,
-                "engagement_rate": 15.6,
-                "growth_rate": 410,
-                "category": "food",
-                "keywords": ["đồ ăn vặt", "snack", "food", "ẩm thực"],
-                "trending_since": "2025-11-24T09:00:00Z"
-            }
-        ]
-
-        return mock_trends
+        # Every configured source at once (TickerTrends, Creative Center
+        # exports, fixtures), merged by normalized hashtag
+        return self.trend_sources.fetch_sync(region=region, limit=limit, time_range=time_range)
+
+    def iter_trend_pages(
+        self,
+        region: str = "VN",
+        limit: int = 50,
+        time_range: str = "24h",
+        page_size: int = 100
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream trending TikTok hashtags page by page as they arrive
+
+        Args:
+            region: Country code (VN for Vietnam)
+            limit: Number of trends to fetch in total
+            time_range: Time range for trends (24h, 7d, 30d)
+            page_size: Trends per page
+
+        Returns:
+            Async iterator of trend pages (each trend yielded once, with its sources)
+        """
+        logger.info(f"Streaming TikTok trends for region={region}, limit={limit}, page_size={page_size}")
+        return self.trend_sources.iter_pages(region=region, limit=limit, time_range=time_range, page_size=page_size)
 
     def analyze_trend_relevance(
         self,
-        trend: Dict,
+        trend: Trend,
         product_categories: List[str]
-    ) -> Dict:
+    ) -> TrendAnalysis:
         """
         Analyze if a trend is relevant to our product catalog
 
         Args:
-            trend: Trend data dictionary
+            trend: Trend record (or trend data dictionary)
             product_categories: List of product categories we sell
 
         Returns:
@@ -179,15 +153,16 @@ class TrendMonitor(Agent):
         relevance_score = 0.0
         reasons = []
 
-        # Check category match
+        # Check category match (NFC/NFD, case and accents don't matter)
+        trend_category = match_key(trend.get("category", ""))
         for category in product_categories:
-            if category.lower() in trend.get("category", "").lower():
+            if match_key(category) in trend_category:
                 relevance_score += 0.3
                 reasons.append(f"Category match: {category}")
 
         # Check keyword overlap
-        trend_keywords = [k.lower() for k in trend.get("keywords", [])]
-        if any(kw in trend_keywords for kw in ["mua sắm", "shopping", "giảm giá", "khuyến mãi"]):
+        trend_keywords = {match_key(k) for k in trend.get("keywords", [])}
+        if trend_keywords & self.ECOMMERCE_KEYWORDS:
             relevance_score += 0.2
             reasons.append("E-commerce keywords detected")
 
@@ -196,77 +171,195 @@ class TrendMonitor(Agent):
             relevance_score += 0.2
             reasons.append(f"High engagement rate: {trend.get('engagement_rate')}%")
 
-        # Viral growth boost
-        if trend.get("growth_rate", 0) > 200:
+        # Viral growth boost: measured across our own scans when there is
+        # enough history, otherwise the upstream 24h figure
+        momentum = trend.get("momentum")
+        growth_rate = self.growth_rate(trend)
+        if growth_rate > 200:
             relevance_score += 0.3
-            reasons.append(f"Viral growth: {trend.get('growth_rate')}% in 24h")
+            source = "measured" if momentum else "reported"
+            reasons.append(f"Viral growth: {growth_rate}% in 24h ({source})")
+
+        # Momentum boost: growth is speeding up
+        acceleration = momentum.get("acceleration") if momentum else None
+        if acceleration is not None and acceleration > ACCELERATION_THRESHOLD:
+            relevance_score += 0.1
+            reasons.append(f"Accelerating: +{acceleration} pts growth rate")
+
+        # Early-trend boost: views growing far faster than this hashtag's
+        # own baseline, usually well before the fixed thresholds above fire
+        emerging = trend.get("emerging")
+        if emerging:
+            relevance_score += 0.2
+            reasons.append(f"Emerging: view velocity z={emerging['z_score']} above baseline")
+
+        return TrendAnalysis(
+            trend_id=trend.get("hashtag"),
+            relevance_score=min(relevance_score, 1.0),  # Cap at 1.0
+            reasons=reasons,
+            recommended_action="create_content" if relevance_score > 0.5 else "monitor"
+        )
 
-        return {
-            "trend_id": trend.get("hashtag"),
-            "relevance_score": min(relevance_score, 1.0),  # Cap at 1.0
-            "reasons": reasons,
-            "recommended_action": "create_content" if relevance_score > 0.5 else "monitor"
-        }
+    @staticmethod
+    def growth_rate(trend: Trend) -> float:
+        """Measured growth (% per 24h) if the trend has momentum, else the reported one"""
+        momentum = trend.get("momentum")
+        return momentum["growth_rate"] if momentum else trend.get("growth_rate", 0)
 
     def run_trend_scan(
         self,
         product_categories: List[str],
-        min_relevance_score: float = 0.5
-    ) -> List[Dict]:
+        min_relevance_score: float = 0.5,
+        regions: Optional[List[str]] = None
+    ) -> List[Trend]:
         """
         Main workflow: Scan trends and return relevant opportunities
 
+        Regions are fetched concurrently and streamed page by page
+        (agents/region_scan.py): each page is recorded, scored and upserted
+        while the next pages are still in flight, and the pages are merged
+        into one ranking at the end; every trend carries its region.
+
         Args:
             product_categories: Product categories to match against
             min_relevance_score: Minimum score to consider trend relevant
+            regions: Region codes to scan (default TREND_SCAN_CONFIG regions)
 
         Returns:
-            List of relevant trends with analysis
+            List of relevant trends, each with its analysis attached;
+            emerging trends (trend.emerging set) first. trend.change says
+            whether the trend is new, changed or unchanged since the last
+            scan; unchanged trends keep the analysis stored for these
+            product categories and are not re-upserted (nor re-briefed).
         """
         logger.info(f"Starting trend scan for categories: {product_categories}")
 
-        # Step 1: Fetch latest trends
-        trends = self.fetch_tiktok_trends(region="VN", limit=50, time_range="24h")
+        # Step 1: Stream the latest trends, all regions at once
+        regions = regions or TREND_SCAN_CONFIG.get("regions") or [DEFAULT_REGION]
+        limit = TREND_SCAN_CONFIG.get("limit", 50)
+        time_range = TREND_SCAN_CONFIG.get("time_range", "24h")
+        page_size = TREND_SCAN_CONFIG.get("page_size", 100)
+        observed_at = time.time()
+        checkpoint = get_scan_checkpoint()
+        relevant_trends = []
+        scanned = {}
+        upserted = 0
+        with span("trend_monitor.scan_regions", regions=",".join(regions), limit=limit) as scan_span:
+            pages = stream_region_pages(
+                lambda region: self.iter_trend_pages(
+                    region=region, limit=limit, time_range=time_range, page_size=page_size
+                ),
+                regions
+            )
+            for region, page in pages:
+                trends = [Trend.from_dict({**raw_trend, "region": region}) for raw_trend in page]
+                scanned[region] = scanned.get(region, 0) + len(trends)
+                with span("trend_monitor.page", region=region, trend_count=len(trends)):
+                    relevant, page_upserts = self._scan_page(
+                        trends, product_categories, min_relevance_score, observed_at
+                    )
+                relevant_trends.extend(relevant)
+                upserted += page_upserts
+            scan_span.set_attribute("trend.count", sum(scanned.values()))
+        checkpoint.commit(observed_at)
+
+        logger.info(
+            f"Scanned {sum(scanned.values())} trends from {', '.join(scanned) or 'no region'}; "
+            f"found {len(relevant_trends)} relevant trends (score >= {min_relevance_score}), "
+            f"{len(relevant_trends) - upserted} with a stored analysis"
+        )
 
-        logger.info(f"Fetched {len(trends)} trends")
+        # One ranking across pages and regions: emerging trends first, then
+        # by combined score: relevance * growth_rate (measured if known)
+        relevant_trends.sort(
+            key=lambda t: (t.emerging is not None, t.analysis.relevance_score * self.growth_rate(t)),
+            reverse=True
+        )
+
+        return relevant_trends
 
-        # Step 2: Analyze each trend for relevance
+    def _scan_page(
+        self,
+        trends: List[Trend],
+        product_categories: List[str],
+        min_relevance_score: float,
+        observed_at: float
+    ) -> Tuple[List[Trend], int]:
+        """Steps 2-4 of a scan for one page; returns (relevant trends, upsert count)"""
+        # Step 2: Record this page in the metric history, attach the
+        # momentum measured over previous scans and the streaming detector's
+        # emerging signal (detector first: it warm-starts from the history)
+        history = get_trend_history()
+        detector = get_emerging_detector()
+        with span("trend_monitor.history", trend_count=len(trends)) as history_span:
+            history.record(trends, observed_at=observed_at)
+            for trend in trends:
+                trend.momentum = history.momentum(trend.hashtag, region=trend.region)
+            signals = detector.observe(trends, observed_at=observed_at)
+            history_span.set_attribute("trend.emerging", len(signals))
+        if signals:
+            logger.info(f"Emerging trends: {', '.join(signal.hashtag for signal in signals)}")
+
+        # Step 3: Analyze each new or changed trend for relevance; unchanged
+        # ones (same fingerprint as last scan) keep the analysis stored for
+        # these product categories, if there is one
+        checkpoint = get_scan_checkpoint()
         relevant_trends = []
-        for trend in trends:
-            analysis = self.analyze_trend_relevance(trend, product_categories)
-
-            if analysis["relevance_score"] >= min_relevance_score:
-                # Combine trend data with analysis
-                relevant_trend = {
-                    **trend,
-                    "analysis": analysis
-                }
-                relevant_trends.append(relevant_trend)
-
-                # Step 3: Store in vector database for later retrieval
+        upserts = []
+        with span("trend_monitor.score", trend_count=len(trends)) as score_span:
+            unchanged = 0
+            for trend in trends:
+                acceleration = trend.momentum.acceleration if trend.momentum else None
+                trend.fingerprint = checkpoint.fingerprint(
+                    trend,
+                    growth_rate=self.growth_rate(trend),
+                    accelerating=acceleration is not None and acceleration > ACCELERATION_THRESHOLD
+                )
+                trend.change = checkpoint.classify(trend, trend.fingerprint)
+                analysis = checkpoint.analysis(trend, product_categories) if trend.change == UNCHANGED else None
+                if analysis is None:
+                    analysis = self.analyze_trend_relevance(trend, product_categories)
+                    rescored = True
+                else:
+                    unchanged += 1
+                    rescored = False
+
+                # Attach the analysis to the record instead of copying the trend
+                trend.analysis = analysis
+                if analysis.relevance_score >= min_relevance_score:
+                    relevant_trends.append(trend)
+                    if rescored:
+                        upserts.append(trend)
+            score_span.set_attribute("trend.unchanged", unchanged)
+
+        # Step 4: Store newly scored trends in vector database for later
+        # retrieval, and feed the hashtag index all relevant trends
+        # incrementally (its popularity decays unless refreshed). Brief
+        # hashtags are Vietnamese, so only DEFAULT_REGION trends feed it.
+        hashtag_index = get_hashtag_index()
+        with span("trend_monitor.vector_upsert", trend_count=len(upserts)):
+            for trend in upserts:
                 self.vector_db.upsert({
-                    "id": f"trend_{trend['hashtag']}_{datetime.now().isoformat()}",
-                    "content": f"{trend['hashtag']}: {', '.join(trend.get('keywords', []))}",
+                    "id": f"trend_{trend.region}_{trend.hashtag}_{datetime.now().isoformat()}",
+                    "content": f"{trend.hashtag}: {', '.join(trend.keywords)}",
                     "metadata": {
-                        "hashtag": trend["hashtag"],
-                        "views": trend["views"],
-                        "engagement_rate": trend["engagement_rate"],
-                        "growth_rate": trend["growth_rate"],
-                        "category": trend["category"],
-                        "relevance_score": analysis["relevance_score"],
+                        "hashtag": trend.hashtag,
+                        "region": trend.region,
+                        "sources": trend.sources,
+                        "views": trend.views,
+                        "engagement_rate": trend.engagement_rate,
+                        "growth_rate": self.growth_rate(trend),
+                        "category": trend.category,
+                        "relevance_score": trend.analysis.relevance_score,
                         "discovered_at": datetime.now().isoformat()
                     }
                 })
+            for trend in relevant_trends:
+                if trend.region == DEFAULT_REGION:
+                    hashtag_index.observe_trend(trend)
+        checkpoint.mark_scanned(trends, product_categories, observed_at)
 
-        logger.info(f"Found {len(relevant_trends)} relevant trends (score >= {min_relevance_score})")
-
-        # Sort by combined score: relevance * growth_rate
-        relevant_trends.sort(
-            key=lambda t: t["analysis"]["relevance_score"] * t["growth_rate"],
-            reverse=True
-        )
-
-        return relevant_trends
+        return relevant_trends, len(upserts)
 
 
 # Example usage in agent execution
@@ -0,0 +1,97 @@
+"""
+Vietnamese text normalization shared by matching and hashtag code
+
+Trend payloads, LLM output and the product catalog mix Unicode forms
+(precomposed NFC "ờ" vs decomposed NFD "o" + U+031B + U+0300) and
+spellings with and without accents ("ThờiTrang" / "ThoiTrang",
+"#FreeshíP" / "#Freeship"). Comparing raw strings misses those matches.
+
+    nfc("Thời")              -> canonical composed form, for output
+    normalize("  Thời Trang") -> "thời trang" (NFC, casefolded, single spaces)
+    fold_accents("Thời Trang") -> "Thoi Trang" (diacritics removed, đ -> d)
+    match_key("Thời  Trang") -> "thoi trang" (accent/case-insensitive key)
+    hashtag_key("#FreeshíP") -> "freeship"  (same key for the same tag)
+    tokenize("mua sắm online") -> ("mua_sắm", "online") with underthesea,
+                                  ("mua", "sắm", "online") without
+
+Every function is memoized with an LRU cache: trends, keywords and
+hashtags repeat across scans, and word segmentation is expensive.
+underthesea is optional; without it tokenize() splits on word characters.
+"""
+
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+import logging
+import re
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+_CACHE_SIZE = 65536
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_WORD = re.compile(r"\W+")
+_WORDS = re.compile(r"\w+")
+
+# Letters that do not decompose into base + combining mark
+_FOLD_TABLE = str.maketrans({"đ": "d", "Đ": "D"})
+
+
+@lru_cache(maxsize=1)
+def _segmenter() -> Optional[Callable[[str], list]]:
+    """underthesea's word segmenter, or None if it isn't installed"""
+    try:
+        from underthesea import word_tokenize
+    except ImportError:
+        logger.info("underthesea not installed, tokenizing on word characters")
+        return None
+    return word_tokenize
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def nfc(text: str) -> str:
+    """Canonical composed (NFC) form"""
+    return unicodedata.normalize("NFC", text)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def normalize(text: str) -> str:
+    """NFC, casefolded, whitespace collapsed and stripped"""
+    return _WHITESPACE.sub(" ", nfc(text).casefold()).strip()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def fold_accents(text: str) -> str:
+    """Remove Vietnamese diacritics (tones and vowel marks) and map đ to d"""
+    decomposed = unicodedata.normalize("NFD", text.translate(_FOLD_TABLE))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize("NFC", stripped)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def match_key(text: str) -> str:
+    """Accent-, case- and form-insensitive key for comparing phrases"""
+    return fold_accents(normalize(text))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def hashtag_key(tag: str) -> str:
+    """Key identifying a hashtag regardless of #, case, accents and punctuation"""
+    return _NON_WORD.sub("", match_key(tag))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Lowercased NFC word tokens; with underthesea, multi-syllable words are
+    kept together joined by "_" ("mua_sắm")
+    """
+    text = normalize(text)
+    segmenter = _segmenter()
+    if segmenter is None:
+        return tuple(_WORDS.findall(text))
+    return tuple(
+        token.replace(" ", "_")
+        for token in segmenter(text)
+        if _WORDS.search(token)
+    )
@@ -0,0 +1,116 @@
+"""
+Shared fixtures for the offline agent benchmarks
+
+Every agent runs against FakeGLMModel, InMemoryVectorDB and InMemoryStorage,
+so the suite needs no Postgres, network or API key. Client-side rate limits
+are lifted so the numbers reflect agent overhead, not the governor.
+
+Tunables (environment):
+    BENCH_LLM_LATENCY            Seconds per fake GLM request (default 0)
+    BENCH_LLM_COMPLETION_TOKENS  Completion tokens per fake request (default 400)
+"""
+
+from pathlib import Path
+from typing import Dict, List
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents import content_strategist, text_creator, trend_monitor  # noqa: E402
+from agents.fakes import FakeGLMModel, InMemoryStorage, InMemoryVectorDB  # noqa: E402
+from agents.rate_limiter import RateGovernor, set_rate_governor  # noqa: E402
+from agents.region_scan import RegionLimits, set_region_limits  # noqa: E402
+from agents.scan_checkpoint import ScanCheckpoint, set_scan_checkpoint  # noqa: E402
+from agents.trend_history import TrendHistory, set_trend_history  # noqa: E402
+from agents.trend_detector import EmergingTrendDetector, set_emerging_detector  # noqa: E402
+
+LLM_LATENCY = float(os.getenv("BENCH_LLM_LATENCY", "0"))
+LLM_COMPLETION_TOKENS = int(os.getenv("BENCH_LLM_COMPLETION_TOKENS", "400"))
+
+TREND_COUNTS = [10, 100, 1000]
+REGIONS = ["VN", "TH", "ID", "PH"]
+PRODUCT_CATEGORIES = ["beauty", "fashion", "food", "electronics"]
+
+SAMPLE_BRIEF = {
+    "trend_id": "#BeautyHacks",
+    "vietnamese_hook": "Chị em ơi! Trend làm đẹp này đang gây bão TikTok, mình phải thử ngay! 💄✨",
+    "content_angle": "Product Review + Tutorial - Show before/after transformation",
+    "products": ["PROD001"],
+    "hashtags": ["#BeautyHacks", "#LàmĐẹp", "#TikTokShop", "#ReviewSảnPhẩm"],
+    "vietnamese_voiceover": "Chào các bạn! Hôm nay mình review son lì..."
+}
+
+
+def make_trends(count: int, seed: int = 7) -> List[Dict]:
+    """Deterministic synthetic trends shaped like TickerTrends data"""
+    rng = random.Random(seed)
+    categories = PRODUCT_CATEGORIES + ["ecommerce", "product_reviews"]
+    keywords = ["làm đẹp", "mua sắm", "giảm giá", "review", "ăn vặt", "công nghệ", "thời trang", "khuyến mãi"]
+    return [
+        {
+            "hashtag": f"#Trend{i:05d}",
+            "views": rng.randint(1_000_000, 900_000_000),
+            "posts": rng.randint(1_000, 150_000),
+            "engagement_rate": round(rng.uniform(3, 18), 1),
+            "growth_rate": rng.randint(50, 450),
+            "category": categories[i % len(categories)],
+            "keywords": rng.sample(keywords, 4),
+            "trending_since": "2025-11-24T06:00:00Z"
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def fake_glm(monkeypatch) -> FakeGLMModel:
+    """Swap Postgres, PgVector, trend state and the GLM client for offline fakes"""
+    fake = FakeGLMModel(latency=LLM_LATENCY, completion_tokens=LLM_COMPLETION_TOKENS, max_tokens=4096)
+
+    for module in (trend_monitor, content_strategist, text_creator):
+        monkeypatch.setattr(module, "PostgresStorage", InMemoryStorage)
+        monkeypatch.setattr(module, "create_vietnamese_glm", lambda *args, **kwargs: fake)
+    for module in (trend_monitor, content_strategist):
+        monkeypatch.setattr(module, "PgVector", InMemoryVectorDB)
+
+    set_rate_governor(RateGovernor(
+        requests_per_minute=10**9,
+        tokens_per_minute=10**12,
+        initial_concurrency=64,
+        max_concurrency=64
+    ))
+    set_trend_history(TrendHistory())
+    set_emerging_detector(EmergingTrendDetector())
+    set_scan_checkpoint(ScanCheckpoint())
+    for region in REGIONS:
+        set_region_limits(RegionLimits(region, requests_per_minute=10**9, max_concurrency=64), region)
+    yield fake
+    set_rate_governor(None)
+    set_trend_history(None)
+    set_emerging_detector(None)
+    set_scan_checkpoint(None)
+    set_region_limits(None)
+
+
+def serve_pages(trends: List[Dict], latency: float = 0.0):
+    """A TrendMonitor.iter_trend_pages replacement paging through trends"""
+    async def iter_trend_pages(self, region="VN", limit=50, time_range="24h", page_size=100):
+        for start in range(0, len(trends), page_size):
+            if latency:
+                await asyncio.sleep(latency)
+            yield trends[start:start + page_size]
+    return iter_trend_pages
+
+
+@pytest.fixture
+def serve_trends(monkeypatch):
+    """Make TrendMonitor stream a synthetic batch (all of it, whatever the limit)"""
+    def _serve(count: int) -> List[Dict]:
+        trends = make_trends(count)
+        monkeypatch.setattr(trend_monitor.TrendMonitor, "iter_trend_pages", serve_pages(trends))
+        return trends
+    return _serve
@@ -0,0 +1,179 @@
+"""
+Per-agent throughput/latency benchmarks (offline)
+"""
+
+import pytest
+
+from agents.content_strategist import ContentStrategist
+from agents.hashtag_index import HashtagIndex
+from agents.scan_checkpoint import NEW, ScanCheckpoint, set_scan_checkpoint
+from agents.text_creator import TextCreator
+from agents.trend_detector import EmergingTrendDetector
+from agents.trend_monitor import TrendMonitor
+from trend_sources.service import merge_trends
+from conftest import PRODUCT_CATEGORIES, REGIONS, SAMPLE_BRIEF, TREND_COUNTS, make_trends, serve_pages
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_run_trend_scan(benchmark, serve_trends, trend_count):
+    serve_trends(trend_count)
+    monitor = TrendMonitor(db_url="offline", tickertrends_api_key="fake")
+
+    relevant = benchmark(
+        monitor.run_trend_scan,
+        product_categories=PRODUCT_CATEGORIES,
+        min_relevance_score=0.5
+    )
+
+    assert relevant
+    benchmark.extra_info["trends_per_second"] = trend_count / benchmark.stats.stats.mean
+
+
+def test_multi_region_scan(benchmark, monkeypatch):
+    # Each region's fetch takes 50 ms upstream: the regions overlap, so a
+    # four-region scan should cost about one fetch, not four
+    fetch_latency = 0.05
+    monkeypatch.setattr(TrendMonitor, "iter_trend_pages", serve_pages(make_trends(100), fetch_latency))
+    monitor = TrendMonitor(db_url="offline", tickertrends_api_key="fake")
+
+    relevant = benchmark(
+        monitor.run_trend_scan,
+        product_categories=PRODUCT_CATEGORIES,
+        min_relevance_score=0.5,
+        regions=REGIONS
+    )
+
+    assert {trend.region for trend in relevant} == set(REGIONS)
+    assert benchmark.stats.stats.min < fetch_latency * len(REGIONS)
+
+
+def test_streaming_scan(benchmark, monkeypatch):
+    # 2000 trends in 20 pages of 100, 20 ms per page upstream: each page is
+    # scored while the next is in flight, so the scan costs about the fetch
+    # time plus one page of scoring rather than fetch plus all the scoring
+    page_latency = 0.02
+    trends = make_trends(2000)
+    monkeypatch.setattr(TrendMonitor, "iter_trend_pages", serve_pages(trends, page_latency))
+    monitor = TrendMonitor(db_url="offline", tickertrends_api_key="fake")
+
+    relevant = benchmark.pedantic(
+        monitor.run_trend_scan,
+        kwargs={"product_categories": PRODUCT_CATEGORIES, "min_relevance_score": 0.5},
+        setup=lambda: set_scan_checkpoint(ScanCheckpoint()),
+        rounds=5
+    )
+
+    assert relevant and all(trend.change == NEW for trend in relevant)
+    benchmark.extra_info["fetch_seconds"] = page_latency * len(trends) / 100
+    benchmark.extra_info["trends_per_second"] = len(trends) / benchmark.stats.stats.mean
+
+
+def test_run_strategy_session(benchmark, fake_glm):
+    strategist = ContentStrategist(db_url="offline")
+    trend = {**make_trends(1)[0], "category": "beauty"}
+
+    briefs = benchmark(
+        strategist.run_strategy_session,
+        trend=trend,
+        max_products=2,
+        content_formats=["tiktok_video"]
+    )
+
+    assert len(briefs) == 1
+    assert briefs[0]["llm_output"]
+
+
+@pytest.mark.parametrize("generate_variants", [False, True])
+def test_run_copy_generation(benchmark, generate_variants):
+    creator = TextCreator(db_url="offline")
+    platforms = ["facebook", "tiktok", "shopee"]
+
+    results = benchmark(
+        creator.run_copy_generation,
+        brief=SAMPLE_BRIEF,
+        platforms=platforms,
+        generate_variants=generate_variants
+    )
+
+    assert set(results["copy"]) == set(platforms)
+    copies = sum(len(c) for c in results["copy"].values())
+    benchmark.extra_info["copies_per_second"] = copies / benchmark.stats.stats.mean
+
+
+@pytest.mark.parametrize("platform", ["facebook", "tiktok", "shopee"])
+def test_validate_copy(benchmark, platform):
+    creator = TextCreator(db_url="offline")
+    copy = creator.generate_platform_copy(SAMPLE_BRIEF, platform).copy
+
+    metadata = benchmark(
+        creator.validator.validate,
+        platform,
+        copy.body,
+        copy.hashtags,
+        copy.call_to_action
+    )
+
+    assert metadata["emoji_analysis"]["emoji_count"] > 0
+    assert metadata["character_count"] <= len(copy.body)
+
+
+def test_repair_over_length_copy(benchmark):
+    # facebook_optimal is 80: the mock copy is trimmed locally, no LLM call
+    creator = TextCreator(db_url="offline")
+
+    result = benchmark(creator.generate_platform_copy, SAMPLE_BRIEF, "facebook")
+
+    assert result.metadata["within_limit"]
+    assert result.metadata["repairs"] == ["trimmed_to_sentences"]
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_hashtag_top_k(benchmark, trend_count):
+    index = HashtagIndex()
+    for trend in make_trends(trend_count):
+        index.observe_trend(trend)
+
+    hashtags = benchmark(index.top_k, categories=["beauty"], tags=["làm đẹp", "review"], k=10)
+
+    assert len(hashtags) == 10
+    assert len({tag.casefold() for tag in hashtags}) == 10
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_detect_emerging(benchmark, trend_count):
+    def warmed_up():
+        # A day of hourly scans at a steady ~2%/h, then one trend jumps 30%
+        trends = make_trends(trend_count)
+        detector = EmergingTrendDetector()
+        for hour in range(24):
+            for trend in trends:
+                trend["views"] *= 1.02
+            detector.observe(trends, observed_at=hour * 3600.0)
+        trends[0]["views"] *= 1.3
+        return (detector, trends), {}
+
+    signals = benchmark.pedantic(
+        lambda detector, trends: detector.observe(trends, observed_at=24 * 3600.0),
+        setup=warmed_up,
+        rounds=10,
+        iterations=1
+    )
+
+    assert [signal.hashtag for signal in signals] == ["#Trend00000"]
+    benchmark.extra_info["updates_per_second"] = trend_count / benchmark.stats.stats.mean
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_merge_sources(benchmark, trend_count):
+    # Three sources reporting mostly the same hashtags in other spellings
+    api = [{**trend, "sources": ["tickertrends"]} for trend in make_trends(trend_count)]
+    export = [
+        {"hashtag": trend["hashtag"].upper(), "views": trend["views"], "posts": trend["posts"], "sources": ["creative_center"]}
+        for trend in make_trends(trend_count, seed=8)
+    ]
+    fixture = [{**trend, "sources": ["fixture"]} for trend in make_trends(trend_count // 2, seed=9)]
+
+    merged = benchmark(merge_trends, [api, export, fixture])
+
+    assert len(merged) == trend_count
+    assert set(merged[0]["sources"]) == {"tickertrends", "creative_center", "fixture"}
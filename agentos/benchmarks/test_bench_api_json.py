@@ -0,0 +1,48 @@
+"""
+API response encoding benchmarks: FastAPI default vs FastJSONResponse
+
+Encodes the /api/v1/approvals/pending payload the way each response class
+gets it, and checks the Vietnamese text and emoji come out byte-identical.
+"""
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from agents.fast_json import FastJSONResponse, dumps_line
+from test_bench_schemas import BACKLOG_SIZES, make_backlog
+
+
+def render_default(content):
+    # What FastAPI does for a returned dict with the stock JSONResponse
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def render_fast(content):
+    return FastJSONResponse(content).body
+
+
+@pytest.mark.parametrize("render", [render_default, render_fast], ids=["default", "orjson"])
+@pytest.mark.parametrize("size", BACKLOG_SIZES)
+def test_render_pending_approvals(benchmark, size, render):
+    briefs = make_backlog(size, as_record=True)
+    content = {"count": len(briefs), "briefs": briefs}
+
+    body = benchmark(render, content)
+
+    assert body.count(b'"trend_id"') == size
+    benchmark.extra_info["bytes"] = len(body)
+
+
+def test_output_byte_identical():
+    briefs = make_backlog(3, as_record=True)
+    content = {
+        "count": len(briefs),
+        "briefs": briefs,
+        "emoji": "💄✨👇🏻👨‍👩‍👧 Đường đến thành công ạ",
+        "metrics": {1: 0.1, "rate": 8.0, "revenue_vnd": 25900000}
+    }
+
+    assert render_fast(content) == render_default(content)
+    assert "Đường".encode() in render_fast(content)
+    assert dumps_line(content) == render_fast(content) + b"\n"
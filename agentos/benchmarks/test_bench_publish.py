@@ -0,0 +1,113 @@
+"""
+Multi-platform publish benchmarks (offline, httpx mock transport)
+
+Each platform answers after its own simulated latency; a publish to all of
+them should take about as long as the slowest platform, not the sum.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from publishers.service import PublishingService
+
+PLATFORM_LATENCY = {"facebook": 0.05, "instagram": 0.08, "tiktok": 0.15, "shopee": 0.10}
+
+STUB_CONFIG = {
+    "facebook": {"base_url": "http://stub/facebook", "page_id": "page", "access_token": "token"},
+    "instagram": {"base_url": "http://stub/instagram", "user_id": "user", "access_token": "token"},
+    "tiktok": {"base_url": "http://stub/tiktok", "access_token": "token"},
+    "shopee": {
+        "base_url": "http://stub/shopee",
+        "post_path": "/api/v2/feed/create_post",
+        "partner_id": "1",
+        "partner_key": "key",
+        "shop_id": "2"
+    }
+}
+
+CONTENT = {
+    "body": "Chị em ơi! Son lì bền màu 24h đang hot lắm nè 💄✨",
+    "hashtags": ["#LàmĐẹp", "#SonLì"],
+    "call_to_action": "Link shop ở dưới nha! 👇",
+    "media_url": "https://cdn.example.com/son-li.jpg"
+}
+
+
+async def stub_platforms(request: httpx.Request) -> httpx.Response:
+    platform = request.url.path.split("/")[1]
+    await asyncio.sleep(PLATFORM_LATENCY[platform] / (2 if platform == "instagram" else 1))
+    if platform == "tiktok":
+        return httpx.Response(200, json={"data": {"publish_id": "tt_1"}, "error": {"code": "ok"}})
+    if platform == "shopee":
+        return httpx.Response(200, json={"error": "", "response": {"post_id": 1}})
+    if platform == "instagram":
+        # Container and publish steps each carry their own idempotency key
+        step = "publish" if request.url.path.endswith("/media_publish") else "container"
+        assert request.headers["Idempotency-Key"].endswith(f":{step}")
+    return httpx.Response(200, json={"id": f"{platform}_1"})
+
+
+@pytest.mark.parametrize("platform_count", [1, 4])
+def test_publish_fan_out(benchmark, platform_count):
+    platforms = list(PLATFORM_LATENCY)[:platform_count]
+    rounds = iter(range(10**6))
+
+    def run():
+        service = PublishingService(
+            mode="live",
+            platform_config={p: {**STUB_CONFIG[p], "timeout": 5.0} for p in platforms},
+            transport=httpx.MockTransport(stub_platforms)
+        )
+
+        async def publish():
+            try:
+                contents = {platform: CONTENT for platform in platforms}
+                return await service.publish_all(f"#Bench{next(rounds)}", contents)
+            finally:
+                await service.close()
+
+        return asyncio.run(publish())
+
+    results = benchmark.pedantic(run, rounds=5, iterations=1)
+
+    assert all(r["status"] != "failed" for r in results), json.dumps(results, ensure_ascii=False)
+    slowest = max(PLATFORM_LATENCY[p] for p in platforms)
+    total = sum(PLATFORM_LATENCY[p] for p in platforms)
+    if platform_count > 1:
+        # Concurrent fan-out: bounded by the slowest platform, not the sum
+        assert benchmark.stats.stats.min < slowest + (total - slowest) / 2
+    benchmark.extra_info["slowest_platform_seconds"] = slowest
+    benchmark.extra_info["serial_seconds"] = total
+
+
+def test_publish_isolates_malformed_response(benchmark):
+    # Facebook answers 200 with an HTML page: it fails on its own, the other
+    # platforms still publish
+    async def html_facebook(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/facebook"):
+            return httpx.Response(200, text="<html>Service page</html>")
+        return await stub_platforms(request)
+
+    def run():
+        service = PublishingService(
+            mode="live",
+            platform_config={p: {**STUB_CONFIG[p], "timeout": 5.0, "max_attempts": 1} for p in PLATFORM_LATENCY},
+            transport=httpx.MockTransport(html_facebook)
+        )
+
+        async def publish():
+            try:
+                return await service.publish_all("#Malformed", {platform: CONTENT for platform in PLATFORM_LATENCY})
+            finally:
+                await service.close()
+
+        return asyncio.run(publish())
+
+    results = {r["platform"]: r for r in benchmark.pedantic(run, rounds=3, iterations=1)}
+
+    assert results["facebook"]["status"] == "failed"
+    assert "non-JSON" in results["facebook"]["error"]
+    assert all(results[p]["status"] != "failed" for p in ("instagram", "tiktok", "shopee"))
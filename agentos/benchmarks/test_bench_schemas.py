@@ -0,0 +1,92 @@
+"""
+Brief representation benchmarks: per-brief memory and JSON encode time
+
+Compares the Brief record against the equivalent nested dict at backlog
+sizes, with the stdlib encoder and with orjson (API responses). Record and
+dict runs share a benchmark group so they are reported side by side;
+encode-time regressions are caught with --benchmark-compare-fail.
+"""
+
+import json
+import tracemalloc
+
+import orjson
+import pytest
+
+from agents.schemas import Brief, json_default
+
+BACKLOG_SIZES = [100, 1000, 10000]
+
+BRIEF_DATA = {
+    "trend_id": "#BeautyHacks",
+    "products": ["PROD001", "PROD002"],
+    "content_format": "tiktok_video",
+    "created_at": "2025-11-24T09:00:00",
+    "vietnamese_hook": "Chị em ơi! Trend làm đẹp này đang gây bão TikTok, mình phải thử ngay! 💄✨",
+    "content_angle": "Product Review + Tutorial - Show before/after transformation",
+    "script_outline": {
+        "opening": "Hook with trending sound + text overlay (3s)",
+        "main_content": "Unboxing → Tutorial → Before/After → Honest review (20s)",
+        "cta": "Text overlay with shop link (3s)"
+    },
+    "visual_suggestions": ["Trending transition", "Close-up texture shots", "Split-screen before/after"],
+    "vietnamese_voiceover": "Chào các bạn! Hôm nay mình review son lì...",
+    "hashtags": ["#BeautyHacks", "#ReviewSảnPhẩm", "#LàmĐẹp", "#TikTokShop"],
+    "optimal_posting_time": "19:00-21:00 GMT+7",
+    "success_metrics": {
+        "target_views": 50000,
+        "target_engagement_rate": 8.0,
+        "target_conversions": 100,
+        "expected_revenue_vnd": 25900000
+    },
+    "cultural_notes": ["Use friendly 'chị em' address", "Include price transparency"],
+    "status": "pending_approval"
+}
+
+
+def make_backlog(size: int, as_record: bool):
+    # Fresh containers per brief, as the agents build them
+    backlog = []
+    for i in range(size):
+        data = json.loads(json.dumps(BRIEF_DATA))
+        data["trend_id"] = f"#Trend{i:05d}"
+        backlog.append(Brief.from_dict(data) if as_record else data)
+    return backlog
+
+
+def allocated_bytes(size: int, as_record: bool) -> int:
+    tracemalloc.start()
+    try:
+        backlog = make_backlog(size, as_record)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del backlog
+    return current
+
+
+ENCODERS = {
+    "json": lambda content: json.dumps(content, ensure_ascii=False, default=json_default),
+    # As agents/fast_json.py renders API responses
+    "orjson": lambda content: orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+}
+
+
+@pytest.mark.parametrize("encoder", list(ENCODERS))
+@pytest.mark.parametrize("as_record", [False, True], ids=["dict", "record"])
+@pytest.mark.parametrize("size", BACKLOG_SIZES)
+def test_encode_backlog(benchmark, size, as_record, encoder):
+    encode = ENCODERS[encoder]
+    backlog = make_backlog(size, as_record)
+    benchmark.group = f"encode-{encoder}-{size}"
+
+    encoded = benchmark(encode, {"briefs": backlog})
+
+    # Same bytes as the dicts: unset optional fields are left out, not null
+    assert encoded == encode({"briefs": make_backlog(size, as_record=False)})
+    benchmark.extra_info["bytes_per_brief"] = allocated_bytes(size, as_record) / size
+
+
+def test_record_smaller_than_dict():
+    size = 1000
+    assert allocated_bytes(size, as_record=True) < allocated_bytes(size, as_record=False)
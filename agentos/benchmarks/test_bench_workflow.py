@@ -0,0 +1,92 @@
+"""
+End-to-end trend-to-content workflow benchmarks (offline)
+"""
+
+import pytest
+
+from agents.scan_checkpoint import ScanCheckpoint, set_scan_checkpoint
+from workflows.trend_to_content import TrendToContentWorkflow
+from conftest import PRODUCT_CATEGORIES, TREND_COUNTS
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_full_workflow(benchmark, serve_trends, fake_glm, trend_count):
+    serve_trends(trend_count)
+    workflow = TrendToContentWorkflow(db_url="offline", tickertrends_api_key="fake")
+    workflow.warm_up()
+
+    results = benchmark.pedantic(
+        workflow.run_daily_content_generation,
+        kwargs={
+            "product_categories": PRODUCT_CATEGORIES,
+            "min_relevance_score": 0.5,
+            "max_briefs_per_day": trend_count
+        },
+        # Fresh checkpoints: every round is a cold scan that briefs everything
+        setup=lambda: set_scan_checkpoint(ScanCheckpoint()),
+        rounds=3 if trend_count >= 1000 else 5,
+        iterations=1
+    )
+
+    assert results["status"] == "completed"
+    benchmark.extra_info["trends_per_second"] = trend_count / benchmark.stats.stats.mean
+    benchmark.extra_info["briefs_created"] = results["content_briefs_created"]
+    benchmark.extra_info["llm_calls"] = fake_glm.calls
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_incremental_workflow(benchmark, serve_trends, fake_glm, trend_count):
+    # Yesterday's scan briefed every trend; today 10% of them have tripled
+    trends = serve_trends(trend_count)
+    baseline_views = [trend["views"] for trend in trends]
+    workflow = TrendToContentWorkflow(db_url="offline", tickertrends_api_key="fake")
+    workflow.warm_up()
+    kwargs = {
+        "product_categories": PRODUCT_CATEGORIES,
+        "min_relevance_score": 0.5,
+        "max_briefs_per_day": trend_count
+    }
+
+    def yesterday():
+        set_scan_checkpoint(ScanCheckpoint())
+        for trend, views in zip(trends, baseline_views):
+            trend["views"] = views
+        workflow.run_daily_content_generation(**kwargs)
+        for trend in trends[::10]:
+            trend["views"] *= 3
+        fake_glm.calls = 0
+
+    results = benchmark.pedantic(
+        workflow.run_daily_content_generation,
+        kwargs=kwargs,
+        setup=yesterday,
+        rounds=3 if trend_count >= 1000 else 5,
+        iterations=1
+    )
+
+    assert results["trends_unchanged"] > 0
+    assert results["content_briefs_created"] <= len(trends[::10])
+    benchmark.extra_info["briefs_created"] = results["content_briefs_created"]
+    benchmark.extra_info["llm_calls"] = fake_glm.calls
+
+
+@pytest.mark.parametrize("trend_count", TREND_COUNTS)
+def test_streaming_time_to_first_brief(benchmark, serve_trends, trend_count):
+    serve_trends(trend_count)
+    workflow = TrendToContentWorkflow(db_url="offline", tickertrends_api_key="fake")
+    workflow.warm_up()
+
+    def first_brief():
+        events = workflow.iter_daily_content_generation(
+            product_categories=PRODUCT_CATEGORIES,
+            min_relevance_score=0.5,
+            max_briefs_per_day=trend_count
+        )
+        try:
+            return next(event for event in events if event["type"] in ("brief", "summary"))
+        finally:
+            events.close()
+
+    event = benchmark.pedantic(first_brief, rounds=5, iterations=1)
+
+    assert event["type"] == "brief"
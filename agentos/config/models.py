@@ -4,6 +4,8 @@ AgentOS Model Configuration
 Centralized configuration for AI models used across the AgentOS system.
 """
 
+import os
+
 # Default model settings
 DEFAULT_MODEL = "glm-4.6"  # Latest and most capable GLM model
 
@@ -35,6 +37,51 @@ MODEL_CONFIG = {
 # Fallback model configuration
 FALLBACK_MODEL = "glm-4-plus"  # Backup if GLM-4.6 unavailable
 
+# Send real requests to Z.AI (agents return mock output when disabled)
+LIVE_LLM_CALLS = os.getenv("GLM_LIVE_CALLS", "false").lower() in ("1", "true", "yes")
+
+# Resilience settings for GLM calls
+RESILIENCE_CONFIG = {
+    # Retry with jittered exponential backoff
+    "max_attempts": int(os.getenv("GLM_MAX_ATTEMPTS", "3")),
+    "backoff_multiplier": 0.5,      # seconds
+    "backoff_max": 8.0,             # seconds
+    "request_timeout": float(os.getenv("GLM_REQUEST_TIMEOUT", "60")),
+
+    # Circuit breaker on error rate over a sliding window of calls
+    "breaker_failure_rate": 0.5,
+    "breaker_window_size": 20,
+    "breaker_min_calls": 5,
+    "breaker_reset_timeout": 30.0,  # seconds before a half-open probe
+
+    # Hedged request after the p95 latency of recent calls
+    "hedge_enabled": os.getenv("GLM_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes"),
+    "hedge_percentile": 95,
+    "hedge_min_samples": 20,
+    "hedge_min_delay": 0.5,         # seconds
+    "hedge_max_delay": 30.0         # seconds
+}
+
+# Client-side rate limits for the Z.AI API (per process unless shared)
+RATE_LIMIT_CONFIG = {
+    "requests_per_minute": int(os.getenv("GLM_RATE_LIMIT_RPM", "60")),
+    "tokens_per_minute": int(os.getenv("GLM_RATE_LIMIT_TPM", "200000")),
+
+    # AIMD concurrency: halve on 429 or slow responses, +1 per healthy window
+    "initial_concurrency": 4,
+    "min_concurrency": 1,
+    "max_concurrency": int(os.getenv("GLM_MAX_CONCURRENCY", "16")),
+    "latency_target": 20.0,         # seconds
+    "acquire_timeout": 120.0,       # seconds to wait for capacity
+
+    # Share the buckets across replicas through Postgres advisory locks
+    "shared_db_url": (
+        os.getenv("DATABASE_URL")
+        if os.getenv("GLM_RATE_LIMIT_SHARED", "false").lower() in ("1", "true", "yes")
+        else None
+    )
+}
+
 # Model capabilities
 MODEL_CAPABILITIES = {
     "glm-4.6": {
@@ -87,6 +134,16 @@ MODEL_CAPABILITIES = {
     }
 }
 
+# Price per 1M tokens (USD) for each cost_tier in MODEL_CAPABILITIES.
+# Approximate Z.AI list prices - update when the pricing page changes.
+COST_TIER_PRICING = {
+    "premium": {"prompt": 0.60, "completion": 2.20},
+    "high": {"prompt": 0.70, "completion": 0.70},
+    "medium": {"prompt": 0.14, "completion": 0.14},
+    "low": {"prompt": 0.0, "completion": 0.0},
+    "economy": {"prompt": 0.14, "completion": 0.14}
+}
+
 def get_model_config(agent_name: str) -> dict:
     """
     Get model configuration for a specific agent
@@ -0,0 +1,73 @@
+"""
+AgentOS Platform Publishing Configuration
+
+API endpoints, credentials and call behaviour for the social/e-commerce
+platforms content is published to.
+"""
+
+import os
+
+# mock: no network calls (demo); live: call the platform APIs (or the stub
+# servers when the *_API_URL variables point at them)
+PUBLISH_MODE = os.getenv("PUBLISH_MODE", "mock").lower()
+
+# Shared async HTTP connection pool for all publishers
+PUBLISHER_HTTP_CONFIG = {
+    "max_connections": int(os.getenv("PUBLISH_MAX_CONNECTIONS", "50")),
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,       # seconds
+    "connect_timeout": 5.0          # seconds
+}
+
+PLATFORM_CONFIG = {
+    "facebook": {
+        "base_url": os.getenv("FACEBOOK_API_URL", "https://graph.facebook.com/v21.0"),
+        "page_id": os.getenv("FACEBOOK_PAGE_ID"),
+        "access_token": os.getenv("FACEBOOK_ACCESS_TOKEN"),
+        "timeout": 15.0,            # seconds for the whole publish incl. retries
+        "request_timeout": 10.0,    # seconds per HTTP attempt
+        "max_attempts": 3,
+        "min_post_interval": 2.0    # seconds between scheduled posts
+    },
+    "instagram": {
+        "base_url": os.getenv("INSTAGRAM_API_URL", "https://graph.facebook.com/v21.0"),
+        "user_id": os.getenv("INSTAGRAM_USER_ID"),
+        "access_token": os.getenv("INSTAGRAM_ACCESS_TOKEN", os.getenv("FACEBOOK_ACCESS_TOKEN")),
+        "timeout": 30.0,
+        "request_timeout": 15.0,
+        "max_attempts": 3,
+        "min_post_interval": 5.0
+    },
+    "tiktok": {
+        "base_url": os.getenv("TIKTOK_API_URL", "https://open.tiktokapis.com"),
+        "access_token": os.getenv("TIKTOK_ACCESS_TOKEN"),
+        "timeout": 30.0,
+        "request_timeout": 15.0,
+        "max_attempts": 3,
+        "min_post_interval": 10.0
+    },
+    "shopee": {
+        "base_url": os.getenv("SHOPEE_API_URL", "https://partner.shopeemobile.com"),
+        "post_path": os.getenv("SHOPEE_POST_PATH", "/api/v2/feed/create_post"),
+        "partner_id": os.getenv("SHOPEE_PARTNER_ID"),
+        "partner_key": os.getenv("SHOPEE_PARTNER_KEY"),
+        "shop_id": os.getenv("SHOPEE_SHOP_ID"),
+        "access_token": os.getenv("SHOPEE_ACCESS_TOKEN"),
+        "timeout": 15.0,
+        "request_timeout": 10.0,
+        "max_attempts": 3,
+        "min_post_interval": 3.0
+    }
+}
+
+# Scheduled publishing (PublishRequest.scheduled_time)
+SCHEDULER_CONFIG = {
+    "enabled": os.getenv("PUBLISH_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes"),
+    "db_url": os.getenv("DATABASE_URL"),
+    "poll_interval": 30.0,          # seconds; also picks up jobs added by other replicas
+    "batch_window": 60.0,           # seconds; jobs due this close together are dispatched as one batch
+    "batch_size": 200,              # jobs claimed per batch
+    "jitter": 1.0,                  # seconds of random delay added to each post
+    "claim_timeout": 600.0,         # seconds before a claimed but unfinished job is retried
+    "default_timezone": "+07:00"    # for scheduled times without an offset
+}
@@ -0,0 +1,87 @@
+"""
+AgentOS Trend Scanning Configuration
+
+History and momentum settings for TrendMonitor.
+"""
+
+import os
+
+# Per-hashtag metric history across scans (agents/trend_history.py).
+# A local log file (memory-mapped on load) takes precedence over Postgres;
+# with neither, history lives in memory for the life of the process.
+TREND_HISTORY_CONFIG = {
+    "path": os.getenv("TREND_HISTORY_PATH"),
+    "db_url": os.getenv("DATABASE_URL"),
+    "window": 24 * 3600.0,              # seconds; growth is reported per window (like upstream "24h")
+    "max_age": 14 * 24 * 3600.0,        # seconds of history kept
+    "min_span": 6 * 3600.0,             # seconds of history needed before measured growth is used
+    "acceleration_threshold": 50.0      # percentage points of growth-rate increase to boost relevance
+}
+
+# Streaming early-trend detector (agents/trend_detector.py). Velocity is the
+# log growth of views per hour between scans; its EWMA mean/variance per
+# hashtag is the baseline a new scan is scored against.
+EMERGING_DETECTOR_CONFIG = {
+    "time_constant": 12 * 3600.0,       # seconds; EWMA memory (older velocity weighs 1/e after this)
+    "z_threshold": 3.0,                 # z-score of velocity above baseline that signals "emerging"
+    "min_samples": 3,                   # velocity updates before a hashtag's baseline is trusted
+    "min_std": 0.01,                    # floor on velocity std (log views/hour), so flat baselines don't trip on noise
+    "min_interval": 600.0,              # seconds; closer snapshots (back-to-back scans) are not folded in
+    "max_idle": 3 * 24 * 3600.0         # seconds without a sample before a hashtag's state is dropped
+}
+
+# Scan checkpoints (agents/scan_checkpoint.py): a trend whose material
+# fields land in the same buckets as last time is not rescored, re-upserted
+# or rebriefed. Buckets are deliberately coarse, so steady growth alone does
+# not count as a change every day.
+SCAN_CHECKPOINT_CONFIG = {
+    "path": os.getenv("SCAN_CHECKPOINT_PATH"),  # JSON file; unset keeps checkpoints in memory
+    "views_factor": 2.0,                # views bucket: changes by this factor count (doubling)
+    "engagement_step": 2.0,             # engagement rate bucket, percentage points
+    "growth_step": 100.0,               # growth rate bucket, percentage points
+    "max_age": 7 * 24 * 3600.0          # seconds; checkpoints of trends not seen since are dropped
+}
+
+# Regions scanned by TrendMonitor.run_trend_scan (agents/region_scan.py).
+# Regions are fetched concurrently; each has its own request budget and
+# concurrency cap, so one slow or throttled market does not hold up the rest.
+TREND_SCAN_CONFIG = {
+    "regions": [r.strip().upper() for r in os.getenv("TREND_REGIONS", "VN").split(",") if r.strip()],
+    "limit": int(os.getenv("TREND_SCAN_LIMIT", "50")),  # trends per region
+    "page_size": 100,                   # trends per page; pages are scored as they arrive
+    "prefetch_pages": 4,                # pages fetched ahead of scoring
+    "time_range": "24h",
+    "fetch_timeout": 30.0,              # seconds per page fetch (including waiting for budget)
+    "region_limits": {
+        # region: requests_per_minute (one request per page), max_concurrency
+        "VN": {"requests_per_minute": 60, "max_concurrency": 4},
+        "TH": {"requests_per_minute": 30, "max_concurrency": 2},
+        "ID": {"requests_per_minute": 30, "max_concurrency": 2},
+        "PH": {"requests_per_minute": 30, "max_concurrency": 2}
+    },
+    "default_region_limit": {"requests_per_minute": 30, "max_concurrency": 2}
+}
+
+# Trend sources (trend_sources/), fetched concurrently per region and merged
+# by normalized hashtag. Earlier sources win when values conflict; later
+# ones fill in what they lack. A source slower than its timeout on a page is
+# dropped from the rest of that fetch.
+TREND_SOURCES_CONFIG = {
+    # tickertrends | creative_center | fixture (built-in sample data)
+    "sources": [s.strip() for s in os.getenv("TREND_SOURCES", "fixture").split(",") if s.strip()],
+    "tickertrends": {
+        "base_url": os.getenv("TICKERTRENDS_API_URL", "https://api.tickertrends.com"),
+        "max_page_size": 100,           # trends per request (the API caps pages)
+        "timeout": 10.0                 # seconds per page
+    },
+    "creative_center": {
+        # TikTok Creative Center trending-hashtag exports (CSV or JSON); the
+        # newest file whose name contains the region code is used
+        "export_dir": os.getenv("CREATIVE_CENTER_EXPORT_DIR", "data/creative_center"),
+        "timeout": 5.0
+    },
+    "fixture": {
+        "path": os.getenv("TREND_FIXTURE_PATH"),  # JSON list of trends; unset = built-in sample
+        "timeout": 5.0
+    }
+}
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Load-test harness for the AgentOS FastAPI endpoints
+
+Starts `uvicorn main:app` with the fake LLM / in-memory vector store
+backends (AGENTOS_FAKE_BACKENDS=true) for each requested worker count,
+then drives a weighted mix of the approval-flow endpoints at increasing
+concurrency levels. For every (worker count, concurrency) stage it reports
+throughput and p50/p95/p99 per endpoint, and it flags the saturation
+point: the first stage where adding clients no longer adds throughput
+(or errors climb) - the level to size replicas and the HPA against.
+
+Usage:
+    python loadtest/run_loadtest.py --workers 1,2,4 --concurrency 1,4,16,64
+    python loadtest/run_loadtest.py --target http://localhost:8080   # existing server
+
+Results are printed as tables and written to --output as JSON.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+AGENTOS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default request mix (relative weights): the approval UI polls the pending
+# list far more often than anything else; scans are rare but heavy.
+DEFAULT_MIX = {
+    "trends_scan": 1,
+    "approvals_pending": 10,
+    "approvals_submit": 3,
+    "content_generate_copy": 3,
+    "content_publish": 2
+}
+
+PLATFORMS = ["facebook", "tiktok", "shopee"]
+CATEGORIES = ["beauty", "fashion", "food", "electronics"]
+
+# Saturation: throughput gain below this ratio, or errors above this rate
+SATURATION_GAIN = 1.10
+SATURATION_ERROR_RATE = 0.01
+
+
+@dataclass
+class StageResult:
+    """Latencies and outcomes for one concurrency stage"""
+    concurrency: int
+    duration: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    not_found: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, endpoint: str, latency: float, status: int):
+        if status == 404:
+            # Expected with >1 worker: approvals live in per-worker memory
+            self.not_found[endpoint] = self.not_found.get(endpoint, 0) + 1
+        elif status >= 400:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        else:
+            self.latencies.setdefault(endpoint, []).append(latency)
+
+    @property
+    def completed(self) -> int:
+        return sum(len(v) for v in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        total = self.completed + sum(self.errors.values())
+        return sum(self.errors.values()) / total if total else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            "concurrency": self.concurrency,
+            "throughput_rps": round(self.throughput, 2),
+            "error_rate": round(self.error_rate, 4),
+            "endpoints": {
+                endpoint: {
+                    "requests": len(samples),
+                    "rps": round(len(samples) / self.duration, 2) if self.duration else 0.0,
+                    "p50_ms": round(percentile(samples, 50) * 1000, 1),
+                    "p95_ms": round(percentile(samples, 95) * 1000, 1),
+                    "p99_ms": round(percentile(samples, 99) * 1000, 1),
+                    "errors": self.errors.get(endpoint, 0),
+                    "not_found": self.not_found.get(endpoint, 0)
+                }
+                for endpoint, samples in sorted(self.latencies.items())
+            }
+        }
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# Approved briefs seeded before each stage, so copy/publish have targets
+SEED_APPROVED = 5
+
+
+class FlowState:
+    """Brief ids seen so far, so submit/copy/publish target real briefs"""
+
+    def __init__(self):
+        self.pending: List[str] = []
+        self.approved: List[str] = []
+        # Taken from pending by a client (submitted or about to be)
+        self.claimed: Set[str] = set()
+
+    def add_pending(self, brief_ids: Iterable[str]):
+        for brief_id in brief_ids:
+            if brief_id not in self.claimed and brief_id not in self.pending:
+                self.pending.append(brief_id)
+
+    def claim(self) -> str:
+        brief_id = self.pending.pop(0)
+        self.claimed.add(brief_id)
+        return brief_id
+
+
+def resolve_endpoint(endpoint: str, state: FlowState) -> str:
+    """
+    The endpoint that can run now: copy/publish need an approved brief,
+    submit a pending one. Without one, fall back to the step that produces
+    it (listing pending briefs refreshes the state; a scan would mostly
+    return no_changes once trends stop changing).
+    """
+    if endpoint in ("content_generate_copy", "content_publish") and not state.approved:
+        endpoint = "approvals_submit"
+    if endpoint == "approvals_submit" and not state.pending:
+        endpoint = "approvals_pending"
+    return endpoint
+
+
+async def call_endpoint(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    state: FlowState,
+    rng: random.Random
+) -> Tuple[str, int]:
+    """Send one request for endpoint (or its fallback); returns (endpoint called, HTTP status)"""
+    endpoint = resolve_endpoint(endpoint, state)
+
+    if endpoint == "trends_scan":
+        response = await client.post("/api/v1/trends/scan", json={
+            "product_categories": rng.sample(CATEGORIES, 2),
+            "min_relevance_score": 0.5,
+            "max_briefs": 5
+        })
+        if response.status_code == 200:
+            state.add_pending(b["trend_id"] for b in response.json()["briefs"])
+        return endpoint, response.status_code
+
+    if endpoint == "approvals_pending":
+        response = await client.get("/api/v1/approvals/pending")
+        if response.status_code == 200:
+            state.add_pending(b["trend_id"] for b in response.json()["briefs"])
+        return endpoint, response.status_code
+
+    if endpoint == "approvals_submit":
+        brief_id = state.claim()
+        response = await client.post("/api/v1/approvals/submit", json={
+            "brief_id": brief_id,
+            "approved": True,
+            "feedback": "load test"
+        })
+        if response.status_code == 200:
+            state.approved.append(brief_id)
+        return endpoint, response.status_code
+
+    brief_id = rng.choice(state.approved)
+
+    if endpoint == "content_generate_copy":
+        response = await client.post(
+            "/api/v1/content/generate-copy",
+            params={"brief_id": brief_id},
+            json=rng.sample(PLATFORMS, 2)
+        )
+        return endpoint, response.status_code
+
+    if endpoint == "content_publish":
+        response = await client.post("/api/v1/content/publish", json={
+            "brief_id": brief_id,
+            "platforms": rng.sample(PLATFORMS, 2)
+        })
+        return endpoint, response.status_code
+
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def seed_flow(client: httpx.AsyncClient, state: FlowState, rng: random.Random):
+    """Untimed: make sure the stage starts with pending and approved briefs"""
+    await call_endpoint(client, "approvals_pending", state, rng)
+    if not state.pending and not state.approved:
+        await call_endpoint(client, "trends_scan", state, rng)
+    while state.pending and len(state.approved) < SEED_APPROVED:
+        await call_endpoint(client, "approvals_submit", state, rng)
+
+
+async def run_stage(
+    base_url: str,
+    concurrency: int,
+    seconds: float,
+    mix: Dict[str, int],
+    seed: int,
+    state: Optional[FlowState] = None
+) -> StageResult:
+    """Drive `concurrency` closed-loop clients for `seconds` (state carries over between stages)"""
+    result = StageResult(concurrency=concurrency)
+    state = state if state is not None else FlowState()
+    endpoints = list(mix)
+    weights = [mix[e] for e in endpoints]
+    deadline = time.perf_counter() + seconds
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        await seed_flow(client, state, random.Random(seed))
+
+        async def client_loop(client_id: int):
+            rng = random.Random(seed * 1000 + client_id)
+            while time.perf_counter() < deadline:
+                endpoint = rng.choices(endpoints, weights)[0]
+                started = time.perf_counter()
+                try:
+                    # Recorded under the endpoint actually called, not the one drawn
+                    endpoint, status = await call_endpoint(client, endpoint, state, rng)
+                except httpx.HTTPError:
+                    status = 599
+                result.record(endpoint, time.perf_counter() - started, status)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+        result.duration = time.perf_counter() - started
+
+    return result
+
+
+def find_saturation(stages: List[StageResult]) -> Optional[Dict]:
+    """First stage where throughput stops scaling or errors climb"""
+    for previous, current in zip(stages, stages[1:]):
+        if current.throughput < previous.throughput * SATURATION_GAIN or current.error_rate > SATURATION_ERROR_RATE:
+            return {
+                "concurrency": previous.concurrency,
+                "max_throughput_rps": round(max(s.throughput for s in stages), 2),
+                "reason": "errors" if current.error_rate > SATURATION_ERROR_RATE else "throughput plateau"
+            }
+    return None
+
+
+def find_endpoint_knees(stages: List[StageResult]) -> Dict[str, Optional[int]]:
+    """Per endpoint: first concurrency where p95 is more than 2x the lowest stage's"""
+    knees = {}
+    baseline = stages[0].summary()["endpoints"]
+    for endpoint, stats in baseline.items():
+        knees[endpoint] = None
+        for stage in stages[1:]:
+            current = stage.summary()["endpoints"].get(endpoint)
+            if current and stats["p95_ms"] and current["p95_ms"] > 2 * stats["p95_ms"]:
+                knees[endpoint] = stage.concurrency
+                break
+    return knees
+
+
+def start_server(workers: int, port: int, fake_latency: float) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "AGENTOS_FAKE_BACKENDS": "true",
+        "AGENTOS_FAKE_LLM_LATENCY": str(fake_latency),
+        "AGENTOS_READY_REQUIRES_WARMUP": "true",
+        "ZHIPU_API_KEY": os.environ.get("ZHIPU_API_KEY", "fake"),
+        "LOG_LEVEL": "warning"
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning"
+        ],
+        cwd=AGENTOS_DIR,
+        env=env
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=5.0) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"{base_url} did not become ready within {timeout}s")
+
+
+def print_stage(workers: Optional[int], stage: StageResult):
+    summary = stage.summary()
+    label = f"workers={workers} " if workers else ""
+    print(f"\n{label}concurrency={stage.concurrency}  "
+          f"throughput={summary['throughput_rps']} req/s  errors={summary['error_rate']:.2%}")
+    print(f"  {'endpoint':<24}{'reqs':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'404':>6}")
+    for endpoint, stats in summary["endpoints"].items():
+        print(f"  {endpoint:<24}{stats['requests']:>7}{stats['rps']:>9}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['not_found']:>6}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test AgentOS endpoints")
+    parser.add_argument("--workers", default="1,2", help="Comma-separated uvicorn worker counts")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="Comma-separated client counts")
+    parser.add_argument("--stage-seconds", type=float, default=20.0, help="Duration of each stage")
+    parser.add_argument("--mix", default=json.dumps(DEFAULT_MIX), help="JSON endpoint weights")
+    parser.add_argument("--fake-llm-latency", type=float, default=0.2, help="Seconds per fake GLM call")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--target", help="Test an already running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="loadtest-results.json")
+    args = parser.parse_args()
+
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+    mix = json.loads(args.mix)
+    worker_counts = [None] if args.target else [int(w) for w in args.workers.split(",")]
+    report = {"mix": mix, "stage_seconds": args.stage_seconds, "runs": []}
+
+    for workers in worker_counts:
+        server = None
+        base_url = args.target or f"http://127.0.0.1:{args.port}"
+        if workers is not None:
+            server = start_server(workers, args.port, args.fake_llm_latency)
+        try:
+            await wait_until_ready(base_url)
+            stages = []
+            state = FlowState()
+            for concurrency in concurrency_levels:
+                stage = await run_stage(base_url, concurrency, args.stage_seconds, mix, args.seed, state)
+                print_stage(workers, stage)
+                stages.append(stage)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+        saturation = find_saturation(stages)
+        knees = find_endpoint_knees(stages)
+        print(f"\nworkers={workers}: saturation={saturation or 'not reached'}")
+        print(f"  p95 knee per endpoint (concurrency): {knees}")
+        report["runs"].append({
+            "workers": workers,
+            "stages": [s.summary() for s in stages],
+            "saturation": saturation,
+            "endpoint_p95_knees": knees
+        })
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
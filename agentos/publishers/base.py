@@ -0,0 +1,110 @@
+"""
+Base class for platform publishers
+
+A publisher turns one piece of approved content into a post on one platform.
+Publishers share the service's pooled httpx.AsyncClient and only know how to
+shape their platform's request and read its response; retries, timeouts and
+idempotency are handled by PublishingService.
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+class PublishError(RuntimeError):
+    """A platform rejected or failed a publish request"""
+
+    def __init__(self, message: str, retryable: bool = False, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+def build_caption(content: Dict[str, Any]) -> str:
+    """Body, call to action and hashtags as one post caption"""
+    parts = [content.get("body", ""), content.get("call_to_action", ""), " ".join(content.get("hashtags", []))]
+    return "\n\n".join(part for part in parts if part)
+
+
+class PlatformPublisher:
+    """
+    One platform's posting API
+
+    Args:
+        client: Shared async HTTP client (connection pool)
+        config: The platform's entry in PLATFORM_CONFIG
+    """
+
+    platform = ""
+
+    def __init__(self, client: httpx.AsyncClient, config: Dict[str, Any]):
+        self.client = client
+        self.config = config
+        self.base_url = config["base_url"].rstrip("/")
+
+    async def publish(self, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        """
+        Create the post
+
+        Args:
+            content: body, hashtags, call_to_action and optional media_url
+            idempotency_key: Stable key for this (content, platform) pair
+
+        Returns:
+            post_id, url and optionally status (default "published")
+        """
+        raise NotImplementedError
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        idempotency_key: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Send one request; 429/5xx raise a retryable PublishError"""
+        response = await self.client.request(
+            method,
+            f"{self.base_url}{path}",
+            headers={"Idempotency-Key": idempotency_key, **(headers or {})},
+            timeout=self.config.get("request_timeout", 10.0),
+            **kwargs
+        )
+        if response.status_code == 429 or response.status_code >= 500:
+            raise PublishError(
+                f"{self.platform} returned {response.status_code}",
+                retryable=True,
+                status_code=response.status_code
+            )
+        if response.status_code >= 400:
+            raise PublishError(
+                f"{self.platform} returned {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code
+            )
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise PublishError(
+                f"{self.platform} returned a non-JSON body: {response.text[:200]}",
+                status_code=response.status_code
+            ) from e
+        if not isinstance(body, dict):
+            raise PublishError(f"{self.platform} returned an unexpected response: {response.text[:200]}")
+        return body
+
+    def _field(self, response: Dict[str, Any], *keys: str) -> Any:
+        """response[key][key]...; a missing key is a malformed response, not a crash"""
+        value: Any = response
+        try:
+            for key in keys:
+                value = value[key]
+        except (KeyError, IndexError, TypeError) as e:
+            raise PublishError(f"{self.platform} response has no {'.'.join(keys)}") from e
+        return value
+
+    def _require(self, *keys: str):
+        missing = [key for key in keys if not self.config.get(key)]
+        if missing:
+            raise PublishError(f"{self.platform} publisher is missing config: {', '.join(missing)}")
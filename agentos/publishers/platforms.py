@@ -0,0 +1,137 @@
+"""
+Platform publishers - Facebook, Instagram, TikTok and Shopee
+
+Each adapter maps approved content onto its platform's posting API. Base
+URLs come from PLATFORM_CONFIG, so every adapter can be pointed at the
+local stub server (publishers/stub_server.py) for testing.
+"""
+
+from typing import Any, Dict
+import hashlib
+import hmac
+import time
+
+from .base import PlatformPublisher, PublishError, build_caption
+
+
+class FacebookPublisher(PlatformPublisher):
+    """Page feed post via the Graph API"""
+
+    platform = "facebook"
+
+    async def publish(self, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        self._require("page_id", "access_token")
+        data = {"message": build_caption(content), "access_token": self.config["access_token"]}
+        if content.get("link"):
+            data["link"] = content["link"]
+
+        response = await self._request("POST", f"/{self.config['page_id']}/feed", idempotency_key, data=data)
+        post_id = self._field(response, "id")
+        return {"post_id": post_id, "url": f"https://www.facebook.com/{post_id}"}
+
+
+class InstagramPublisher(PlatformPublisher):
+    """Feed post via the Instagram Graph API (container, then publish)"""
+
+    platform = "instagram"
+
+    async def publish(self, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        self._require("user_id", "access_token")
+        if not content.get("media_url"):
+            raise PublishError("Instagram posts require a media_url")
+
+        # One key per step: replaying the container response for the publish
+        # call would never publish
+        user_path = f"/{self.config['user_id']}"
+        container = await self._request("POST", f"{user_path}/media", f"{idempotency_key}:container", data={
+            "image_url": content["media_url"],
+            "caption": build_caption(content),
+            "access_token": self.config["access_token"]
+        })
+        response = await self._request("POST", f"{user_path}/media_publish", f"{idempotency_key}:publish", data={
+            "creation_id": self._field(container, "id"),
+            "access_token": self.config["access_token"]
+        })
+        return {"post_id": self._field(response, "id"), "url": None}
+
+
+class TikTokPublisher(PlatformPublisher):
+    """Photo post via the Content Posting API (TikTok processes it asynchronously)"""
+
+    platform = "tiktok"
+
+    async def publish(self, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        self._require("access_token")
+        if not content.get("media_url"):
+            raise PublishError("TikTok posts require a media_url")
+
+        caption = build_caption(content)
+        response = await self._request(
+            "POST",
+            "/v2/post/publish/content/init/",
+            idempotency_key,
+            headers={"Authorization": f"Bearer {self.config['access_token']}"},
+            json={
+                "post_info": {"title": caption[:90], "description": caption},
+                "source_info": {"source": "PULL_FROM_URL", "photo_images": [content["media_url"]]},
+                "post_mode": "DIRECT_POST",
+                "media_type": "PHOTO"
+            }
+        )
+        error = response.get("error") or {}
+        if not isinstance(error, dict):
+            raise PublishError(f"TikTok error: {error}")
+        if error.get("code", "ok") != "ok":
+            raise PublishError(f"TikTok error {error.get('code')}: {error.get('message')}")
+        return {"post_id": self._field(response, "data", "publish_id"), "url": None, "status": "processing"}
+
+
+class ShopeePublisher(PlatformPublisher):
+    """
+    Shop feed post through the Shopee partner gateway
+
+    Requests are signed with Shopee's v2 scheme (HMAC-SHA256 over partner id,
+    path, timestamp, access token and shop id). The post path is configurable
+    (SHOPEE_POST_PATH) because feed posting is not part of the public API.
+    """
+
+    platform = "shopee"
+
+    def _signed_params(self, path: str) -> Dict[str, Any]:
+        timestamp = int(time.time())
+        base = (
+            f"{self.config['partner_id']}{path}{timestamp}"
+            f"{self.config.get('access_token') or ''}{self.config['shop_id']}"
+        )
+        sign = hmac.new(self.config["partner_key"].encode(), base.encode(), hashlib.sha256).hexdigest()
+        return {
+            "partner_id": self.config["partner_id"],
+            "shop_id": self.config["shop_id"],
+            "access_token": self.config.get("access_token") or "",
+            "timestamp": timestamp,
+            "sign": sign
+        }
+
+    async def publish(self, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        self._require("partner_id", "partner_key", "shop_id")
+        path = self.config["post_path"]
+        response = await self._request(
+            "POST",
+            path,
+            idempotency_key,
+            params=self._signed_params(path),
+            json={
+                "content": build_caption(content),
+                "images": [content["media_url"]] if content.get("media_url") else []
+            }
+        )
+        # Shopee reports errors in the body with HTTP 200
+        if response.get("error"):
+            raise PublishError(f"Shopee error {response['error']}: {response.get('message', '')}")
+        return {"post_id": str(self._field(response, "response", "post_id")), "url": None}
+
+
+PUBLISHERS = {
+    publisher.platform: publisher
+    for publisher in (FacebookPublisher, InstagramPublisher, TikTokPublisher, ShopeePublisher)
+}
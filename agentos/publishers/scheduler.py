@@ -0,0 +1,486 @@
+"""
+Publish Scheduler - Durable, batched dispatch of scheduled publishes
+
+Scheduled publishes are rows in the Postgres table scheduled_publishes (a
+partial index on due_at over pending rows acts as the priority queue), so
+they survive restarts and every replica can dispatch them: due rows are
+claimed with FOR UPDATE SKIP LOCKED, and rows claimed by a replica that
+died are released again after claim_timeout. Without a database the
+scheduler falls back to an in-memory heap (not durable).
+
+Posts that fall due within the same batch_window are claimed as one batch
+and spread per platform: each platform gets a minimum interval between
+posts plus jitter, so an evening prime-time burst becomes a steady stream
+the platform rate limits accept. Posts are never published before their
+scheduled time.
+"""
+
+from datetime import datetime, time as dt_time, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import heapq
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+
+from .service import PublishingService, get_publishing_service
+
+try:
+    from ..config.platforms import PLATFORM_CONFIG, SCHEDULER_CONFIG
+except ImportError:
+    try:
+        from config.platforms import PLATFORM_CONFIG, SCHEDULER_CONFIG
+    except ImportError:
+        PLATFORM_CONFIG = {}
+        SCHEDULER_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+_POSTING_WINDOW = re.compile(r"(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*(?:GMT|UTC)\s*([+-]\d{1,2})")
+
+
+def _default_timezone() -> timezone:
+    offset = SCHEDULER_CONFIG.get("default_timezone", "+07:00")
+    sign = -1 if offset.startswith("-") else 1
+    hours, minutes = offset.lstrip("+-").split(":")
+    return timezone(sign * timedelta(hours=int(hours), minutes=int(minutes)))
+
+
+def parse_scheduled_time(value: str) -> datetime:
+    """ISO 8601 timestamp; times without an offset are in the default timezone (GMT+7)"""
+    scheduled = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if scheduled.tzinfo is None:
+        scheduled = scheduled.replace(tzinfo=_default_timezone())
+    return scheduled
+
+
+def format_scheduled_time(scheduled: datetime) -> str:
+    """ISO 8601 in the default timezone; jobs are stored in UTC but shown as scheduled"""
+    return scheduled.astimezone(_default_timezone()).isoformat()
+
+
+def next_optimal_posting_time(optimal_posting_time: str, brief_id: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Next slot inside a brief's posting window such as "19:00-21:00 GMT+7"
+
+    Each brief gets a stable position inside the window (hash of its id), so
+    briefs sharing the same window are spread across it instead of all
+    landing on its first minute.
+
+    Returns:
+        Aware datetime, or None if the window cannot be parsed
+    """
+    match = _POSTING_WINDOW.search(optimal_posting_time or "")
+    if not match:
+        return None
+
+    start_h, start_m, end_h, end_m, offset = (int(g) for g in match.groups())
+    tz = timezone(timedelta(hours=offset))
+    now = (now or datetime.now(timezone.utc)).astimezone(tz)
+
+    window_start = datetime.combine(now.date(), dt_time(start_h, start_m), tzinfo=tz)
+    window_end = datetime.combine(now.date(), dt_time(end_h, end_m), tzinfo=tz)
+    if window_end <= window_start:
+        window_end += timedelta(days=1)
+    window_seconds = (window_end - window_start).total_seconds()
+
+    position = int(hashlib.sha256(brief_id.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+    slot = window_start + timedelta(seconds=position * window_seconds)
+    if slot <= now:
+        slot += timedelta(days=1)
+    return slot
+
+
+def _new_job(
+    brief_id: str,
+    contents: Dict[str, Dict[str, Any]],
+    due_at: datetime,
+    idempotency_key: Optional[str]
+) -> Dict[str, Any]:
+    job_id = f"sched_{uuid.uuid4().hex[:16]}"
+    return {
+        "id": job_id,
+        "brief_id": brief_id,
+        "platforms": list(contents),
+        "contents": contents,
+        "idempotency_key": idempotency_key or job_id,
+        "due_at": due_at.astimezone(timezone.utc),
+        "status": "pending",
+        "results": None
+    }
+
+
+class InMemoryScheduleStore:
+    """Heap-backed store for single-process demo runs (lost on restart)"""
+
+    durable = False
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._heap: List = []
+        self._lock = threading.Lock()
+
+    def add(self, job: Dict[str, Any]):
+        with self._lock:
+            self._jobs[job["id"]] = job
+            heapq.heappush(self._heap, (job["due_at"], job["id"]))
+
+    def claim_due(self, until: datetime, limit: int) -> List[Dict[str, Any]]:
+        claimed = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= until and len(claimed) < limit:
+                _, job_id = heapq.heappop(self._heap)
+                job = self._jobs.get(job_id)
+                if job and job["status"] == "pending":
+                    job["status"] = "dispatching"
+                    job["claimed_at"] = datetime.now(timezone.utc)
+                    claimed.append(dict(job))
+        return claimed
+
+    def next_due_at(self) -> Optional[datetime]:
+        with self._lock:
+            while self._heap and self._jobs[self._heap[0][1]]["status"] != "pending":
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def finish(self, job_id: str, status: str, results: List[Dict[str, Any]]):
+        with self._lock:
+            self._jobs[job_id].update(status=status, results=results)
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] != "pending":
+                return False
+            job["status"] = "cancelled"
+            return True
+
+    def list_pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted(
+                (dict(job) for job in self._jobs.values() if job["status"] == "pending"),
+                key=lambda job: job["due_at"]
+            )
+
+    def release(self, job_id: str):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "pending"
+            heapq.heappush(self._heap, (job["due_at"], job_id))
+
+    def release_stale(self, older_than: float) -> int:
+        """Return jobs whose dispatch never finished (e.g. finish failed) to pending"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than)
+        released = 0
+        with self._lock:
+            for job_id, job in self._jobs.items():
+                if job["status"] == "dispatching" and job["claimed_at"] < cutoff:
+                    job["status"] = "pending"
+                    heapq.heappush(self._heap, (job["due_at"], job_id))
+                    released += 1
+        return released
+
+
+class PostgresScheduleStore:
+    """scheduled_publishes table shared by all replicas"""
+
+    durable = True
+    TABLE_NAME = "scheduled_publishes"
+    COLUMNS = "id, brief_id, platforms, contents, idempotency_key, due_at, status, results"
+
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            import psycopg2
+            self._conn = psycopg2.connect(self.db_url, connect_timeout=5)
+            with self._conn, self._conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                        id TEXT PRIMARY KEY,
+                        brief_id TEXT NOT NULL,
+                        platforms JSONB NOT NULL,
+                        contents JSONB NOT NULL,
+                        idempotency_key TEXT NOT NULL,
+                        due_at TIMESTAMPTZ NOT NULL,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        claimed_at TIMESTAMPTZ,
+                        results JSONB,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                    )
+                    """
+                )
+                cur.execute(
+                    f"""
+                    CREATE INDEX IF NOT EXISTS {self.TABLE_NAME}_due_idx
+                    ON {self.TABLE_NAME} (due_at) WHERE status = 'pending'
+                    """
+                )
+        return self._conn
+
+    def _execute(self, query: str, params: tuple = (), fetch: bool = False):
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn, conn.cursor() as cur:
+                    cur.execute(query, params)
+                    if fetch:
+                        columns = [c.name for c in cur.description]
+                        return [dict(zip(columns, row)) for row in cur.fetchall()]
+                    return cur.rowcount
+            except Exception:
+                self._conn = None
+                raise
+
+    def add(self, job: Dict[str, Any]):
+        self._execute(
+            f"""
+            INSERT INTO {self.TABLE_NAME} (id, brief_id, platforms, contents, idempotency_key, due_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+            (
+                job["id"], job["brief_id"], json.dumps(job["platforms"]),
+                json.dumps(job["contents"], ensure_ascii=False), job["idempotency_key"], job["due_at"]
+            )
+        )
+
+    def claim_due(self, until: datetime, limit: int) -> List[Dict[str, Any]]:
+        return self._execute(
+            f"""
+            UPDATE {self.TABLE_NAME}
+            SET status = 'dispatching', claimed_at = now(), updated_at = now()
+            WHERE id IN (
+                SELECT id FROM {self.TABLE_NAME}
+                WHERE status = 'pending' AND due_at <= %s
+                ORDER BY due_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {self.COLUMNS}
+            """,
+            (until, limit),
+            fetch=True
+        )
+
+    def next_due_at(self) -> Optional[datetime]:
+        rows = self._execute(
+            f"SELECT min(due_at) AS due_at FROM {self.TABLE_NAME} WHERE status = 'pending'",
+            fetch=True
+        )
+        return rows[0]["due_at"] if rows else None
+
+    def finish(self, job_id: str, status: str, results: List[Dict[str, Any]]):
+        self._execute(
+            f"UPDATE {self.TABLE_NAME} SET status = %s, results = %s, updated_at = now() WHERE id = %s",
+            (status, json.dumps(results, ensure_ascii=False), job_id)
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        return self._execute(
+            f"""
+            UPDATE {self.TABLE_NAME} SET status = 'cancelled', updated_at = now()
+            WHERE id = %s AND status = 'pending'
+            """,
+            (job_id,)
+        ) > 0
+
+    def list_pending(self) -> List[Dict[str, Any]]:
+        return self._execute(
+            f"SELECT {self.COLUMNS} FROM {self.TABLE_NAME} WHERE status = 'pending' ORDER BY due_at",
+            fetch=True
+        )
+
+    def release(self, job_id: str):
+        """Return a claimed job to pending (dispatch interrupted by shutdown)"""
+        self._execute(
+            f"""
+            UPDATE {self.TABLE_NAME} SET status = 'pending', claimed_at = NULL, updated_at = now()
+            WHERE id = %s AND status = 'dispatching'
+            """,
+            (job_id,)
+        )
+
+    def release_stale(self, older_than: float) -> int:
+        """Return jobs claimed by a replica that never finished them to pending"""
+        return self._execute(
+            f"""
+            UPDATE {self.TABLE_NAME}
+            SET status = 'pending', claimed_at = NULL, updated_at = now()
+            WHERE status = 'dispatching' AND claimed_at < now() - make_interval(secs => %s)
+            """,
+            (older_than,)
+        )
+
+
+def create_schedule_store(db_url: Optional[str]):
+    """Postgres store when the database is reachable, in-memory otherwise"""
+    if db_url:
+        store = PostgresScheduleStore(db_url)
+        try:
+            store.next_due_at()
+            return store
+        except Exception as e:
+            logger.warning(f"Schedule store unavailable ({e}), scheduled publishes will not survive restarts")
+    return InMemoryScheduleStore()
+
+
+class PublishScheduler:
+    """
+    Dispatches scheduled publishes at (never before) their due time
+
+    Args:
+        store: Schedule store (built from SCHEDULER_CONFIG on start if None)
+        service: Publishing service used for dispatch
+        on_published: Called with (job, results) after each job is dispatched
+    """
+
+    def __init__(
+        self,
+        store=None,
+        service: Optional[PublishingService] = None,
+        on_published: Optional[Callable[[Dict[str, Any], List[Dict[str, Any]]], None]] = None
+    ):
+        self.store = store
+        self.service = service
+        self.on_published = on_published
+        self.poll_interval = SCHEDULER_CONFIG.get("poll_interval", 30.0)
+        self.batch_window = SCHEDULER_CONFIG.get("batch_window", 60.0)
+        self.batch_size = SCHEDULER_CONFIG.get("batch_size", 200)
+        self.jitter = SCHEDULER_CONFIG.get("jitter", 1.0)
+        self.claim_timeout = SCHEDULER_CONFIG.get("claim_timeout", 600.0)
+
+        self._next_slot: Dict[str, float] = {}  # platform -> earliest epoch second for its next post
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batches: set = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Open the store and start the dispatch loop"""
+        if self.store is None:
+            self.store = await asyncio.to_thread(create_schedule_store, SCHEDULER_CONFIG.get("db_url"))
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Publish scheduler started ({'durable' if self.store.durable else 'in-memory'} store)")
+
+    async def stop(self):
+        """Stop the loop; jobs waiting for their slot go back to pending"""
+        for task in [self._task, *self._batches]:
+            if task:
+                task.cancel()
+        await asyncio.gather(*filter(None, [self._task, *self._batches]), return_exceptions=True)
+
+    async def schedule(
+        self,
+        brief_id: str,
+        contents: Dict[str, Dict[str, Any]],
+        due_at: datetime,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Persist a publish for due_at and wake the loop if it is the next one"""
+        job = _new_job(brief_id, contents, due_at, idempotency_key)
+        await asyncio.to_thread(self.store.add, job)
+        if self._wakeup:
+            self._wakeup.set()
+        logger.info(f"Scheduled {job['id']} for {brief_id} at {job['due_at'].isoformat()}")
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        return await asyncio.to_thread(self.store.cancel, job_id)
+
+    async def list_pending(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.list_pending)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                # Every pass, not just at start-up: replicas that died and
+                # dispatches that failed mid-way leave claims behind at any time
+                released = await asyncio.to_thread(self.store.release_stale, self.claim_timeout)
+                if released:
+                    logger.warning(f"Re-queued {released} scheduled publishes unfinished after {self.claim_timeout:.0f}s")
+
+                now = datetime.now(timezone.utc)
+                jobs = await asyncio.to_thread(
+                    self.store.claim_due, now + timedelta(seconds=self.batch_window), self.batch_size
+                )
+                if jobs:
+                    batch = asyncio.create_task(self._dispatch_batch(jobs))
+                    self._batches.add(batch)
+                    batch.add_done_callback(self._batches.discard)
+                    if len(jobs) == self.batch_size:
+                        continue  # more may be due right now
+
+                next_due = await asyncio.to_thread(self.store.next_due_at)
+            except Exception as e:
+                logger.error(f"Publish scheduler error: {e}", exc_info=True)
+                next_due = None
+
+            sleep = self.poll_interval
+            if next_due is not None:
+                until_batch = (next_due - datetime.now(timezone.utc)).total_seconds() - self.batch_window
+                sleep = min(self.poll_interval, max(0.0, until_batch))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep)
+            except asyncio.TimeoutError:
+                pass
+
+    def _assign_slots(self, jobs: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        """Epoch second at which each (job, platform) post goes out"""
+        slots = {}
+        for job in sorted(jobs, key=lambda j: j["due_at"]):
+            due = job["due_at"].timestamp()
+            slots[job["id"]] = {}
+            for platform in job["platforms"]:
+                slot = max(due, self._next_slot.get(platform, 0.0)) + random.uniform(0, self.jitter)
+                slots[job["id"]][platform] = slot
+                self._next_slot[platform] = slot + PLATFORM_CONFIG.get(platform, {}).get("min_post_interval", 0.0)
+        return slots
+
+    async def _dispatch_batch(self, jobs: List[Dict[str, Any]]):
+        slots = self._assign_slots(jobs)
+        logger.info(f"Dispatching batch of {len(jobs)} scheduled publishes")
+        await asyncio.gather(*(self._dispatch_job(job, slots[job["id"]]) for job in jobs))
+
+    async def _publish_at(self, when: float, platform: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(max(0.0, when - time.time()))
+        service = self.service or get_publishing_service()
+        return await service.publish(platform, job["contents"][platform], f"{job['idempotency_key']}:{platform}")
+
+    async def _dispatch_job(self, job: Dict[str, Any], slots: Dict[str, float]):
+        try:
+            results = list(await asyncio.gather(*(
+                self._publish_at(slots[platform], platform, job) for platform in job["platforms"]
+            )))
+            failed = sum(1 for r in results if r["status"] == "failed")
+            status = "published" if not failed else "failed" if failed == len(results) else "partially_failed"
+            await asyncio.to_thread(self.store.finish, job["id"], status, results)
+        except asyncio.CancelledError:
+            # Shutting down: let another replica (or the next start) dispatch it
+            await asyncio.to_thread(self.store.release, job["id"])
+            raise
+        except Exception as e:
+            # Left as dispatching; release_stale re-queues it after claim_timeout
+            logger.error(f"Scheduled publish {job['id']} failed: {e}", exc_info=True)
+            return
+
+        logger.info(f"Scheduled publish {job['id']} ({job['brief_id']}): {status}")
+        if self.on_published:
+            try:
+                self.on_published(job, results)
+            except Exception as e:
+                logger.error(f"on_published callback failed: {e}")
@@ -0,0 +1,246 @@
+"""
+Publishing Service - Concurrent fan-out of one piece of content to many platforms
+
+All publishers share one pooled httpx.AsyncClient, and a multi-platform
+publish runs every platform concurrently, so its latency is that of the
+slowest platform rather than the sum. Each platform gets its own retry
+policy (jittered exponential backoff on timeouts, connection errors, 429 and
+5xx) and an overall timeout, and one platform failing never fails the others.
+
+Idempotency: every (brief, platform, caption) maps to a stable key that is
+sent as the Idempotency-Key header. A publish that already succeeded in
+this process is answered from cache, and a duplicate arriving while the
+first one is still running waits for it instead of posting twice.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from agents.tracing import span
+from .base import PlatformPublisher, PublishError, build_caption
+from .platforms import PUBLISHERS
+
+try:
+    from ..config.platforms import PLATFORM_CONFIG, PUBLISH_MODE, PUBLISHER_HTTP_CONFIG
+except ImportError:
+    try:
+        from config.platforms import PLATFORM_CONFIG, PUBLISH_MODE, PUBLISHER_HTTP_CONFIG
+    except ImportError:
+        PLATFORM_CONFIG = {}
+        PUBLISH_MODE = "mock"
+        PUBLISHER_HTTP_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+
+def make_idempotency_key(brief_id: str, platform: str, content: Dict[str, Any]) -> str:
+    """Stable key for publishing this content for this brief on this platform"""
+    digest = hashlib.sha256(f"{brief_id}\x00{platform}\x00{build_caption(content)}".encode()).hexdigest()
+    return f"{platform}-{digest[:32]}"
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, PublishError) and error.retryable
+
+
+class PublishingService:
+    """
+    Publishes content to platforms through pooled, concurrent HTTP calls
+
+    Args:
+        mode: "live" calls the platform APIs, "mock" returns fake posts
+        platform_config: Per-platform URLs, credentials, timeouts and retries
+        transport: Optional httpx transport (tests, stubs)
+        max_cached_results: Successful publishes remembered for idempotency
+    """
+
+    def __init__(
+        self,
+        mode: str = PUBLISH_MODE,
+        platform_config: Optional[Dict[str, Dict[str, Any]]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_cached_results: int = 5000
+    ):
+        self.mode = mode
+        self.platform_config = platform_config if platform_config is not None else PLATFORM_CONFIG
+        self.max_cached_results = max_cached_results
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._publishers: Dict[str, PlatformPublisher] = {}
+        self._completed: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared connection pool (created on first use)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=PUBLISHER_HTTP_CONFIG.get("max_connections", 50),
+                    max_keepalive_connections=PUBLISHER_HTTP_CONFIG.get("max_keepalive_connections", 20),
+                    keepalive_expiry=PUBLISHER_HTTP_CONFIG.get("keepalive_expiry", 30.0)
+                ),
+                timeout=httpx.Timeout(10.0, connect=PUBLISHER_HTTP_CONFIG.get("connect_timeout", 5.0))
+            )
+        return self._client
+
+    def publisher(self, platform: str) -> PlatformPublisher:
+        if platform not in self._publishers:
+            if platform not in PUBLISHERS or platform not in self.platform_config:
+                raise PublishError(f"Unsupported platform: {platform}")
+            self._publishers[platform] = PUBLISHERS[platform](self.client, self.platform_config[platform])
+        return self._publishers[platform]
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._publishers.clear()
+
+    async def publish_all(
+        self,
+        brief_id: str,
+        contents: Dict[str, Dict[str, Any]],
+        idempotency_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Publish to every platform concurrently
+
+        Args:
+            brief_id: Brief the content belongs to
+            contents: platform -> content (body, hashtags, call_to_action, media_url)
+            idempotency_key: Caller-supplied key; derived from the content if omitted
+
+        Returns:
+            One result per platform, in the order of contents
+        """
+        return list(await asyncio.gather(*(
+            self.publish(
+                platform,
+                content,
+                f"{idempotency_key}:{platform}" if idempotency_key
+                else make_idempotency_key(brief_id, platform, content)
+            )
+            for platform, content in contents.items()
+        )))
+
+    async def publish(self, platform: str, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        """Publish to one platform (failures are returned as results, not raised)"""
+        if idempotency_key in self._completed:
+            return {**self._completed[idempotency_key], "deduplicated": True}
+        if idempotency_key in self._in_flight:
+            result = await asyncio.shield(self._in_flight[idempotency_key])
+            return {**result, "deduplicated": True}
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[idempotency_key] = future
+        try:
+            result = await self._publish_once(platform, content, idempotency_key)
+            if result["status"] != "failed":
+                self._completed[idempotency_key] = result
+                if len(self._completed) > self.max_cached_results:
+                    self._completed.popitem(last=False)
+            future.set_result(result)
+            return result
+        except BaseException:
+            # Cancellation (failures are results); duplicates waiting on us see it too
+            future.cancel()
+            raise
+        finally:
+            del self._in_flight[idempotency_key]
+
+    async def _publish_once(self, platform: str, content: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        attempts = 0
+        result = {"platform": platform, "idempotency_key": idempotency_key}
+
+        with span("publisher.publish", platform=platform, mode=self.mode) as publish_span:
+            try:
+                if platform not in PUBLISHERS:
+                    raise PublishError(f"Unsupported platform: {platform}")
+                if self.mode != "live":
+                    post = self._mock_post(platform)
+                else:
+                    publisher = self.publisher(platform)
+                    config = self.platform_config[platform]
+
+                    async def attempt_publish():
+                        nonlocal attempts
+                        retrying = AsyncRetrying(
+                            stop=stop_after_attempt(config.get("max_attempts", 3)),
+                            wait=wait_random_exponential(multiplier=0.5, max=8.0),
+                            retry=retry_if_exception(_is_retryable),
+                            reraise=True
+                        )
+                        async for attempt in retrying:
+                            with attempt:
+                                attempts = attempt.retry_state.attempt_number
+                                return await publisher.publish(content, idempotency_key)
+
+                    post = await asyncio.wait_for(attempt_publish(), timeout=config.get("timeout", 30.0))
+
+                result.update({
+                    "status": post.get("status", "published"),
+                    "post_id": post["post_id"],
+                    "url": post.get("url")
+                })
+            except asyncio.TimeoutError:
+                result.update({"status": "failed", "error": f"Timed out after {self.platform_config[platform].get('timeout')}s"})
+            except (PublishError, httpx.HTTPError) as e:
+                result.update({"status": "failed", "error": str(e)})
+            except Exception as e:
+                # An adapter bug or an unforeseen response must not fail the
+                # other platforms of publish_all
+                logger.exception(f"Unexpected error publishing to {platform}")
+                result.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+            result["attempts"] = attempts or 1
+            result["latency_seconds"] = round(time.perf_counter() - started, 4)
+            publish_span.set_attribute("publish.status", result["status"])
+            publish_span.set_attribute("publish.attempts", result["attempts"])
+
+        if result["status"] == "failed":
+            logger.error(f"Failed to publish to {platform}: {result['error']}")
+        else:
+            logger.info(f"Published to {platform}: {result['post_id']} ({result['latency_seconds']:.2f}s)")
+        return result
+
+    @staticmethod
+    def _mock_post(platform: str) -> Dict[str, Any]:
+        return {
+            "post_id": f"{platform}_{datetime.now().timestamp()}",
+            "url": f"https://{platform}.com/post/mock_id"
+        }
+
+
+_service: Optional[PublishingService] = None
+_service_lock = threading.Lock()
+
+
+def get_publishing_service() -> PublishingService:
+    """Get the process-wide service built from PLATFORM_CONFIG"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PublishingService()
+        return _service
+
+
+def set_publishing_service(service: Optional[PublishingService]):
+    """Replace the process-wide service (None rebuilds it from config on next use)"""
+    global _service
+    with _service_lock:
+        _service = service
@@ -0,0 +1,93 @@
+"""
+Local stub of the platform posting APIs for testing the publishers
+
+Serves every platform under its own prefix, so point the publishers at it
+with, for example:
+
+    uvicorn publishers.stub_server:app --port 9100
+    PUBLISH_MODE=live \\
+    FACEBOOK_API_URL=http://localhost:9100/facebook \\
+    INSTAGRAM_API_URL=http://localhost:9100/instagram \\
+    TIKTOK_API_URL=http://localhost:9100/tiktok \\
+    SHOPEE_API_URL=http://localhost:9100/shopee \\
+    uvicorn main:app --port 8080
+
+Tunables (environment):
+    STUB_LATENCY       Seconds per request, or per-platform "facebook=0.2,tiktok=1.5"
+    STUB_FAILURE_RATE  Fraction of requests answered with 503 (retried by the publishers)
+
+Repeated requests with the same Idempotency-Key return the original post.
+"""
+
+from typing import Dict, Optional
+import asyncio
+import os
+import random
+import uuid
+
+from fastapi import FastAPI, Header, HTTPException, Request
+
+app = FastAPI(title="Platform API stub")
+
+_posts: Dict[str, Dict] = {}
+
+
+def _latency(platform: str) -> float:
+    setting = os.getenv("STUB_LATENCY", "0.1")
+    if "=" not in setting:
+        return float(setting)
+    per_platform = dict(item.split("=", 1) for item in setting.split(","))
+    return float(per_platform.get(platform, 0.1))
+
+
+async def _handle(platform: str, idempotency_key: Optional[str], payload: Dict) -> Dict:
+    await asyncio.sleep(_latency(platform))
+    if random.random() < float(os.getenv("STUB_FAILURE_RATE", "0")):
+        raise HTTPException(status_code=503, detail="Injected stub failure")
+
+    key = f"{platform}:{idempotency_key}" if idempotency_key else None
+    if key and key in _posts:
+        return _posts[key]
+
+    post = {"id": f"{platform}_{uuid.uuid4().hex[:12]}", "payload": payload}
+    if key:
+        _posts[key] = post
+    return post
+
+
+@app.post("/facebook/{page_id}/feed")
+async def facebook_feed(page_id: str, request: Request, idempotency_key: Optional[str] = Header(None)):
+    post = await _handle("facebook", idempotency_key, dict(await request.form()))
+    return {"id": post["id"]}
+
+
+@app.post("/instagram/{user_id}/media")
+async def instagram_media(user_id: str, request: Request, idempotency_key: Optional[str] = Header(None)):
+    post = await _handle("instagram", idempotency_key, dict(await request.form()))
+    return {"id": post["id"]}
+
+
+@app.post("/instagram/{user_id}/media_publish")
+async def instagram_publish(user_id: str, request: Request, idempotency_key: Optional[str] = Header(None)):
+    post = await _handle("instagram", idempotency_key, dict(await request.form()))
+    return {"id": post["id"]}
+
+
+@app.post("/tiktok/v2/post/publish/content/init/")
+async def tiktok_content_init(request: Request, idempotency_key: Optional[str] = Header(None)):
+    post = await _handle("tiktok", idempotency_key, await request.json())
+    return {"data": {"publish_id": post["id"]}, "error": {"code": "ok", "message": ""}}
+
+
+@app.post("/shopee/{path:path}")
+async def shopee_post(path: str, request: Request, idempotency_key: Optional[str] = Header(None)):
+    if "sign" not in request.query_params:
+        return {"error": "error_sign", "message": "Missing signature"}
+    post = await _handle("shopee", idempotency_key, await request.json())
+    return {"error": "", "message": "", "response": {"post_id": post["id"]}}
+
+
+@app.get("/posts")
+async def list_posts():
+    """Everything published so far (for assertions)"""
+    return {"count": len(_posts), "posts": _posts}
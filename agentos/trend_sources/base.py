@@ -0,0 +1,59 @@
+"""
+Base class for trend sources
+
+A source returns one region's trending hashtags in the TickerTrends shape
+(hashtag, views, posts, engagement_rate, growth_rate, category, keywords,
+trending_since); fields it does not know are left out and filled in from
+other sources by TrendSourceService. Timeouts, concurrency and merging are
+handled by the service.
+
+Sources are read page by page (pages()); a source whose upstream has no
+paging only implements fetch(), and its result is served in page_size
+chunks.
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+
+
+class TrendSourceError(RuntimeError):
+    """A source could not deliver trends"""
+
+
+class TrendSource:
+    """
+    One upstream of trend data
+
+    Args:
+        config: The source's entry in TREND_SOURCES_CONFIG
+    """
+
+    name = ""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.timeout = config.get("timeout", 10.0)
+
+    async def fetch(self, region: str, limit: int, time_range: str) -> List[Dict[str, Any]]:
+        """
+        Trending hashtags for a region
+
+        Args:
+            region: Country code (VN, TH, ...)
+            limit: Maximum number of trends
+            time_range: 24h, 7d or 30d
+
+        Returns:
+            Trends, most popular first
+        """
+        raise NotImplementedError
+
+    async def pages(self, region: str, limit: int, time_range: str, page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Trending hashtags for a region, page_size at a time as they arrive
+
+        Yields:
+            Non-empty pages of trends, at most limit trends in total
+        """
+        trends = await self.fetch(region, limit, time_range)
+        for start in range(0, min(len(trends), limit), page_size):
+            yield trends[start:min(start + page_size, limit)]
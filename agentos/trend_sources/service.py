@@ -0,0 +1,229 @@
+"""
+Trend Source Service - Concurrent fetch and merge of all configured sources
+
+For one region, every source is read concurrently and independently, page
+by page, each page under the source's own timeout; a source that is slow
+or fails is logged and left out from then on, and only a fetch where every
+source failed before delivering anything is an error.
+
+Results are merged by hashtag_key (#ĂnVặt, #AnVat and #anvat are one
+trend). Sources are ranked in configuration order: the first source to
+report a field wins, later sources fill in fields it lacks (a Creative
+Center export has views/posts but no engagement or growth), keywords are
+unioned, and every merged trend lists its sources.
+
+iter_pages() streams merged trends as the sources' pages arrive, so callers
+can score one page while later ones are in flight. Sources list trends most
+viewed first, so a hashtag is held back only until every still-active
+source has either reported it or moved past its view count (or ended);
+then no report can still come and it is yielded, fully merged, once. A
+slow source therefore only holds back the trends it may still report.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+import asyncio
+import logging
+
+from agents.tracing import span
+from agents.vietnamese_text import hashtag_key, nfc
+from .base import TrendSource, TrendSourceError
+from .sources import SOURCES, TickerTrendsSource
+
+try:
+    from ..config.trends import TREND_SOURCES_CONFIG
+except ImportError:
+    try:
+        from config.trends import TREND_SOURCES_CONFIG
+    except ImportError:
+        TREND_SOURCES_CONFIG = {"sources": ["fixture"]}
+
+logger = logging.getLogger(__name__)
+
+
+def merge_trends(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Merge per-source trend lists (highest-priority source first)
+
+    Returns:
+        One trend per hashtag_key, in first-seen order
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for trends in results:
+        for trend in trends:
+            key = hashtag_key(trend.get("hashtag", ""))
+            if not key:
+                continue
+            target = merged.get(key)
+            if target is None:
+                target = merged[key] = {**trend, "hashtag": nfc(trend["hashtag"]), "keywords": [], "sources": []}
+            else:
+                for field, value in trend.items():
+                    if value not in (None, "", 0) and target.get(field) in (None, "", 0):
+                        target[field] = value
+            for keyword in trend.get("keywords", []):
+                if keyword not in target["keywords"]:
+                    target["keywords"].append(keyword)
+            for source in trend.get("sources", []):
+                if source not in target["sources"]:
+                    target["sources"].append(source)
+    return list(merged.values())
+
+
+class TrendSourceService:
+    """
+    Fetches trends from several sources at once
+
+    Args:
+        sources: Source names in priority order (default TREND_SOURCES_CONFIG)
+        config: Per-source settings (default TREND_SOURCES_CONFIG)
+        tickertrends_api_key: API key for the TickerTrends source
+    """
+
+    def __init__(
+        self,
+        sources: Optional[List[str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        tickertrends_api_key: Optional[str] = None
+    ):
+        config = TREND_SOURCES_CONFIG if config is None else config
+        self.sources: List[TrendSource] = []
+        for name in sources or config.get("sources", ["fixture"]):
+            source_class = SOURCES.get(name)
+            if source_class is None:
+                raise ValueError(f"Unknown trend source: {name} (available: {', '.join(SOURCES)})")
+            source_config = config.get(name, {})
+            if source_class is TickerTrendsSource:
+                self.sources.append(source_class(source_config, api_key=tickertrends_api_key))
+            else:
+                self.sources.append(source_class(source_config))
+
+    async def _next_page(self, source: TrendSource, pages: AsyncIterator, region: str, page: int) -> List[Dict]:
+        with span("trend_source.fetch", source=source.name, region=region, page=page) as fetch_span:
+            trends = await asyncio.wait_for(pages.__anext__(), timeout=source.timeout)
+            fetch_span.set_attribute("trend.count", len(trends))
+        return [{**trend, "sources": [source.name]} for trend in trends]
+
+    async def _pump(self, index: int, source: TrendSource, pages: AsyncIterator, region: str, arrived: asyncio.Queue):
+        """Feed one source's pages into arrived, then None (done) or its error"""
+        page_number = 0
+        try:
+            while True:
+                try:
+                    trends = await self._next_page(source, pages, region, page_number)
+                except StopAsyncIteration:
+                    break
+                page_number += 1
+                await arrived.put((index, trends))
+            await arrived.put((index, None))
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = TrendSourceError(f"timed out after {source.timeout}s")
+            await arrived.put((index, e))
+        finally:
+            await pages.aclose()
+
+    async def iter_pages(
+        self,
+        region: str = "VN",
+        limit: int = 50,
+        time_range: str = "24h",
+        page_size: int = 100
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Merged trends of every source for a region, as they settle
+
+        Yields:
+            Pages of up to page_size merged trends (each with its sources),
+            each hashtag once, at most limit trends in total
+
+        Raises:
+            TrendSourceError: Every source failed before delivering anything
+        """
+        arrived: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(
+                self._pump(index, source, source.pages(region, limit, time_range, page_size), region, arrived)
+            )
+            for index, source in enumerate(self.sources)
+        ]
+        active = set(range(len(self.sources)))
+        # Views of the last trend each source delivered (its streams are
+        # most viewed first, so it cannot report anything above this any more)
+        floors = [float("inf")] * len(self.sources)
+        # hashtag_key -> each source's report, in priority order
+        pending: Dict[str, List[Optional[Dict[str, Any]]]] = {}
+        emitted: Set[str] = set()
+        errors = []
+        delivered = False
+
+        def settled(reports: List[Optional[Dict[str, Any]]]) -> bool:
+            views = max(report.get("views", 0) for report in reports if report is not None)
+            return all(
+                index not in active or reports[index] is not None or floors[index] <= views
+                for index in range(len(reports))
+            )
+
+        def release(keys: List[str]) -> List[List[Dict[str, Any]]]:
+            trends = merge_trends([[report for report in pending.pop(key) if report is not None] for key in keys])
+            trends.sort(key=lambda trend: trend.get("views", 0), reverse=True)
+            trends = trends[:limit - len(emitted)]
+            emitted.update(hashtag_key(trend["hashtag"]) for trend in trends)
+            return [trends[start:start + page_size] for start in range(0, len(trends), page_size)]
+
+        try:
+            while active and len(emitted) < limit:
+                index, result = await arrived.get()
+                source = self.sources[index]
+                if result is None:
+                    active.discard(index)
+                    delivered = True
+                elif isinstance(result, Exception):
+                    active.discard(index)
+                    logger.warning(f"Trend source {source.name} failed for region {region}: {result}")
+                    errors.append(f"{source.name}: {result}")
+                else:
+                    delivered = True
+                    for trend in result:
+                        key = hashtag_key(trend.get("hashtag", ""))
+                        if not key or key in emitted:
+                            continue
+                        reports = pending.setdefault(key, [None] * len(self.sources))
+                        if reports[index] is None:
+                            reports[index] = trend
+                        floors[index] = min(floors[index], trend.get("views", 0))
+
+                if errors and not delivered and not active:
+                    raise TrendSourceError(f"Every trend source failed for region {region} ({'; '.join(errors)})")
+
+                ready = [key for key, reports in pending.items() if settled(reports)]
+                for page in release(ready):
+                    yield page
+
+            # Every source ended: whatever is left has all the reports it will get
+            if len(emitted) < limit:
+                for page in release(list(pending)):
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch(self, region: str = "VN", limit: int = 50, time_range: str = "24h") -> List[Dict[str, Any]]:
+        """
+        Merged trends of every source for a region
+
+        Returns:
+            Up to limit trends, most viewed first, each with its sources
+
+        Raises:
+            TrendSourceError: Every source failed
+        """
+        trends = []
+        async for page in self.iter_pages(region, limit, time_range, page_size=limit):
+            trends.extend(page)
+        trends.sort(key=lambda trend: trend.get("views", 0), reverse=True)
+        return trends
+
+    def fetch_sync(self, region: str = "VN", limit: int = 50, time_range: str = "24h") -> List[Dict[str, Any]]:
+        """fetch() for blocking callers (TrendMonitor runs in a worker thread)"""
+        return asyncio.run(self.fetch(region, limit, time_range))
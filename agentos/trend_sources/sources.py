@@ -0,0 +1,251 @@
+"""
+Trend sources - TickerTrends API, TikTok Creative Center exports, fixtures
+
+Every adapter maps its upstream onto the TickerTrends trend shape. The
+TickerTrends base URL comes from TREND_SOURCES_CONFIG, so it can be pointed
+at the local stub server (trend_sources/stub_server.py) for testing.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import csv
+import glob
+import json
+import os
+import re
+import threading
+
+import httpx
+
+from .base import TrendSource, TrendSourceError
+
+# Served by FixtureSource when no fixture file is configured
+SAMPLE_TRENDS = [
+    {
+        "hashtag": "#ReviewSảnPhẩm",
+        "views": 125000000,
+        "posts": 45200,
+        "engagement_rate": 8.5,
+        "growth_rate": 245,  # percentage growth in 24h
+        "category": "product_reviews",
+        "keywords": ["đánh giá", "review", "mua sắm", "shopping"],
+        "trending_since": "2025-11-23T10:00:00Z"
+    },
+    {
+        "hashtag": "#TikTokShop",
+        "views": 890000000,
+        "posts": 125000,
+        "engagement_rate": 12.3,
+        "growth_rate": 180,
+        "category": "ecommerce",
+        "keywords": ["tiktok shop", "mua hàng", "giảm giá", "khuyến mãi"],
+        "trending_since": "2025-11-22T08:00:00Z"
+    },
+    {
+        "hashtag": "#BeautyHacks",
+        "views": 67000000,
+        "posts": 23400,
+        "engagement_rate": 9.2,
+        "growth_rate": 320,
+        "category": "beauty",
+        "keywords": ["làm đẹp", "beauty", "skincare", "makeup"],
+        "trending_since": "2025-11-24T06:00:00Z"
+    },
+    {
+        "hashtag": "#TechViệtNam",
+        "views": 45000000,
+        "posts": 12800,
+        "engagement_rate": 7.8,
+        "growth_rate": 156,
+        "category": "technology",
+        "keywords": ["công nghệ", "tech", "điện thoại", "gadget"],
+        "trending_since": "2025-11-23T14:00:00Z"
+    },
+    {
+        "hashtag": "#ĂnVặt",
+        "views": 234000000,
+        "posts": 67800,
+        "engagement_rate": 15.6,
+        "growth_rate": 410,
+        "category": "food",
+        "keywords": ["đồ ăn vặt", "snack", "food", "ẩm thực"],
+        "trending_since": "2025-11-24T09:00:00Z"
+    }
+]
+
+
+class TickerTrendsSource(TrendSource):
+    """
+    TickerTrends REST API (GET /v1/trends)
+
+    Paged with a cursor: each response carries next_cursor until the last
+    page, so large limits are streamed instead of fetched in one response.
+    """
+
+    name = "tickertrends"
+
+    def __init__(self, config: Dict[str, Any], api_key: Optional[str] = None):
+        super().__init__(config)
+        self.api_key = api_key or config.get("api_key")
+        self.base_url = config["base_url"].rstrip("/")
+        self.max_page_size = config.get("max_page_size", 100)
+
+    async def fetch(self, region: str, limit: int, time_range: str) -> List[Dict[str, Any]]:
+        trends = []
+        async for page in self.pages(region, limit, time_range, self.max_page_size):
+            trends.extend(page)
+        return trends
+
+    async def pages(self, region: str, limit: int, time_range: str, page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        if not self.api_key:
+            raise TrendSourceError("TickerTrends API key is not configured")
+
+        page_size = min(page_size, self.max_page_size)
+        cursor = None
+        remaining = limit
+        # One client per iteration: each scan runs on its own event loop
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            while remaining > 0:
+                params = {"region": region, "limit": min(page_size, remaining), "time_range": time_range}
+                if cursor:
+                    params["cursor"] = cursor
+                response = await client.get(
+                    f"{self.base_url}/v1/trends",
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                    params=params
+                )
+                if response.status_code != 200:
+                    raise TrendSourceError(f"TickerTrends returned {response.status_code}")
+                body = response.json()
+                page = body["data"][:remaining]
+                if page:
+                    yield page
+                remaining -= len(page)
+                cursor = body.get("next_cursor")
+                if not cursor or not page:
+                    return
+
+
+# Creative Center column names (lowercased) -> trend fields
+_EXPORT_COLUMNS = {
+    "hashtag": "hashtag",
+    "hashtag_name": "hashtag",
+    "views": "views",
+    "video_views": "views",
+    "posts": "posts",
+    "publish_cnt": "posts",
+    "post_count": "posts",
+    "industry": "category",
+    "industry_name": "category",
+    "category": "category"
+}
+_COUNT = re.compile(r"^([\d.]+)\s*([KMB]?)$", re.IGNORECASE)
+_COUNT_SCALE = {"": 1, "k": 10**3, "m": 10**6, "b": 10**9}
+
+
+def _count(value: Any) -> int:
+    """Export counts as ints: 1234, "1,234", "1.2M" """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _COUNT.match(str(value).replace(",", "").strip())
+    if not match:
+        return 0
+    return int(float(match.group(1)) * _COUNT_SCALE[match.group(2).lower()])
+
+
+class CreativeCenterExportSource(TrendSource):
+    """
+    TikTok Creative Center trending-hashtag exports dropped into export_dir
+
+    The newest .csv/.json file whose name contains the region code as a
+    separate token (trending_id.csv, id-2025-11.json; not video.csv) is
+    read; parsed files are cached until their modification time changes.
+    """
+
+    name = "creative_center"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.export_dir = config["export_dir"]
+        self._cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _latest_export(self, region: str) -> Optional[str]:
+        token = re.compile(rf"(^|[\s_\-.]){re.escape(region)}([\s_\-.]|$)", re.IGNORECASE)
+        paths = [
+            path
+            for pattern in ("*.csv", "*.json")
+            for path in glob.glob(os.path.join(self.export_dir, pattern))
+            if token.search(os.path.basename(path))
+        ]
+        return max(paths, key=os.path.getmtime) if paths else None
+
+    def _parse(self, path: str) -> List[Dict[str, Any]]:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = json.load(f) if path.endswith(".json") else list(csv.DictReader(f))
+
+        trends = []
+        for row in rows:
+            trend = {}
+            for column, value in row.items():
+                field = _EXPORT_COLUMNS.get(str(column).strip().lower())
+                if field and value not in (None, ""):
+                    trend[field] = _count(value) if field in ("views", "posts") else str(value).strip()
+            if trend.get("hashtag"):
+                if not trend["hashtag"].startswith("#"):
+                    trend["hashtag"] = f"#{trend['hashtag']}"
+                trends.append(trend)
+        trends.sort(key=lambda trend: trend.get("views", 0), reverse=True)
+        return trends
+
+    def _load(self, region: str) -> List[Dict[str, Any]]:
+        path = self._latest_export(region)
+        if path is None:
+            return []
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            trends = self._parse(path)
+        except (OSError, ValueError, csv.Error) as e:
+            raise TrendSourceError(f"Unreadable Creative Center export {path}: {e}") from e
+        with self._lock:
+            self._cache[path] = (mtime, trends)
+        return trends
+
+    async def fetch(self, region: str, limit: int, time_range: str) -> List[Dict[str, Any]]:
+        return (await asyncio.to_thread(self._load, region))[:limit]
+
+
+class FixtureSource(TrendSource):
+    """Fixed trends for demos and offline runs: a JSON file, or SAMPLE_TRENDS"""
+
+    name = "fixture"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.path = config.get("path")
+
+    async def fetch(self, region: str, limit: int, time_range: str) -> List[Dict[str, Any]]:
+        if not self.path:
+            return [dict(trend) for trend in SAMPLE_TRENDS[:limit]]
+        data = await asyncio.to_thread(self._read)
+        # A list, or {region: [...]}
+        trends = data.get(region, []) if isinstance(data, dict) else data
+        return trends[:limit]
+
+    def _read(self) -> Any:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise TrendSourceError(f"Unreadable trend fixture {self.path}: {e}") from e
+
+
+SOURCES = {
+    source.name: source
+    for source in (TickerTrendsSource, CreativeCenterExportSource, FixtureSource)
+}
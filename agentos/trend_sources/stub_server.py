@@ -0,0 +1,87 @@
+"""
+Local stub of the TickerTrends API for testing the trend sources
+
+Serves GET /v1/trends with synthetic trends in the TickerTrends shape,
+paged with a cursor (next_cursor is set until the last page).
+Point the TickerTrends source at it with, for example:
+
+    uvicorn trend_sources.stub_server:app --port 9200
+    TREND_SOURCES=tickertrends,fixture \\
+    TICKERTRENDS_API_URL=http://localhost:9200 \\
+    uvicorn main:app --port 8080
+
+Tunables (environment):
+    STUB_LATENCY       Seconds per request, or per-region "VN=0.2,TH=3"
+    STUB_FAILURE_RATE  Fraction of requests answered with 503
+    STUB_TOTAL         Trends per region and time range (default 5000)
+
+Data is deterministic per region and time range, with views drifting
+upward between calls so repeated scans see growth.
+"""
+
+from typing import Optional
+import asyncio
+import os
+import random
+import time
+
+from fastapi import FastAPI, Header, HTTPException
+
+from .sources import SAMPLE_TRENDS
+
+app = FastAPI(title="TickerTrends API stub")
+
+_started = time.time()
+
+_KEYWORDS = ["làm đẹp", "mua sắm", "giảm giá", "review", "ăn vặt", "công nghệ", "thời trang", "khuyến mãi"]
+_CATEGORIES = ["beauty", "fashion", "food", "electronics", "ecommerce", "product_reviews"]
+
+
+def _latency(region: str) -> float:
+    setting = os.getenv("STUB_LATENCY", "0.1")
+    if "=" not in setting:
+        return float(setting)
+    per_region = dict(item.split("=", 1) for item in setting.split(","))
+    return float(per_region.get(region, 0.1))
+
+
+def _trend(region: str, time_range: str, index: int) -> dict:
+    if index < len(SAMPLE_TRENDS):
+        return dict(SAMPLE_TRENDS[index])
+    rng = random.Random(f"{region}:{time_range}:{index}")
+    return {
+        "hashtag": f"#{region}Trend{index:05d}",
+        "views": rng.randint(1_000_000, 900_000_000),
+        "posts": rng.randint(1_000, 150_000),
+        "engagement_rate": round(rng.uniform(3, 18), 1),
+        "growth_rate": rng.randint(50, 450),
+        "category": rng.choice(_CATEGORIES),
+        "keywords": rng.sample(_KEYWORDS, 4),
+        "trending_since": "2025-11-24T06:00:00Z"
+    }
+
+
+@app.get("/v1/trends")
+async def trends(
+    region: str = "VN",
+    limit: int = 50,
+    time_range: str = "24h",
+    cursor: Optional[str] = None,
+    authorization: Optional[str] = Header(default=None)
+):
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing API key")
+
+    await asyncio.sleep(_latency(region))
+    if random.random() < float(os.getenv("STUB_FAILURE_RATE", "0")):
+        raise HTTPException(status_code=503, detail="Stub failure")
+
+    total = int(os.getenv("STUB_TOTAL", "5000"))
+    start = int(cursor or 0)
+    end = min(start + min(limit, 100), total)
+    # Views grow ~2% per hour since the stub started
+    drift = 1.02 ** ((time.time() - _started) / 3600)
+    data = [_trend(region, time_range, index) for index in range(start, end)]
+    for trend in data:
+        trend["views"] = int(trend["views"] * drift)
+    return {"data": data, "next_cursor": str(end) if end < total else None}
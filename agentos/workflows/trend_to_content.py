@@ -13,8 +13,14 @@ from agno import Team
 from agno.models.anthropic import Claude
 from agents.trend_monitor import TrendMonitor
 from agents.content_strategist import ContentStrategist
-from typing import List, Dict
+from agents.cost_accounting import cost_scope, get_cost_ledger
+from agents.lazy import LazyResource
+from agents.scan_checkpoint import get_scan_checkpoint
+from agents.tracing import span
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 import logging
+import time
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +36,9 @@ class TrendToContentWorkflow:
         """
         Initialize workflow with required agents
 
+        Agents are built lazily on first use (or by warm_up), so constructing
+        the workflow itself does not touch the database or the GLM API.
+
         Args:
             db_url: PostgreSQL database URL
             tickertrends_api_key: TickerTrends API key for trend monitoring
@@ -37,156 +46,292 @@ class TrendToContentWorkflow:
         self.db_url = db_url
         self.tickertrends_api_key = tickertrends_api_key
 
-        # Initialize agents
-        logger.info("Initializing agents...")
-
-        self.trend_monitor = TrendMonitor(
-            db_url=db_url,
-            tickertrends_api_key=tickertrends_api_key
+        self._trend_monitor = LazyResource(
+            "TrendMonitor",
+            lambda: TrendMonitor(
+                db_url=db_url,
+                tickertrends_api_key=tickertrends_api_key
+            )
         )
 
-        self.content_strategist = ContentStrategist(
-            db_url=db_url
+        self._content_strategist = LazyResource(
+            "ContentStrategist",
+            lambda: ContentStrategist(
+                db_url=db_url
+            )
         )
 
         # Create agent team for coordination
-        self.team = Team(
-            name="VietnameseMarketingAutomation",
-            agents=[self.trend_monitor, self.content_strategist],
-            mode="coordinate",  # Agents work together on tasks
-            description="Vietnamese e-commerce marketing automation team"
+        self._team = LazyResource(
+            "VietnameseMarketingAutomationTeam",
+            lambda: Team(
+                name="VietnameseMarketingAutomation",
+                agents=[self.trend_monitor, self.content_strategist],
+                mode="coordinate",  # Agents work together on tasks
+                description="Vietnamese e-commerce marketing automation team"
+            )
         )
 
-        logger.info("Agents initialized successfully")
+    @property
+    def trend_monitor(self) -> TrendMonitor:
+        return self._trend_monitor.get()
+
+    @property
+    def content_strategist(self) -> ContentStrategist:
+        return self._content_strategist.get()
+
+    @property
+    def team(self) -> Team:
+        return self._team.get()
+
+    @property
+    def initialized(self) -> bool:
+        """True once every agent has been built"""
+        return all(r.initialized for r in (self._trend_monitor, self._content_strategist, self._team))
+
+    def warm_up(self) -> Dict[str, float]:
+        """
+        Build all agents ahead of the first request
+
+        TrendMonitor and ContentStrategist are independent, so they are
+        built in parallel; the team needs both and is built last.
+
+        Returns:
+            Build time in seconds per agent
+        """
+        started = time.perf_counter()
+        logger.info("Initializing agents...")
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-warmup") as executor:
+            futures = [
+                executor.submit(self._trend_monitor.get),
+                executor.submit(self._content_strategist.get)
+            ]
+            for future in futures:
+                future.result()
+        self._team.get()
+
+        logger.info(f"Agents initialized successfully in {time.perf_counter() - started:.2f}s")
+        return {
+            r.name: r.build_seconds
+            for r in (self._trend_monitor, self._content_strategist, self._team)
+        }
 
     def run_daily_content_generation(
         self,
         product_categories: List[str],
         min_relevance_score: float = 0.6,
-        max_briefs_per_day: int = 10
+        max_briefs_per_day: int = 10,
+        regions: Optional[List[str]] = None
     ) -> Dict:
         """
         Daily workflow: Discover trends → Create content briefs
 
+        Collects iter_daily_content_generation() into one result dict.
+
         Args:
             product_categories: Product categories to match
             min_relevance_score: Minimum relevance for trends
             max_briefs_per_day: Maximum content briefs to create
+            regions: Region codes to scan (default: TrendMonitor's configured regions)
 
         Returns:
-            Workflow results with statistics
+            Workflow results with statistics and LLM token/cost totals
+        """
+        results = {"briefs": [], "emerging": []}
+        for event in self.iter_daily_content_generation(
+            product_categories=product_categories,
+            min_relevance_score=min_relevance_score,
+            max_briefs_per_day=max_briefs_per_day,
+            regions=regions
+        ):
+            if event["type"] == "brief":
+                results["briefs"].append(event["brief"])
+            elif event["type"] == "emerging":
+                results["emerging"] = event["signals"]
+            elif event["type"] == "summary":
+                results.update({k: v for k, v in event.items() if k != "type"})
+        return results
+
+    def iter_daily_content_generation(
+        self,
+        product_categories: List[str],
+        min_relevance_score: float = 0.6,
+        max_briefs_per_day: int = 10,
+        regions: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Daily workflow as a stream of events
+
+        Each brief is yielded as soon as it is created and not kept, so
+        memory stays flat for large max_briefs_per_day. Only trends that are
+        new or materially changed since they were last briefed are briefed
+        (scan checkpoints), so LLM spend follows trend churn. Events:
+
+        - {"type": "started", "workflow_id", "started_at", "product_categories"}
+        - {"type": "trends", "trends_discovered", "trends_relevant", "trends_unchanged"}
+        - {"type": "emerging", "signals": [...]}  (only if any relevant trend
+          is emerging; those trends are briefed first)
+        - {"type": "brief", "brief": {...}}  (one per brief; trends from all
+          regions are ranked together)
+        - {"type": "summary", ...}  (always last: status, counts, duration, cost)
+
+        Args:
+            product_categories: Product categories to match
+            min_relevance_score: Minimum relevance for trends
+            max_briefs_per_day: Maximum content briefs to create
+            regions: Region codes to scan (default: TrendMonitor's configured regions)
         """
         workflow_start = datetime.now()
-        logger.info("=" * 60)
-        logger.info("🚀 STARTING DAILY CONTENT GENERATION WORKFLOW")
-        logger.info("=" * 60)
+        workflow_id = f"workflow_{workflow_start.isoformat()}"
 
-        results = {
-            "workflow_id": f"workflow_{workflow_start.isoformat()}",
+        summary = {
+            "type": "summary",
+            "workflow_id": workflow_id,
             "started_at": workflow_start.isoformat(),
             "product_categories": product_categories,
             "trends_discovered": 0,
             "trends_relevant": 0,
+            "trends_emerging": 0,
+            "trends_unchanged": 0,
             "content_briefs_created": 0,
-            "briefs": [],
             "status": "running"
         }
 
+        logger.info("=" * 60)
+        logger.info("🚀 STARTING DAILY CONTENT GENERATION WORKFLOW")
+        logger.info("=" * 60)
+
+        yield {
+            "type": "started",
+            "workflow_id": workflow_id,
+            "started_at": summary["started_at"],
+            "product_categories": product_categories
+        }
+
+        # Context managers never span a yield: the consumer may resume this
+        # generator in another thread/context (e.g. asyncio.to_thread), so
+        # cost labels and spans are entered and left within each step.
         try:
             # STEP 1: Trend Discovery
             logger.info("\n📊 STEP 1: DISCOVERING TIKTOK TRENDS")
             logger.info("-" * 60)
 
-            trends = self.trend_monitor.run_trend_scan(
-                product_categories=product_categories,
-                min_relevance_score=min_relevance_score
-            )
-
-            results["trends_discovered"] = len(trends)
-            results["trends_relevant"] = len([t for t in trends if t["analysis"]["relevance_score"] >= min_relevance_score])
+            with cost_scope(workflow_id=workflow_id), span("workflow.trend_scan", workflow_id=workflow_id):
+                trends = self.trend_monitor.run_trend_scan(
+                    product_categories=product_categories,
+                    min_relevance_score=min_relevance_score,
+                    regions=regions
+                )
 
-            logger.info(f"✅ Found {results['trends_discovered']} total trends")
-            logger.info(f"✅ {results['trends_relevant']} trends meet relevance threshold (>= {min_relevance_score})")
+            summary["trends_discovered"] = len(trends)
+            summary["trends_relevant"] = len([t for t in trends if t.analysis.relevance_score >= min_relevance_score])
+
+            # Trends briefed before with the same fingerprint are skipped
+            checkpoint = get_scan_checkpoint()
+            to_brief = [t for t in trends if checkpoint.needs_brief(t)]
+            summary["trends_unchanged"] = len(trends) - len(to_brief)
+
+            logger.info(f"✅ Found {summary['trends_discovered']} total trends")
+            logger.info(f"✅ {summary['trends_relevant']} trends meet relevance threshold (>= {min_relevance_score})")
+            logger.info(f"⏭️  {summary['trends_unchanged']} already briefed and unchanged")
+
+            yield {
+                "type": "trends",
+                "trends_discovered": summary["trends_discovered"],
+                "trends_relevant": summary["trends_relevant"],
+                "trends_unchanged": summary["trends_unchanged"]
+            }
+
+            # Emerging trends come first in trends, so the briefs below act
+            # on them before the established ones
+            signals = [t.emerging for t in trends if t.emerging is not None]
+            if signals:
+                summary["trends_emerging"] = len(signals)
+                logger.info(f"🌱 {len(signals)} emerging trend(s): {', '.join(s.hashtag for s in signals)}")
+                yield {"type": "emerging", "signals": signals}
 
             if not trends:
                 logger.warning("⚠️  No relevant trends found. Ending workflow.")
-                results["status"] = "no_trends_found"
-                return results
-
-            # STEP 2: Content Strategy
-            logger.info("\n📝 STEP 2: CREATING CONTENT BRIEFS")
-            logger.info("-" * 60)
-
-            briefs_created = 0
-            for trend in trends[:max_briefs_per_day]:
-                logger.info(f"\nProcessing trend: {trend['hashtag']}")
-                logger.info(f"  Relevance: {trend['analysis']['relevance_score']:.2f}")
-                logger.info(f"  Growth: {trend['growth_rate']}%")
-                logger.info(f"  Views: {trend['views']:,}")
-
-                # Create content briefs
-                briefs = self.content_strategist.run_strategy_session(
-                    trend=trend,
-                    max_products=2,
-                    content_formats=["tiktok_video"]  # Start with TikTok only
-                )
+                summary["status"] = "no_trends_found"
+            elif not to_brief:
+                logger.info("ℹ️  No new or changed trends since the last briefs. Ending workflow.")
+                summary["status"] = "no_changes"
+            else:
+                # STEP 2: Content Strategy
+                logger.info("\n📝 STEP 2: CREATING CONTENT BRIEFS")
+                logger.info("-" * 60)
+
+                total_expected_views = 0
+                total_expected_revenue = 0
+
+                for trend in to_brief[:max_briefs_per_day]:
+                    logger.info(f"\nProcessing trend: {trend['hashtag']} [{trend.region}] ({trend.change})")
+                    logger.info(f"  Relevance: {trend['analysis']['relevance_score']:.2f}")
+                    logger.info(f"  Growth: {trend['growth_rate']}%")
+                    if trend.emerging is not None:
+                        logger.info(f"  Emerging: velocity z={trend.emerging.z_score}")
+                    logger.info(f"  Views: {trend['views']:,}")
+
+                    # Create content briefs
+                    with cost_scope(workflow_id=workflow_id), \
+                            span("workflow.strategy_session", workflow_id=workflow_id, trend=trend["hashtag"]):
+                        briefs = self.content_strategist.run_strategy_session(
+                            trend=trend,
+                            max_products=2,
+                            content_formats=["tiktok_video"]  # Start with TikTok only
+                        )
+
+                    if not briefs:
+                        logger.info(f"  ⚠️  No products matched for this trend")
+                        checkpoint.mark_briefed(trend)
+                        continue
 
-                if briefs:
-                    results["briefs"].extend(briefs)
-                    briefs_created += len(briefs)
                     logger.info(f"  ✅ Created {len(briefs)} content brief(s)")
-                else:
-                    logger.info(f"  ⚠️  No products matched for this trend")
-
-            results["content_briefs_created"] = briefs_created
-
-            # STEP 3: Workflow Summary
-            logger.info("\n📈 STEP 3: WORKFLOW SUMMARY")
-            logger.info("=" * 60)
-
-            workflow_end = datetime.now()
-            duration = (workflow_end - workflow_start).total_seconds()
-
-            results["completed_at"] = workflow_end.isoformat()
-            results["duration_seconds"] = duration
-            results["status"] = "completed"
-
-            logger.info(f"⏱️  Duration: {duration:.2f} seconds")
-            logger.info(f"🔥 Trends Discovered: {results['trends_discovered']}")
-            logger.info(f"✅ Relevant Trends: {results['trends_relevant']}")
-            logger.info(f"📝 Content Briefs Created: {results['content_briefs_created']}")
-
-            if results["briefs"]:
-                logger.info("\n📋 CONTENT BRIEFS READY FOR PRODUCTION:")
-                for i, brief in enumerate(results["briefs"], 1):
-                    logger.info(f"\n  Brief #{i}:")
-                    logger.info(f"    Trend: {brief['trend_id']}")
-                    logger.info(f"    Format: {brief['content_format']}")
-                    logger.info(f"    Products: {len(brief['products'])}")
-                    logger.info(f"    Hook: {brief['vietnamese_hook'][:60]}...")
-                    logger.info(f"    Expected Views: {brief['success_metrics']['target_views']:,}")
-                    logger.info(f"    Expected Revenue: {brief['success_metrics']['expected_revenue_vnd']:,} VNĐ")
-
-            # Calculate total expected impact
-            total_expected_views = sum(b["success_metrics"]["target_views"] for b in results["briefs"])
-            total_expected_revenue = sum(b["success_metrics"]["expected_revenue_vnd"] for b in results["briefs"])
-
-            logger.info(f"\n💰 TOTAL EXPECTED IMPACT:")
-            logger.info(f"    Views: {total_expected_views:,}")
-            logger.info(f"    Revenue: {total_expected_revenue:,} VNĐ (${total_expected_revenue/24000:.2f} USD)")
+                    for brief in briefs:
+                        summary["content_briefs_created"] += 1
+                        total_expected_views += brief.success_metrics.target_views
+                        total_expected_revenue += brief.success_metrics.expected_revenue_vnd
+                        yield {"type": "brief", "brief": brief}
+                    # Only once every brief was handed over: a consumer that
+                    # stops mid-trend gets it briefed again next time
+                    checkpoint.mark_briefed(trend)
+
+                summary["status"] = "completed"
+
+                # STEP 3: Workflow Summary
+                logger.info("\n📈 STEP 3: WORKFLOW SUMMARY")
+                logger.info("=" * 60)
+                logger.info(f"🔥 Trends Discovered: {summary['trends_discovered']}")
+                logger.info(f"✅ Relevant Trends: {summary['trends_relevant']}")
+                logger.info(f"🌱 Emerging Trends: {summary['trends_emerging']}")
+                logger.info(f"⏭️  Unchanged (skipped): {summary['trends_unchanged']}")
+                logger.info(f"📝 Content Briefs Created: {summary['content_briefs_created']}")
+                logger.info(f"\n💰 TOTAL EXPECTED IMPACT:")
+                logger.info(f"    Views: {total_expected_views:,}")
+                logger.info(f"    Revenue: {total_expected_revenue:,} VNĐ (${total_expected_revenue/24000:.2f} USD)")
 
+        except Exception as e:
+            logger.error(f"❌ Workflow failed: {str(e)}", exc_info=True)
+            summary["status"] = "failed"
+            summary["error"] = str(e)
+
+        workflow_end = datetime.now()
+        summary["completed_at"] = workflow_end.isoformat()
+        summary["duration_seconds"] = (workflow_end - workflow_start).total_seconds()
+        summary["cost"] = get_cost_ledger().workflow_summary(workflow_id)
+
+        logger.info(f"⏱️  Duration: {summary['duration_seconds']:.2f} seconds")
+        logger.info(
+            f"💵 LLM usage: {summary['cost']['total_tokens']:,} tokens, "
+            f"${summary['cost']['cost_usd']:.4f} over {summary['cost']['calls']} calls"
+        )
+        if summary["status"] == "completed":
             logger.info("\n" + "=" * 60)
             logger.info("✅ WORKFLOW COMPLETED SUCCESSFULLY")
             logger.info("=" * 60 + "\n")
 
-            return results
-
-        except Exception as e:
-            logger.error(f"❌ Workflow failed: {str(e)}", exc_info=True)
-            results["status"] = "failed"
-            results["error"] = str(e)
-            results["completed_at"] = datetime.now().isoformat()
-            return results
+        yield summary
 
     def get_brief_by_id(self, brief_id: str) -> Dict:
         """